@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import time
+
+import requests
+from pmaw.PushshiftAPIBase import PushshiftAPIBase
+from pmaw.utils.params import encode_params
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+log = logging.getLogger(__name__)
+
+# get_running_loop was added in python 3.7, get_event_loop returns the running loop from a coroutine before then
+_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+class AsyncPushshiftAPI(PushshiftAPIBase):
+    def __init__(self, *args, **kwargs):
+        """
+        Helper class for interacting with the PushShift API for searching public reddit archival data using a single asyncio event loop.
+
+        Accepts the same parameters as `PushshiftAPI` except for `scheduler` and `checkpoint_interval`, `num_workers` sets the maximum number of requests in flight and can be
+        raised well above the number of threads that would be practical for `PushshiftAPI`. Requires `aiohttp`.
+
+        Input:
+
+            num_workers (int, optional) - Maximum number of concurrent requests, defaults to 10.
+            max_sleep (int, optional) - Maximum rate-limit sleep time (in seconds) between requests, defaults to 60s.
+            rate_limit (int, optional) - Target number of requests per minute for rate-averaging, defaults to 60 requests per minute.
+            base_backoff (float, optional) - Base delay in seconds for exponential backoff, defaults to 0.5s
+            batch_size (int, optional) - Size of batches of concurrent requests, defaults to number of workers.
+            shards_down_behavior (str, optional) - Specifies how PMAW will respond if some shards are down during a query. Options are "warn" to only emit a warning, "stop" to throw a RuntimeError, or None to take no action. Defaults to "warn".
+            limit_type (str, optional) - Type of rate limiting to use, default value is 'average' for rate averaging, use 'backoff' for exponential backoff, 'token_bucket' for a token bucket allowing short bursts, 'sliding_window' for a sliding window log, or 'adaptive' to adjust the rate based on responses from Pushshift
+            jitter (str, optional) - Jitter to use with backoff, defaults to None, options are None, full, equal, decorr
+            checkpoint (int, optional) - Size of interval in batches to print a checkpoint with stats, defaults to 10
+            file_checkpoint (int, optional) - Size of interval in batches to cache responses when using mem_safe, defaults to 20
+            praw (praw.Reddit, optional) - Used to enrich the Pushshift items retrieved with metadata directly from Reddit
+            enrich_workers (int, optional) - Number of threads enriching items with PRAW while Pushshift requests continue, defaults to 1 as PRAW isnt guaranteed to be thread-safe
+            enrich_rate_limit (int, optional) - Maximum number of requests per minute to Reddit for enrichment, defaults to 100
+            praw_fields (list, dict, optional) - Fields kept from each enriched item as a plain dict, instead of all attributes of the PRAW object. A dict maps output keys to attribute names or functions called with the PRAW object. Defaults to None
+            rate_limiter (RateLimit, optional) - A RateLimit instance to use instead of creating one, share an instance between multiple PushshiftAPI objects to keep them within one rate limit
+            connect_timeout (float, optional) - Seconds to wait for a connection to Pushshift before retrying the request, defaults to 10s
+            read_timeout (float, optional) - Seconds to wait for a response from Pushshift before retrying the request, defaults to 60s
+            slice_planner (str, optional) - How the search window is split into time slices, 'uniform' splits it into batch_size equal slices, 'density' uses count only requests to split it into batch_size slices with similar numbers of results. Defaults to 'uniform'
+            index_dir (str, optional) - Folder for a density index which records how many results each query has over time, so later searches for the same query can plan their slices without counting results again. Defaults to None for no index
+            response_cache (str, ResponseCache, optional) - Path to a SQLite file, or a ResponseCache, used to cache response bodies so repeated requests are served locally without being rate limited. Defaults to None
+            json_decoder (str, optional) - JSON decoder used for responses, options are 'orjson', 'simdjson', 'ujson', and 'json'. Defaults to None for the fastest one installed
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required to use AsyncPushshiftAPI")
+        # requests are always sent in batches of batch_size on the event loop
+        for option in ("scheduler", "checkpoint_interval"):
+            if kwargs.get(option) is not None:
+                raise NotImplementedError(
+                    f"{option} is not supported by AsyncPushshiftAPI"
+                )
+        super().__init__(*args, **kwargs)
+        self._session = None
+
+    async def search_submission_comment_ids(self, ids, **kwargs):
+        """
+        Coroutine for getting comment ids based on submission id(s), accepts the same parameters as `PushshiftAPI.search_submission_comment_ids`
+
+        Output:
+            Response generator object
+        """
+        kwargs["ids"] = ids
+        for option in ("filter_fn", "filters"):
+            if option in kwargs:
+                raise ValueError(
+                    f"{option} not supported for search_submission_comment_ids"
+                )
+        return await self._search_async(kind="submission_comment_ids", **kwargs)
+
+    async def search_comments(self, **kwargs):
+        """
+        Coroutine for searching comments, accepts the same parameters as `PushshiftAPI.search_comments`
+
+        Output:
+            Response generator object
+        """
+        return await self._search_async(kind="comment", **kwargs)
+
+    async def search_submissions(self, **kwargs):
+        """
+        Coroutine for searching submissions, accepts the same parameters as `PushshiftAPI.search_submissions`
+
+        Output:
+            Response generator object
+        """
+        return await self._search_async(kind="submission", **kwargs)
+
+    async def _impose_rate_limit_async(self):
+        interval = self._rate_limit.delay()
+        if interval > 0:
+            await asyncio.sleep(interval)
+
+    async def _get_async(self, url, payload={}):
+        cached = self._cached_response(url, payload)
+        if cached is not None:
+            return cached
+
+        async with self._semaphore:
+            await self._impose_rate_limit_async()
+            start = time.monotonic()
+            try:
+                async with self._session.get(
+                    url, params=encode_params(payload)
+                ) as r:
+                    body = await r.read()
+            except asyncio.TimeoutError as exc:
+                raise requests.Timeout(f"Request timed out - {url}") from exc
+            except aiohttp.ClientConnectionError as exc:
+                raise requests.ConnectionError(str(exc)) from exc
+            latency = time.monotonic() - start
+            result = self._parse_response(r.status, r.reason, body, r.headers, latency)
+            self._rate_limit._req_success(latency)
+            self._cache_response(url, payload, body, result)
+            return result
+
+    async def _multithread_async(self, check_total=False):
+        while len(self.req.req_list) > 0 and not self.req.exit.is_set():
+            reqs = self._next_batch(check_total)
+
+            tasks = {
+                asyncio.ensure_future(self._get_async(url_pay[0], url_pay[1])): url_pay
+                for url_pay in reqs
+            }
+
+            await self._tasks_handler(tasks, check_total)
+
+            self._end_batch(check_total)
+
+            if check_total:
+                break
+        if not check_total:
+            self._print_stats("Total")
+
+    async def _tasks_handler(self, tasks, check_total):
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if self._handle_result(tasks[task], task.result, check_total):
+                        return
+        finally:
+            # limit has been reached or an unexpected error was raised
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    async def _gen_requests_async(self, url, search_window):
+        planner = self._slice_planner()
+        if planner is None:
+            self.req.gen_url_payloads(url, self.batch_size, search_window)
+        else:
+            # count requests made while planning slices are blocking, plan them off the event loop
+            await _running_loop().run_in_executor(
+                None,
+                self.req.gen_url_payloads,
+                url,
+                self.batch_size,
+                search_window,
+                planner,
+            )
+
+        # check for exit signals, signal handlers are set from the event loop thread
+        self.req.check_sigs()
+
+    async def _run_search_async(self, url, search_window):
+        while self._searching():
+            if self._needs_total():
+                # check to see how many results are remaining
+                self.req.req_list.appendleft((url, self.req.payload))
+                await self._multithread_async(check_total=True)
+                if not self._update_limit():
+                    continue
+
+            await self._gen_requests_async(url, search_window)
+
+            if self.req.limit > 0 and len(self.req.req_list) > 0:
+                await self._multithread_async()
+
+    async def _search_async(
+        self,
+        kind,
+        max_ids_per_request=500,
+        max_results_per_request=100,
+        mem_safe=False,
+        search_window=365,
+        dataset="reddit",
+        safe_exit=False,
+        cache_dir=None,
+        filter_fn=None,
+        stream=False,
+        stream_buffer=10,
+        cache_format="pickle.gz",
+        dedup=False,
+        filters=None,
+        work_queue=None,
+        sink=None,
+        **kwargs,
+    ):
+        # search options are kept out of kwargs, which are sent to Pushshift as query parameters
+        if stream:
+            raise NotImplementedError("stream is not supported by AsyncPushshiftAPI")
+        if self.num_processes > 1:
+            raise NotImplementedError(
+                "num_processes is not supported by AsyncPushshiftAPI"
+            )
+        if work_queue is not None:
+            raise NotImplementedError("work_queue is not supported by AsyncPushshiftAPI")
+
+        url = self._init_search(
+            kind,
+            max_ids_per_request,
+            max_results_per_request,
+            mem_safe,
+            dataset,
+            safe_exit,
+            cache_dir,
+            filter_fn,
+            kwargs,
+            cache_format=cache_format,
+            dedup=dedup,
+            filters=filters,
+            sink=sink,
+        )
+
+        self._semaphore = asyncio.Semaphore(self.num_workers)
+        connector = aiohttp.TCPConnector(limit=self.num_workers)
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=self.connect_timeout, sock_read=self.read_timeout
+        )
+        try:
+            async with aiohttp.ClientSession(
+                connector=connector, timeout=timeout
+            ) as session:
+                self._session = session
+                await self._run_search_async(url, search_window)
+            self.req.save_cache()
+        finally:
+            self._session = None
+            # make sure cached responses are on disk, even if the search failed
+            self.req.close()
+            self._save_index()
+            # sessions used for count requests while planning slices
+            self._sessions.close()
+        return self.req.sink if self.req.sink is not None else self.req.resp
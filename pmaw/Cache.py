@@ -8,13 +8,19 @@ import warnings
 from pathlib import Path
 import gzip
 
+from pmaw.CacheWriter import CacheWriter, write_file
+from pmaw.Journal import Journal
+from pmaw.utils.cache_formats import get_format, format_from_filename
+
 log = logging.getLogger(__name__)
 
 
 class Cache:
     """Cache: Handle storing and loading request info and responses in the cache"""
 
-    def __init__(self, payload, safe_exit, cache_dir=None, key=None):
+    def __init__(
+        self, payload, safe_exit, cache_dir=None, key=None, cache_format="pickle.gz"
+    ):
 
         if key is None:
             # generating key
@@ -28,10 +34,29 @@ class Cache:
         self.folder = str(cache_dir) if cache_dir else "./cache"
         Path(self.folder).mkdir(exist_ok=True, parents=True)
 
+        self.format = get_format(cache_format)
+        self._writer = CacheWriter()
         self.response_cache = []
         self.size = 0
+        # number of chunks already cached with this key, when appending to a cache
+        self.chunk_offset = 0
+        self.journal = None
+        self._state = None
+        self._journaled = 0
         if safe_exit:
-            self.check_cache()
+            self.journal = Journal(self.folder, self.key)
+            if self.journal.exists:
+                self._state = self.journal.load()
+
+            if self._state is not None:
+                # resuming only reads the journal, rather than listing the cache folder
+                for filename, num_resp in self._state["chunks"]:
+                    self.response_cache.append(filename)
+                    self.size += num_resp
+                self._journaled = len(self.response_cache)
+            else:
+                # caches saved before the journal was added
+                self.check_cache()
 
     @staticmethod
     def load_with_key(key, cache_dir=None):
@@ -40,17 +65,65 @@ class Cache:
     def cache_responses(self, responses):
         if responses:
             num_resp = len(responses)
-            checkpoint = len(self.response_cache) + 1
+            checkpoint = self.chunk_offset + len(self.response_cache) + 1
             self.size += num_resp
             log.debug(f"File Checkpoint {checkpoint}:: Caching {num_resp} Responses")
 
-            filename = f"{checkpoint}-{self.key}-{num_resp}.pickle.gz"
+            filename = f"{checkpoint}-{self.key}-{num_resp}.{self.format.extension}"
             self.response_cache.append(filename)
 
-            with gzip.open(f"{self.folder}/{filename}", "wb") as handle:
-                pickle.dump(responses, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            # written on a background thread, responses must not be modified after this
+            self._writer.submit(self.format.write, f"{self.folder}/{filename}", responses)
+
+    def add_chunks(self, filenames, size):
+        """Adds chunks cached with another key, like the shards of a search split across processes"""
+        self.response_cache.extend(filenames)
+        self.size += size
+
+    def truncate(self, size):
+        """Drops cached responses past the first size responses, rewriting the chunk which crosses it"""
+        kept, total = [], 0
+        for cache_num, filename in enumerate(self.response_cache):
+            num_resp = int(re.match(r"\d+-\w+-(\d+)\.", filename).group(1))
+            if total + num_resp > size:
+                responses = self.load_resp(cache_num)[: size - total]
+                self.response_cache = kept
+                self.size = total
+                self.cache_responses(responses)
+                return
+            kept.append(filename)
+            total += num_resp
+
+    def flush(self):
+        """Waits for cached responses to finish being written"""
+        self._writer.flush()
+
+    def close(self):
+        """Waits for cached responses to finish being written and stops the writer thread"""
+        self._writer.close()
+
+    def checkpoint(self, added, completed, payload, limit):
+        """
+        Records a checkpoint in the journal once cached responses are on disk
+
+        Input:
+            added (list) - (url, payload) requests created since the last checkpoint
+            completed (list) - ((url, payload), number of results) for requests completed since the last checkpoint
+            payload (dict) - Current search payload
+            limit (int) - Number of items remaining
+        """
+        # responses must be on disk before the requests which retrieved them are marked complete
+        self.flush()
+        chunks = [
+            (filename, int(re.match(rf"\d+-{self.key}-(\d+)\.", filename).group(1)))
+            for filename in self.response_cache[self._journaled :]
+        ]
+        self.journal.checkpoint(added, completed, chunks, payload, limit)
+        self._journaled = len(self.response_cache)
 
     def load_info(self):
+        if self._state is not None:
+            return self._state
         try:
             with gzip.open(f"{self.folder}/{self.key}_info.pickle.gz", "rb") as handle:
                 return pickle.load(handle)
@@ -58,11 +131,24 @@ class Cache:
             log.info("No previous requests to load")
             return None
 
+    def save_dedup(self, dedup):
+        """Saves the ids seen by a deduplication stage, replacing the previous save"""
+        write_file(_write_pickle, f"{self.folder}/{self.key}_dedup.pickle.gz", dedup)
+
+    def load_dedup(self):
+        try:
+            with gzip.open(f"{self.folder}/{self.key}_dedup.pickle.gz", "rb") as handle:
+                return pickle.load(handle)
+        except FileNotFoundError:
+            return None
+
     def load_resp(self, cache_num):
+        self.flush()
         filename = self.response_cache[cache_num]
+        # chunks are read with the format they were written in
+        chunk_format = get_format(format_from_filename(filename))
         try:
-            with gzip.open(f"{self.folder}/{filename}", "rb") as handle:
-                return pickle.load(handle)
+            return chunk_format.read(f"{self.folder}/{filename}")
         except FileNotFoundError as exc:
             warnings.warn(f"Failed to load responses from {filename} - {exc}")
 
@@ -73,7 +159,12 @@ class Cache:
 
     def check_cache(self):
         for filename in os.listdir(self.folder):
-            m = re.match(f"\d+-{self.key}-(\d+).pickle.gz", filename)
-            if m:
+            m = re.match(rf"\d+-{self.key}-(\d+)\.(.+)$", filename)
+            if m and format_from_filename(filename) is not None:
                 self.response_cache.append(m.group(0))
                 self.size += int(m.group(1))
+
+
+def _write_pickle(path, data):
+    with gzip.open(path, "wb", compresslevel=1) as handle:
+        pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,213 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+import re
+from array import array
+from collections import OrderedDict
+
+from pmaw.Cache import Cache
+from pmaw.CacheWriter import write_file, write_json
+from pmaw.utils.cache_formats import get_format, format_from_filename
+from pmaw.utils.decode import get_decoder
+
+log = logging.getLogger(__name__)
+
+
+class CacheReader:
+    """CacheReader: Random access to cached responses by index, slice, or id, without loading every chunk"""
+
+    def __init__(self, cache, max_chunks=2, json_decoder=None):
+        """
+        Input:
+            cache (Cache) - Cache to read the responses of, pending writes are flushed first
+            max_chunks (int, optional) - Number of chunks kept open once loaded, defaults to 2. Uncompressed ndjson chunks are
+                memory-mapped and only decode the responses which are read, other formats are decoded whole
+            json_decoder (str, optional) - JSON decoder used for ndjson chunks, see `PushshiftAPI`. Defaults to the fastest installed
+        """
+        cache.flush()
+        self.folder = cache.folder
+        self.filenames = list(cache.response_cache)
+        self.max_chunks = max_chunks
+        self._loads = get_decoder(json_decoder)
+
+        # index of the first response in each chunk, from the number of responses in its filename
+        self._starts = [0]
+        for filename in self.filenames:
+            num_resp = int(re.match(r"\d+-\w+-(\d+)\.", filename).group(1))
+            self._starts.append(self._starts[-1] + num_resp)
+
+        # most recently used chunks last, mapped chunks are closed when they are evicted
+        self._loaded = OrderedDict()
+        # id of each response by chunk, read from the id index saved beside each chunk
+        self._ids = {}
+
+    @staticmethod
+    def load_with_key(key, cache_dir=None, **kwargs):
+        """
+        Returns a CacheReader for the responses cached with the provided key
+
+        Input:
+            key (str) - Cache key of the responses
+            cache_dir (str, optional) - An absolute or relative folder path the responses were cached in, defaults to './cache'
+        Output:
+            CacheReader
+        """
+        cache = Cache.load_with_key(key, cache_dir)
+        # chunks are listed in the order they were cached
+        cache.response_cache.sort(key=lambda filename: int(filename.split("-", 1)[0]))
+        return CacheReader(cache, **kwargs)
+
+    def __len__(self):
+        return self._starts[-1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("cache index out of range")
+
+        chunk_num = bisect.bisect_right(self._starts, index) - 1
+        return self._chunk(chunk_num)[index - self._starts[chunk_num]]
+
+    def __iter__(self):
+        for chunk_num in range(len(self.filenames)):
+            for i in range(self._starts[chunk_num + 1] - self._starts[chunk_num]):
+                # the chunk is looked up for each response, in case it was evicted by a lookup while iterating
+                yield self._chunk(chunk_num)[i]
+
+    def get(self, item_id, default=None):
+        """
+        Returns the first response with the provided id, using the id index saved beside each chunk.
+        The index of a chunk is created by reading its responses the first time it is searched
+        """
+        for chunk_num in range(len(self.filenames)):
+            ids = self._chunk_ids(chunk_num)
+            if item_id in ids:
+                return self[self._starts[chunk_num] + ids[item_id]]
+        return default
+
+    def _chunk_ids(self, chunk_num):
+        if chunk_num in self._ids:
+            return self._ids[chunk_num]
+
+        num_resp = self._starts[chunk_num + 1] - self._starts[chunk_num]
+        index_path = f"{self.folder}/{self.filenames[chunk_num]}.ids"
+        ids = None
+        try:
+            with open(index_path) as handle:
+                ids = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            pass
+        if ids is None or len(ids) != num_resp:
+            chunk = self._chunk(chunk_num)
+            ids = [chunk[i].get("id") for i in range(num_resp)]
+            try:
+                write_file(write_json, index_path, ids)
+            except OSError as exc:
+                log.debug(f"Failed to save id index {index_path} - {exc}")
+
+        positions = {}
+        for i, resp_id in enumerate(ids):
+            # the first response with an id is returned, like a lookup in a list
+            positions.setdefault(resp_id, i)
+        self._ids[chunk_num] = positions
+        return positions
+
+    def _chunk(self, chunk_num):
+        if chunk_num in self._loaded:
+            self._loaded.move_to_end(chunk_num)
+            return self._loaded[chunk_num]
+
+        filename = self.filenames[chunk_num]
+        path = f"{self.folder}/{filename}"
+        chunk_format = format_from_filename(filename)
+        if chunk_format == "ndjson":
+            chunk = _MappedChunk(path, self._loads)
+        else:
+            # other formats cant be read from an offset
+            chunk = get_format(chunk_format).read(path)
+
+        # keep the most recently used chunks, each mapping holds a file descriptor
+        self._loaded[chunk_num] = chunk
+        if len(self._loaded) > max(1, self.max_chunks):
+            _, evicted = self._loaded.popitem(last=False)
+            if isinstance(evicted, _MappedChunk):
+                evicted.close()
+        return chunk
+
+    def close(self):
+        for chunk in self._loaded.values():
+            if isinstance(chunk, _MappedChunk):
+                chunk.close()
+        self._loaded.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _MappedChunk:
+    """_MappedChunk: Memory-mapped uncompressed ndjson chunk with an index of the offset of each line"""
+
+    def __init__(self, path, loads):
+        self.path = path
+        self._loads = loads
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            # empty files cant be mapped
+            self._map = (
+                mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+        self.offsets = self._load_offsets(size)
+
+    def _load_offsets(self, size):
+        # the index is saved beside the chunk, and rebuilt if it doesnt match the chunk
+        index_path = f"{self.path}.idx"
+        offsets = array("Q")
+        try:
+            with open(index_path, "rb") as handle:
+                offsets.frombytes(handle.read())
+            if offsets and offsets[-1] == size:
+                return offsets
+        except (FileNotFoundError, ValueError):
+            pass
+
+        offsets = array("Q")
+        start = 0
+        while start < size:
+            end = self._map.find(b"\n", start)
+            end = size if end == -1 else end + 1
+            # empty lines are skipped, as they are when reading the chunk
+            if end - start > 1:
+                offsets.append(start)
+            start = end
+        offsets.append(size)
+
+        try:
+            write_file(_write_offsets, index_path, offsets)
+        except OSError as exc:
+            log.debug(f"Failed to save offset index {index_path} - {exc}")
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return self._loads(self._map[self.offsets[i] : self.offsets[i + 1]])
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+
+def _write_offsets(path, offsets):
+    with open(path, "wb") as handle:
+        offsets.tofile(handle)
@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class CacheWriter:
+    """CacheWriter: Writes cached response files on a background thread so caching doesn't block requests"""
+
+    def __init__(self, max_pending=2):
+        # bound the number of chunks waiting to be written to keep memory use flat
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def submit(self, write_fn, path, responses):
+        """Queues responses to be written to path with write_fn, blocks if max_pending writes are queued"""
+        self._raise_error()
+        self._start()
+        self._queue.put((write_fn, path, responses))
+
+    def flush(self):
+        """Waits for all queued writes to be written and synced to disk"""
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                write_fn, path, responses = item
+                write_file(write_fn, path, responses)
+            except Exception as exc:
+                log.error(f"Failed to cache responses to {item[1]} - {exc}")
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+
+def write_file(write_fn, path, data):
+    """Writes data to a temporary file which is synced and renamed to path, so path is never partially written"""
+    tmp_path = f"{path}.tmp"
+    write_fn(tmp_path, data)
+    fd = os.open(tmp_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def write_json(path, data):
+    """Writes data as JSON, used with write_file for small state files"""
+    with open(path, "w") as handle:
+        json.dump(data, handle)
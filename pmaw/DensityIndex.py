@@ -0,0 +1,122 @@
+import bisect
+import json
+import logging
+from pathlib import Path
+
+from pmaw.CacheWriter import write_file, write_json
+from pmaw.utils.keys import query_key
+
+log = logging.getLogger(__name__)
+
+
+class DensityIndex:
+    """DensityIndex: Persistent histogram of how many results a query has over time, used to plan slices for future searches"""
+
+    def __init__(self, payload, kind, index_dir=None, max_intervals=100000):
+        """
+        Input:
+            payload (dict) - Search parameters, the time range and result size dont affect the key
+            kind (str) - Type of search
+            index_dir (str, optional) - Folder to store the index in, defaults to ./cache
+            max_intervals (int, optional) - Maximum number of intervals kept, adjacent intervals are merged beyond this
+        """
+        self.key = query_key(payload, kind)
+        self.folder = str(index_dir) if index_dir else "./cache"
+        Path(self.folder).mkdir(exist_ok=True, parents=True)
+        self.path = f"{self.folder}/{self.key}_density.json"
+        self.max_intervals = max_intervals
+
+        # sorted, non-overlapping [since, until, count] intervals
+        self.intervals = []
+        self._starts = []
+        try:
+            with open(self.path) as handle:
+                self.intervals = json.load(handle)["intervals"]
+            log.info(f"Loaded density index with {len(self.intervals)} intervals")
+        except FileNotFoundError:
+            pass
+        self._starts = [since for since, _, _ in self.intervals]
+
+    def lookup(self, since, until):
+        """
+        Returns the counts recorded between since and until
+
+        Output:
+            list of (since, until, count) tuples covering the range, count is None where nothing has been recorded
+        """
+        ranges = []
+        pos = since
+        i = max(0, bisect.bisect_right(self._starts, since) - 1)
+        for s, u, count in self.intervals[i:]:
+            if s >= until:
+                break
+            if u <= pos:
+                continue
+            if s > pos:
+                ranges.append((pos, s, None))
+            lo, hi = max(s, pos), min(u, until)
+            # results are assumed to be spread evenly within an interval
+            ranges.append((lo, hi, count * (hi - lo) / (u - s)))
+            pos = hi
+        if pos < until:
+            ranges.append((pos, until, None))
+        return ranges
+
+    def record(self, since, until, count):
+        """
+        Records the number of results between since and until. A range inside a single recorded
+        interval refines it, otherwise only the parts of the range which werent recorded are updated.
+        """
+        since, until = int(since), int(until)
+        if until <= since:
+            return
+
+        i = bisect.bisect_right(self._starts, since) - 1
+        if i >= 0 and self.intervals[i][1] >= until:
+            s, u, c = self.intervals[i]
+            if (s, u) == (since, until):
+                self.intervals[i][2] = count
+                return
+            # split the interval, the rest of its results are spread over what is left of it
+            rest = max(0, c - count) / ((u - s) - (until - since))
+            parts = [[s, since, rest * (since - s)], [since, until, count]]
+            parts.append([until, u, rest * (u - until)])
+            parts = [part for part in parts if part[1] > part[0]]
+            self.intervals[i : i + 1] = parts
+            self._starts[i : i + 1] = [part[0] for part in parts]
+        else:
+            self._fill_gaps(since, until, count)
+
+        if len(self.intervals) > self.max_intervals:
+            self._merge()
+
+    def _fill_gaps(self, since, until, count):
+        ranges = self.lookup(since, until)
+        gaps = [(s, u) for s, u, c in ranges if c is None]
+        if not gaps:
+            return
+
+        # results which arent accounted for by recorded ranges are spread over the gaps
+        remaining = max(0, count - sum(c for _, _, c in ranges if c is not None))
+        width = sum(u - s for s, u in gaps)
+        for s, u in gaps:
+            i = bisect.bisect_left(self._starts, s)
+            self.intervals.insert(i, [s, u, remaining * (u - s) / width])
+            self._starts.insert(i, s)
+
+    def _merge(self):
+        # merge pairs of adjacent intervals to halve the size of the index
+        merged = []
+        for i in range(0, len(self.intervals) - 1, 2):
+            (s1, u1, c1), (s2, u2, c2) = self.intervals[i], self.intervals[i + 1]
+            if u1 == s2:
+                merged.append([s1, u2, c1 + c2])
+            else:
+                merged.extend([[s1, u1, c1], [s2, u2, c2]])
+        if len(self.intervals) % 2:
+            merged.append(self.intervals[-1])
+        self.intervals = merged
+        self._starts = [since for since, _, _ in self.intervals]
+
+    def save(self):
+        write_file(write_json, self.path, {"intervals": self.intervals})
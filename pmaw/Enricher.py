@@ -0,0 +1,114 @@
+import logging
+import queue
+import threading
+import time
+
+from praw.exceptions import RedditAPIException
+
+from pmaw.RateLimit import RateLimit
+from pmaw.utils.enrich import get_projection
+
+log = logging.getLogger(__name__)
+
+
+class Enricher:
+    """Enricher: Enriches Pushshift items with metadata from Reddit on its own worker threads, while Pushshift requests continue"""
+
+    def __init__(
+        self, praw, callback, num_workers=1, rate_limit=100, batch_size=100, fields=None
+    ):
+        """
+        Input:
+            praw (praw.Reddit) - Reddit instance used to retrieve metadata
+            callback (function) - Called from a worker thread with each list of enriched items
+            num_workers (int, optional) - Number of worker threads, defaults to 1 as PRAW isnt guaranteed to be thread-safe
+            rate_limit (int, optional) - Maximum number of Reddit requests per minute, defaults to 100
+            batch_size (int, optional) - Number of fullnames per Reddit request, defaults to 100 which is the maximum
+            fields (list, dict, optional) - Fields kept from each PRAW object, see `get_projection`. Defaults to None for all attributes
+        """
+        self.praw = praw
+        self.callback = callback
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self._project = get_projection(fields)
+        self._rate_limit = RateLimit(rate_limit, limit_type="token_bucket")
+        self._queue = queue.Queue()
+        self._threads = []
+        self._error = None
+
+    def __len__(self):
+        """Number of fullnames waiting to be enriched"""
+        return self._queue.qsize()
+
+    def put(self, fullnames):
+        if not self._threads:
+            for _ in range(self.num_workers):
+                thread = threading.Thread(target=self._run, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        for fullname in fullnames:
+            self._queue.put(fullname)
+
+    def join(self):
+        """Waits for every fullname to be enriched, re-raising any error from the workers"""
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        """Stops the worker threads, discarding any fullnames which havent been enriched"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _next_batch(self):
+        fullname = self._queue.get()
+        if fullname is None:
+            return None
+        batch = [fullname]
+        while len(batch) < self.batch_size:
+            try:
+                fullname = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if fullname is None:
+                # leave the stop signal for after this batch
+                self._queue.task_done()
+                self._queue.put(None)
+                break
+            batch.append(fullname)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                self._queue.task_done()
+                return
+            try:
+                interval = self._rate_limit.delay()
+                if interval > 0:
+                    time.sleep(interval)
+                praw_data = [
+                    self._project(obj) for obj in self.praw.info(fullnames=batch)
+                ]
+                self.callback(praw_data)
+            except RedditAPIException as exc:
+                log.debug(f"Enrichment Failed -- {exc}")
+                for fullname in batch:
+                    self._queue.put(fullname)
+            except BaseException as exc:
+                # raised from the searching thread by join
+                self._error = exc
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
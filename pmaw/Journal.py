@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+
+from pmaw.CacheWriter import write_file, write_json
+
+log = logging.getLogger(__name__)
+
+
+def slice_id(url_pay):
+    """Returns a stable identifier for a (url, payload) request"""
+    return json.dumps(url_pay, sort_keys=True)
+
+
+class Journal:
+    """Journal: Append-only log of search checkpoints, used to resume a search after a crash"""
+
+    def __init__(self, folder, key, compact_every=100):
+        self.log_path = f"{folder}/{key}_journal.ndjson"
+        self.snapshot_path = f"{folder}/{key}_snapshot.json"
+        self.compact_every = compact_every
+
+        self.seq = 0
+        self._records = 0
+        self._state = None
+
+    @property
+    def exists(self):
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.log_path)
+
+    def load(self):
+        """
+        Returns the state of the search at the last checkpoint, or None if there is no journal
+
+        Output:
+            dict with pending requests, payload, limit, cached response files, and result counts per request
+        """
+        state = {
+            "seq": 0,
+            "pending": {},
+            "payload": None,
+            "limit": None,
+            "chunks": [],
+            "completed": {},
+        }
+        if not self.exists:
+            return None
+
+        try:
+            with open(self.snapshot_path) as handle:
+                state = json.load(handle)
+        except FileNotFoundError:
+            pass
+
+        # replay checkpoints made since the snapshot
+        try:
+            with open(self.log_path) as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # the last record may have been partially written during a crash
+                        log.warning("Ignoring incomplete journal record")
+                        break
+                    if record["seq"] > state["seq"]:
+                        self._apply(state, record)
+                        self._records += 1
+        except FileNotFoundError:
+            pass
+
+        self.seq = state["seq"]
+        self._state = state
+        if self.seq == 0:
+            # no checkpoint was completed
+            return None
+        return {
+            "req_list": [tuple(url_pay) for url_pay in state["pending"].values()],
+            "payload": state["payload"],
+            "limit": state["limit"],
+            "chunks": [tuple(chunk) for chunk in state["chunks"]],
+            "completed": state["completed"],
+        }
+
+    @staticmethod
+    def _apply(state, record):
+        state["seq"] = record["seq"]
+        for url_pay in record["added"]:
+            state["pending"][slice_id(url_pay)] = url_pay
+        for url_pay, count in record["completed"]:
+            key = slice_id(url_pay)
+            state["pending"].pop(key, None)
+            state["completed"][key] = count
+        state["chunks"].extend(record["chunks"])
+        state["payload"] = record["payload"]
+        state["limit"] = record["limit"]
+
+    def checkpoint(self, added, completed, chunks, payload, limit):
+        """
+        Appends a checkpoint to the journal, responses in chunks must already be on disk
+
+        Input:
+            added (list) - (url, payload) requests created since the last checkpoint
+            completed (list) - ((url, payload), number of results) for requests completed since the last checkpoint
+            chunks (list) - (filename, number of responses) for response files cached since the last checkpoint
+            payload (dict) - Current search payload
+            limit (int) - Number of items remaining
+        """
+        self.seq += 1
+        record = {
+            "seq": self.seq,
+            "added": [list(url_pay) for url_pay in added],
+            "completed": [[list(url_pay), count] for url_pay, count in completed],
+            "chunks": [list(chunk) for chunk in chunks],
+            "payload": payload,
+            "limit": limit,
+        }
+        with open(self.log_path, "a") as handle:
+            handle.write(json.dumps(record) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        self._records += 1
+        if self._records >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Replaces the log with a snapshot of the current state, so resuming only reads the snapshot"""
+        self.load()
+        write_file(write_json, self.snapshot_path, self._state)
+        # the snapshot includes every record, an empty log can replace it
+        write_file(_truncate, self.log_path, None)
+        self._records = 0
+
+
+def _truncate(path, _data):
+    open(path, "w").close()
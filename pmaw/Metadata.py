@@ -8,6 +8,9 @@ Helper class for working with request metadata
 class Metadata:
     def __init__(self, metadata) -> None:
         self._metadata = metadata
+        # values are only extracted from the metadata when they are first used
+        self._total_results = None
+        self._ranges = None
 
     @property
     def shards_are_down(self) -> bool:
@@ -23,13 +26,20 @@ class Metadata:
 
     @property
     def total_results(self) -> int:
-        try:
-            return self._metadata["es"]["hits"]["total"]["value"]
-        except KeyError:
-            return 0
+        if self._total_results is None:
+            try:
+                self._total_results = self._metadata["es"]["hits"]["total"]["value"]
+            except KeyError:
+                self._total_results = 0
+        return self._total_results
 
     @property
     def ranges(self) -> Tuple[Optional[int], Optional[int]]:
+        if self._ranges is None:
+            self._ranges = self._find_ranges()
+        return self._ranges
+
+    def _find_ranges(self) -> Tuple[Optional[int], Optional[int]]:
         after, before = None, None
         query_params = self._metadata["es_query"]["query"].get("bool", None)
 
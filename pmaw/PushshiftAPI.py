@@ -14,11 +14,25 @@ class PushshiftAPI(PushshiftAPIBase):
             base_backoff (float, optional) - Base delay in seconds for exponential backoff, defaults to 0.5s
             batch_size (int, optional) - Size of batches for multithreading, defaults to number of workers.
             shards_down_behavior (str, optional) - Specifies how PMAW will respond if some shards are down during a query. Options are "warn" to only emit a warning, "stop" to throw a RuntimeError, or None to take no action. Defaults to "warn".
-            limit_type (str, optional) - Type of rate limiting to use, default value is 'average' for rate averaging, use 'backoff' for exponential backoff
+            limit_type (str, optional) - Type of rate limiting to use, default value is 'average' for rate averaging, use 'backoff' for exponential backoff, 'token_bucket' for a token bucket allowing short bursts, 'sliding_window' for a sliding window log, or 'adaptive' to adjust the rate based on responses from Pushshift
             jitter (str, optional) - Jitter to use with backoff, defaults to None, options are None, full, equal, decorr
             checkpoint (int, optional) - Size of interval in batches to print a checkpoint with stats, defaults to 10
             file_checkpoint (int, optional) - Size of interval in batches to cache responses when using mem_safe, defaults to 20
             praw (praw.Reddit, optional) - Used to enrich the Pushshift items retrieved with metadata directly from Reddit
+            enrich_workers (int, optional) - Number of threads enriching items with PRAW while Pushshift requests continue, defaults to 1 as PRAW isnt guaranteed to be thread-safe
+            enrich_rate_limit (int, optional) - Maximum number of requests per minute to Reddit for enrichment, defaults to 100
+            praw_fields (list, dict, optional) - Fields kept from each enriched item as a plain dict, instead of all attributes of the PRAW object. A dict maps output keys to attribute names or functions called with the PRAW object. Defaults to None
+            rate_limiter (RateLimit, optional) - A RateLimit instance to use instead of creating one, share an instance between multiple PushshiftAPI objects to keep them within one rate limit
+            pool_size (int, optional) - Maximum number of keep-alive connections kept by each worker session, defaults to number of workers
+            connect_timeout (float, optional) - Seconds to wait for a connection to Pushshift before retrying the request, defaults to 10s
+            read_timeout (float, optional) - Seconds to wait for a response from Pushshift before retrying the request, defaults to 60s
+            scheduler (str, optional) - How requests are scheduled on the workers, 'stream' submits a new request as soon as a worker is free with at most batch_size requests in flight, 'batch' waits for each batch to complete before starting the next. Defaults to 'stream'
+            checkpoint_interval (float, optional) - Also count a batch towards checkpoints every checkpoint_interval seconds when using the 'stream' scheduler, defaults to None
+            slice_planner (str, optional) - How the search window is split into time slices, 'uniform' splits it into batch_size equal slices, 'density' uses count only requests to split it into batch_size slices with similar numbers of results. Defaults to 'uniform'
+            index_dir (str, optional) - Folder for a density index which records how many results each query has over time, so later searches for the same query can plan their slices without counting results again. Defaults to None for no index
+            response_cache (str, ResponseCache, optional) - Path to a SQLite file, or a ResponseCache, used to cache response bodies so repeated requests are served locally without being rate limited. Defaults to None
+            json_decoder (str, optional) - JSON decoder used for responses, options are 'orjson', 'simdjson', 'ujson', and 'json'. Defaults to None for the fastest one installed
+            num_processes (int, optional) - Number of processes to split non-id searches across, each searching a shard of the search window with an equal share of num_workers and rate_limit, defaults to 1
         """
         super().__init__(*args, **kwargs)
 
@@ -32,14 +46,19 @@ class PushshiftAPI(PushshiftAPIBase):
             mem_safe (boolean, optional) - If True, stores responses in cache during operation, defaults to False
             safe_exit (boolean, optional) - If True, will safely exit if interrupted by storing current responses and requests in the cache. Will also load previous requests / responses if found in cache, defaults to False
             cache_dir (str, optional) - An absolute or relative folder path to cache responses in when mem_safe or safe_exit is enabled
+            cache_format (str, optional) - Format of cached response files, options are 'pickle.gz', 'ndjson', 'ndjson.gz', 'ndjson.zst', 'ndjson.lz4', and 'parquet'. Defaults to 'pickle.gz'
+            dedup (boolean, str, optional) - If True or 'set', items with an id which has already been retrieved are dropped before they count towards the limit. 'bloom' uses a Bloom filter with fixed memory use for very large searches, which may drop a small fraction of new items, sized for twice the limit or 10 million ids (about 30MB) without a limit. Defaults to False
+            stream (boolean, optional) - If True, returns immediately and responses are returned by the generator while the search is still running, defaults to False. Cannot be used with mem_safe or safe_exit
+            stream_buffer (int, optional) - Maximum number of requests worth of responses buffered when stream is enabled before the search waits for them to be consumed, defaults to 10
         Output:
             Response generator object
         """
         kwargs["ids"] = ids
-        if "filter_fn" in kwargs:
-            raise ValueError(
-                "filter_fn not supported for search_submission_comment_ids"
-            )
+        for option in ("filter_fn", "filters"):
+            if option in kwargs:
+                raise ValueError(
+                    f"{option} not supported for search_submission_comment_ids"
+                )
         return self._search(kind="submission_comment_ids", **kwargs)
 
     def search_comments(self, **kwargs):
@@ -53,7 +72,15 @@ class PushshiftAPI(PushshiftAPIBase):
             search_window (int, optional) - Size in days for search window for submissions / comments in non-id based search, defaults to 365
             safe_exit (boolean, optional) - If True, will safely exit if interrupted by storing current responses and requests in the cache. Will also load previous requests / responses if found in cache, defaults to False
             filter_fn (function, optional) - A function used for custom filtering the results before saving them. Accepts a single comment parameter and returns False to filter out the item, otherwise returns True.
+            filters (dict, optional) - Fields mapped to conditions the results must match before saving them, compiled once and applied to each batch. A condition is an (op, value) tuple, a list of them, or a value the field must equal. Operators are ==, !=, >, >=, <, <=, in, not in, contains, regex, and exists
+            optimize (boolean, optional) - If True, the fields used by filters, filter_fn, and dedup are added to the filter parameter, and filters conditions on score, num_comments, subreddit, and author are pushed into the query. Defaults to True
             cache_dir (str, optional) - An absolute or relative folder path to cache responses in when mem_safe or safe_exit is enabled
+            cache_format (str, optional) - Format of cached response files, options are 'pickle.gz', 'ndjson', 'ndjson.gz', 'ndjson.zst', 'ndjson.lz4', and 'parquet'. Defaults to 'pickle.gz'
+            dedup (boolean, str, optional) - If True or 'set', items with an id which has already been retrieved are dropped before they count towards the limit. 'bloom' uses a Bloom filter with fixed memory use for very large searches, which may drop a small fraction of new items, sized for twice the limit or 10 million ids (about 30MB) without a limit. Defaults to False
+            stream (boolean, optional) - If True, returns immediately and responses are returned by the generator while the search is still running, defaults to False. Cannot be used with mem_safe or safe_exit
+            stream_buffer (int, optional) - Maximum number of requests worth of responses buffered when stream is enabled before the search waits for them to be consumed, defaults to 10
+            sink (Sink, optional) - Sink such as NDJSONSink, CSVSink, ParquetSink, or SQLiteSink which results are written to in batches instead of being kept in memory. The sink is closed and returned once the search completes. Cannot be used with stream, mem_safe, or safe_exit. Defaults to None
+            work_queue (WorkQueue, str, optional) - A WorkQueue or the path of its SQLite file, pending requests are leased from the queue and shared with other nodes using it. Non-id searches must set since, cannot be used with limit or safe_exit. Defaults to None
         Output:
             Response generator object
         """
@@ -70,8 +97,33 @@ class PushshiftAPI(PushshiftAPIBase):
             search_window (int, optional) - Size in days for search window for submissions / comments in non-id based search, defaults to 365
             safe_exit (boolean, optional) - If True, will safely exit if interrupted by storing current responses and requests in the cache. Will also load previous requests / responses if found in cache, defaults to False
             filter_fn (function, optional) - A function used for custom filtering the results before saving them. Accepts a single submission parameter and returns False to filter out the item, otherwise returns True.
+            filters (dict, optional) - Fields mapped to conditions the results must match before saving them, compiled once and applied to each batch. A condition is an (op, value) tuple, a list of them, or a value the field must equal. Operators are ==, !=, >, >=, <, <=, in, not in, contains, regex, and exists
+            optimize (boolean, optional) - If True, the fields used by filters, filter_fn, and dedup are added to the filter parameter, and filters conditions on score, num_comments, subreddit, and author are pushed into the query. Defaults to True
             cache_dir (str, optional) - An absolute or relative folder path to cache responses in when mem_safe or safe_exit is enabled
+            cache_format (str, optional) - Format of cached response files, options are 'pickle.gz', 'ndjson', 'ndjson.gz', 'ndjson.zst', 'ndjson.lz4', and 'parquet'. Defaults to 'pickle.gz'
+            dedup (boolean, str, optional) - If True or 'set', items with an id which has already been retrieved are dropped before they count towards the limit. 'bloom' uses a Bloom filter with fixed memory use for very large searches, which may drop a small fraction of new items, sized for twice the limit or 10 million ids (about 30MB) without a limit. Defaults to False
+            stream (boolean, optional) - If True, returns immediately and responses are returned by the generator while the search is still running, defaults to False. Cannot be used with mem_safe or safe_exit
+            stream_buffer (int, optional) - Maximum number of requests worth of responses buffered when stream is enabled before the search waits for them to be consumed, defaults to 10
+            sink (Sink, optional) - Sink such as NDJSONSink, CSVSink, ParquetSink, or SQLiteSink which results are written to in batches instead of being kept in memory. The sink is closed and returned once the search completes. Cannot be used with stream, mem_safe, or safe_exit. Defaults to None
+            work_queue (WorkQueue, str, optional) - A WorkQueue or the path of its SQLite file, pending requests are leased from the queue and shared with other nodes using it. Non-id searches must set since, cannot be used with limit or safe_exit. Defaults to None
         Output:
             Response generator object
         """
         return self._search(kind="submission", **kwargs)
+
+    def sync(self, kind, state_dir, **kwargs):
+        """
+        Method for incrementally fetching the submissions or comments posted since the last sync of the same query
+
+        Input:
+            kind (str) - Type of items to sync, either 'submission' or 'comment'
+            state_dir (str) - Folder to store the sync state and the items retrieved by every sync of the query
+            overlap (int, optional) - Seconds before the newest item from the last sync to search again for items Pushshift ingested late, defaults to 3600
+            cache_format (str, optional) - Format of the cached response files, defaults to 'pickle.gz'
+            since (int, optional) - Epoch time to start from on the first sync, later syncs start from the newest item already retrieved
+            filter (list, optional) - Fields to return, id and created_utc are always included
+            Other search parameters are the same as for `search_submissions` and `search_comments`, except for until, limit, mem_safe, safe_exit, stream, dedup, and filter_fn
+        Output:
+            Response generator object with the items which are new since the last sync
+        """
+        return self._sync(kind, state_dir, **kwargs)
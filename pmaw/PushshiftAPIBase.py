@@ -1,18 +1,63 @@
 import json
 import copy
+import hashlib
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
+import pickle
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 
 import requests
-from pmaw.types.exceptions import HTTPError, HTTPNotFoundError
+from pmaw.types.exceptions import (
+    HTTPError,
+    HTTPNotFoundError,
+    HTTPTooManyRequestsError,
+    HTTPServerError,
+)
 from pmaw.Metadata import Metadata
+from pmaw.Result import Result
+from pmaw.Cache import Cache
+from pmaw.CacheWriter import write_file, write_json
 
 from pmaw.RateLimit import RateLimit
 from pmaw.Request import Request
+from pmaw.Response import Response
+from pmaw.SessionPool import SessionPool
+from pmaw.ResponseCache import ResponseCache
+from pmaw.DensityIndex import DensityIndex
+from pmaw.WorkQueue import WorkQueue
+from pmaw.utils.slices import timeslice, mapslice, plan_slices
+from pmaw.utils.decode import get_decoder
+from pmaw.utils.dedup import IdSet, id_key
+from pmaw.utils.keys import sync_key
+from pmaw.utils.optimizer import optimize_query
 
 
 log = logging.getLogger(__name__)
 
+# search parameters which arent part of the Pushshift query
+_SEARCH_OPTIONS = (
+    "max_ids_per_request",
+    "max_results_per_request",
+    "search_window",
+    "dataset",
+    "filter_fn",
+    "filters",
+    "optimize",
+    "cache_format",
+    "cache_dir",
+    "stream_buffer",
+)
+
 
 class PushshiftAPIBase:
     _base_url = "https://{domain}.pushshift.io/{{endpoint}}"
@@ -30,26 +75,81 @@ class PushshiftAPIBase:
         checkpoint=10,
         file_checkpoint=20,
         praw=None,
+        pool_size=None,
+        connect_timeout=10,
+        read_timeout=60,
+        scheduler="stream",
+        checkpoint_interval=None,
+        rate_limiter=None,
+        slice_planner="uniform",
+        index_dir=None,
+        response_cache=None,
+        enrich_workers=1,
+        enrich_rate_limit=100,
+        praw_fields=None,
+        json_decoder=None,
+        num_processes=1,
     ):
+        # constructor arguments, used to create an instance in each process of a sharded search
+        self._config = {k: v for k, v in locals().items() if k not in ("self", "__class__")}
+
+        if scheduler not in ("stream", "batch"):
+            raise ValueError("scheduler must be either 'stream' or 'batch'")
+        if slice_planner not in ("uniform", "density"):
+            raise ValueError("slice_planner must be either 'uniform' or 'density'")
+
         self.num_workers = num_workers
+        self.num_processes = num_processes
         self.domain = "api"
         self.shards_down_behavior = shards_down_behavior
         self.meta = Metadata({})
-        self.resp_dict = {}
         self.checkpoint = checkpoint
         self.file_checkpoint = file_checkpoint
         self.praw = praw
+        self.enrich_workers = enrich_workers
+        self.enrich_rate_limit = enrich_rate_limit
+        self.praw_fields = praw_fields
+        self.scheduler = scheduler
+        self.checkpoint_interval = checkpoint_interval
+        self.slice_planner = slice_planner
+        self._slice_target = 0
+        self.index_dir = index_dir
+        self._density_index = None
 
         if batch_size:
             self.batch_size = batch_size
         else:
             self.batch_size = num_workers
 
-        # instantiate rate limiter
-        self._rate_limit = RateLimit(
-            rate_limit, base_backoff, limit_type, max_sleep, jitter
+        # instantiate rate limiter, unless a shared one is provided
+        if rate_limiter is not None:
+            self._rate_limit = rate_limiter
+        else:
+            self._rate_limit = RateLimit(
+                rate_limit, base_backoff, limit_type, max_sleep, jitter
+            )
+
+        # decodes response bodies from bytes, without decoding them to str first
+        self._loads = get_decoder(json_decoder)
+
+        # local cache of response bodies, hits skip the network and the rate limiter
+        if response_cache is None or isinstance(response_cache, ResponseCache):
+            self._response_cache = response_cache
+        else:
+            self._response_cache = ResponseCache(response_cache)
+
+        # keep-alive sessions for each worker
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._sessions = SessionPool(
+            pool_size or num_workers, connect_timeout, read_timeout
         )
 
+    @property
+    def pool_stats(self):
+        # getter for connection pool stats, connections are reused when requests > connections
+        return self._sessions.stats
+
     @property
     def base_url(self):
         # getter for base_url, with formatted domain
@@ -58,47 +158,82 @@ class PushshiftAPIBase:
     def _impose_rate_limit(self):
         interval = self._rate_limit.delay()
         if interval > 0:
-            self.req._idle_task(interval)
+            time.sleep(interval)
 
     def _get(self, url, payload={}):
+        """Makes a single request from a worker thread, returns a `Result` without modifying any shared state"""
+        cached = self._cached_response(url, payload)
+        if cached is not None:
+            return cached
+
         self._impose_rate_limit()
-        r = requests.get(url, params=payload)
-        status = r.status_code
-        reason = r.reason
+        start = time.monotonic()
+        r = self._sessions.get(url, params=payload)
+        latency = time.monotonic() - start
+        result = self._parse_response(
+            r.status_code, r.reason, r.content, r.headers, latency
+        )
+        self._rate_limit._req_success(latency)
+        self._cache_response(url, payload, r.content, result)
+        return result
 
-        if status == 200:
-            r = json.loads(r.text)
+    def _cached_response(self, url, payload):
+        # returns the parsed response from the response cache, None on a miss
+        if self._response_cache is None:
+            return None
+        body = self._response_cache.get(url, payload)
+        if body is None:
+            return None
+        result = self._parse_response(200, "OK", body)
+        result.cached = True
+        return result
 
-            # check if shards are down
-            self.meta = Metadata(r.get("metadata", {}))
-            total_results = self.meta.total_results
-            if total_results:
-                after, before = self.meta.ranges
-                if after and before:
-                    self.resp_dict[(after, before)] = total_results
+    def _cache_response(self, url, payload, body, result):
+        # only successful responses reach here, errors are raised while parsing. Responses with shards
+        # down may be missing results, they arent replayed from the cache
+        if self._response_cache is not None and not result.metadata.shards_are_down:
+            self._response_cache.set(url, payload, body)
 
-            return r["data"]
+    def _parse_response(self, status, reason, body, headers={}, latency=0.0):
+        if status == 200:
+            return Result.from_body(self._loads(body), status, latency)
         else:
+            retry_after = self._retry_after(headers.get("Retry-After"))
             if status == 404:
                 raise HTTPNotFoundError(f"HTTP {status} - {reason}")
+            elif status == 429:
+                raise HTTPTooManyRequestsError(
+                    f"HTTP {status} - {reason}", retry_after=retry_after
+                )
+            elif status >= 500:
+                raise HTTPServerError(
+                    f"HTTP {status} - {reason}", retry_after=retry_after
+                )
             else:
-                # TODO: add custom error types for rate limit and other errors
                 raise HTTPError(f"HTTP {status} - {reason}")
 
+    @staticmethod
+    def _retry_after(value):
+        # Retry-After is either a number of seconds or an HTTP date
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
     def _multithread(self, check_total=False):
+        if self.scheduler == "stream" and not check_total:
+            return self._multistream()
+
         with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
 
             while len(self.req.req_list) > 0 and not self.req.exit.is_set():
-                # reset resp_dict which tracks remaining responses for timeslices
-                self.resp_dict = {}
-
-                # set number of futures created to batch size
-                reqs = []
-                if check_total:
-                    reqs.append(self.req.req_list.popleft())
-                else:
-                    for i in range(min(len(self.req.req_list), self.batch_size)):
-                        reqs.append(self.req.req_list.popleft())
+                reqs = self._next_batch(check_total)
 
                 futures = {
                     executor.submit(self._get, url_pay[0], url_pay[1]): url_pay
@@ -107,94 +242,189 @@ class PushshiftAPIBase:
 
                 self._futures_handler(futures, check_total)
 
-                # reset attempts if no failures
-                self._rate_limit._check_fail()
+                try:
+                    self._end_batch(check_total)
+                except RuntimeError:
+                    self._shutdown(executor)
+                    raise
 
-                # check if shards are down
-                if self.meta.shards_are_down and (
-                    self.shards_down_behavior is not None
-                ):
-                    shards_down_message = "Not all PushShift shards are active. Query results may be incomplete."
-                    if self.shards_down_behavior == "warn":
-                        log.warning(shards_down_message)
-                    if self.shards_down_behavior == "stop":
-                        self._shutdown(executor)
-                        raise RuntimeError(
-                            shards_down_message
-                            + f" {len(self.req.req_list)} unfinished requests."
-                        )
-                if not check_total:
-                    self.num_batches += 1
-                    if self.num_batches % self.file_checkpoint == 0:
-                        # cache current results
-                        executor.submit(self.req.save_cache())
-                    self._print_stats("Checkpoint")
-                else:
+                if check_total:
                     break
             if not check_total:
                 self._print_stats("Total")
             self._shutdown(executor)
 
+    def _multistream(self):
+        # submit a new request as soon as a worker frees up, keeping at most batch_size in flight,
+        # a batch is counted every batch_size completed requests (or checkpoint_interval seconds)
+        # for checkpoints and shard checks
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            futures = {}
+            completed = 0
+            last_batch = time.time()
+
+            while futures or (
+                len(self.req.req_list) > 0 and not self.req.exit.is_set()
+            ):
+                # dont start new requests after an exit signal, in-flight requests are
+                # allowed to finish so their slices can be saved
+                self.req.lease(self.batch_size - len(futures))
+                while (
+                    len(futures) < self.batch_size
+                    and len(self.req.req_list) > 0
+                    and not self.req.exit.is_set()
+                ):
+                    url_pay = self.req.req_list.popleft()
+                    futures[executor.submit(self._get, url_pay[0], url_pay[1])] = url_pay
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                limit_reached = False
+                for future in done:
+                    completed += 1
+                    if self._handle_result(futures.pop(future), future.result, False):
+                        limit_reached = True
+                        break
+                if limit_reached:
+                    break
+
+                interval_passed = (
+                    self.checkpoint_interval is not None
+                    and time.time() - last_batch >= self.checkpoint_interval
+                )
+                if completed >= self.batch_size or interval_passed:
+                    completed = max(0, completed - self.batch_size)
+                    last_batch = time.time()
+                    try:
+                        self._end_batch(False)
+                    except RuntimeError:
+                        self._shutdown(executor)
+                        raise
+
+            self._print_stats("Total")
+            self._shutdown(executor)
+
+    def _next_batch(self, check_total):
+        # set number of futures created to batch size
+        reqs = []
+        if check_total:
+            reqs.append(self.req.req_list.popleft())
+        else:
+            self.req.lease(self.batch_size)
+            for i in range(min(len(self.req.req_list), self.batch_size)):
+                reqs.append(self.req.req_list.popleft())
+        return reqs
+
+    def _end_batch(self, check_total):
+        # reset attempts if no failures
+        self._rate_limit._check_fail()
+
+        # check if shards were down for any response since the last batch
+        shards_down, self._shards_down = self._shards_down, False
+        if shards_down and (self.shards_down_behavior is not None):
+            shards_down_message = "Not all PushShift shards are active. Query results may be incomplete."
+            if self.shards_down_behavior == "warn":
+                log.warning(shards_down_message)
+            if self.shards_down_behavior == "stop":
+                raise RuntimeError(
+                    shards_down_message
+                    + f" {len(self.req.req_list)} unfinished requests."
+                )
+        if not check_total:
+            self.num_batches += 1
+            if self.num_batches % self.file_checkpoint == 0:
+                # cache current results, without waiting for enrichment to catch up
+                self.req.save_cache(drain=False)
+            self._print_stats("Checkpoint")
+
     def _futures_handler(self, futures, check_total):
         for future in as_completed(futures):
-            url_pay = futures[future]
-            self.num_req += int(not check_total)
-            try:
-                data = future.result()
-                self.num_suc += int(not check_total)
-                url = url_pay[0]
-                payload = url_pay[1]
-                if not check_total:
-                    self.req.save_resp(data)
-
-                    log.debug(f"Remaining limit {self.req.limit}")
-                    if self.req.limit <= 0:
-                        log.debug(
-                            f"Cancelling {len(self.req.req_list)} unfinished requests"
-                        )
-                        self.req.req_list.clear()
-                        break
+            if self._handle_result(futures[future], future.result, check_total):
+                break
+
+    def _handle_result(self, url_pay, result, check_total):
+        """Process the outcome of a single request, returns True once the limit has been reached."""
+        self.num_req += int(not check_total)
+        try:
+            res = result()
+            data = res.data
+            self.num_suc += int(not check_total)
+            url = url_pay[0]
+            payload = url_pay[1]
+
+            # results are only aggregated here, on the thread handling completed requests
+            self.meta = res.metadata
+            if res.metadata.shards_are_down:
+                self._shards_down = True
+
+            if check_total:
+                self._probe = res
+            else:
+                self.req.save_resp(data)
+                self.req.slice_done(url_pay, len(data))
+
+                log.debug(f"Remaining limit {self.req.limit}")
+                if self.req.limit <= 0:
+                    log.debug(
+                        f"Cancelling {len(self.req.req_list)} unfinished requests"
+                    )
+                    self.req.req_list.clear()
+                    return True
+
+                # handle time slicing logic
+                if "until" in payload and "since" in payload:
+                    until = payload["until"]
+                    since = payload["since"]
+                    log.debug(
+                        f"Time slice from {since} - {until} returned {len(data)} results"
+                    )
+                    total_results = res.total_results
+                    log.debug(f"{total_results} total results for this time slice")
+                    if self._density_index is not None and (total_results or not data):
+                        self._density_index.record(since, until, total_results)
+                    # calculate remaining results
+                    remaining = total_results - len(data)
+
+                    # number of timeslices is depending on remaining results
+                    # planned slices are paged through, unless the plan underestimated them
+                    split_above = max(
+                        self.req.max_results_per_request * 2, 2 * self._slice_target
+                    )
+                    if remaining > split_above:
+                        num = 2
+                    elif remaining > 0:
+                        num = 1
+                    else:
+                        num = 0
+
+                    if num > 0:
+                        # find minimum `created_utc` to set as the `before` parameter in next timeslices
+                        # Fix issue where Pushshift occasionally reports remaining results that it is
+                        # unable to return - len(data) == 0 when this happens
+                        if len(data) > 0:
+                            until = data[-1]["created_utc"]
+                            # generate payloads
+                            self.req.gen_slices(url, payload, since, until, num)
+
+        except HTTPNotFoundError as exc:
+            log.debug(f"Request Failed -- {exc}")
+            # dont retry ids not found
+            # it looks like submission/comment_ids/ returns 404s now
+            if "ids" not in self.req.payload:
+                self.req.retry(url_pay)
+            elif not check_total:
+                self.req.slice_done(url_pay, 0)
 
-                    # handle time slicing logic
-                    if "until" in payload and "since" in payload:
-                        until = payload["until"]
-                        since = payload["since"]
-                        log.debug(
-                            f"Time slice from {since} - {until} returned {len(data)} results"
-                        )
-                        total_results = self.resp_dict.get((since, until), 0)
-                        log.debug(f"{total_results} total results for this time slice")
-                        # calculate remaining results
-                        remaining = total_results - len(data)
-
-                        # number of timeslices is depending on remaining results
-                        if remaining > self.req.max_results_per_request * 2:
-                            num = 2
-                        elif remaining > 0:
-                            num = 1
-                        else:
-                            num = 0
-
-                        if num > 0:
-                            # find minimum `created_utc` to set as the `before` parameter in next timeslices
-                            # Fix issue where Pushshift occasionally reports remaining results that it is
-                            # unable to return - len(data) == 0 when this happens
-                            if len(data) > 0:
-                                until = data[-1]["created_utc"]
-                                # generate payloads
-                                self.req.gen_slices(url, payload, since, until, num)
-
-            except HTTPNotFoundError as exc:
-                log.debug(f"Request Failed -- {exc}")
-                # dont retry ids not found
-                # it looks like submission/comment_ids/ returns 404s now
-                if "ids" not in self.req.payload:
-                    self.req.req_list.appendleft(url_pay)
-
-            except HTTPError as exc:
-                log.debug(f"Request Failed -- {exc}")
-                self._rate_limit._req_fail()
-                self.req.req_list.appendleft(url_pay)
+        except (HTTPError, requests.Timeout) as exc:
+            log.debug(f"Request Failed -- {exc}")
+            # only rate limiting, server errors and timeouts indicate Pushshift is overloaded
+            overloaded = not isinstance(exc, HTTPError) or isinstance(
+                exc, (HTTPTooManyRequestsError, HTTPServerError)
+            )
+            self._rate_limit._req_fail(overloaded, getattr(exc, "retry_after", None))
+            self.req.retry(url_pay)
+
+        return False
 
     def _shutdown(self, exc, wait=False, cancel_futures=True):
         # shutdown executor
@@ -208,25 +438,212 @@ class PushshiftAPIBase:
     def _print_stats(self, prefix):
         rate = self.num_suc / self.num_req * 100
         remaining = self.req.limit
+        limit_msg = ""
+        if self._rate_limit.limit_type == "adaptive":
+            # report the sustainable rate discovered so far
+            limit_msg = f" - Rate Limit: {self._rate_limit.current_rate:.2f}/min"
         if (self.num_batches % self.checkpoint == 0) and prefix == "Checkpoint":
             log.info(
-                f"{prefix}:: Success Rate: {rate:.2f}% - Requests: {self.num_req} - Batches: {self.num_batches} - Items Remaining: {remaining}"
+                f"{prefix}:: Success Rate: {rate:.2f}% - Requests: {self.num_req} - Batches: {self.num_batches} - Items Remaining: {remaining}{limit_msg}"
             )
         elif prefix == "Total":
             if remaining < 0:
                 remaining = 0  # don't print a neg number
             log.info(
-                f"{prefix}:: Success Rate: {rate:.2f}% - Requests: {self.num_req} - Batches: {self.num_batches} - Items Remaining: {remaining}"
+                f"{prefix}:: Success Rate: {rate:.2f}% - Requests: {self.num_req} - Batches: {self.num_batches} - Items Remaining: {remaining}{limit_msg}"
             )
-            if self.req.praw and len(self.req.enrich_list) > 0:
+            if self.num_probes:
+                log.info(f"Slice Planner:: Count Requests: {self.num_probes}")
+            log.debug(f"Connection Pool:: {self.pool_stats}")
+            if self._response_cache is not None:
+                log.info(
+                    f"Response Cache:: Hits: {self._response_cache.hits} - Misses: {self._response_cache.misses}"
+                )
+            if self.req._dedup is not None:
+                log.info(f"Duplicates Removed:: {self.req._dedup.num_duplicates}")
+            if self.req.work_queue is not None:
+                log.info(f"Work Queue:: {self.req.work_queue.stats}")
+            if self.req._enricher is not None and len(self.req._enricher) > 0:
                 # let the user know praw enrichment is still in progress so it doesnt appear to hang after
                 # finishing retrieval from Pushshift
-                log.info(f"Finishing enrichment for {len(self.req.enrich_list)} items")
+                log.info(f"Finishing enrichment for {len(self.req._enricher)} items")
+
+    def _plan_slices(self, url, payload, since, until, num_counts=10, max_depth=2):
+        """
+        Plans batch_size slices with roughly equal numbers of results, using num_counts count only
+        requests to find how results are distributed over the window. Ranges which are much denser
+        than the ranges around them are counted again with finer ranges, up to max_depth times.
+        Counts recorded in the density index by previous searches are used instead of counting again.
+        """
+        self._slice_target = 0
+        if self._density_index is not None:
+            known = self._density_index.lookup(since, until)
+        else:
+            known = [(since, until, None)]
+        counted = [r for r in known if r[2] is not None]
+        ranges = [(r_since, r_until) for r_since, r_until, count in known if count is None]
+
+        if ranges and self.slice_planner == "uniform":
+            # only plan from the index when it covers the whole window
+            ts = timeslice(since, until, self.batch_size)
+            return list(zip(ts[:-1], ts[1:]))
+
+        max_results = self.req.max_results_per_request
+        for depth in range(max_depth):
+            if not ranges:
+                break
+            probes = []
+            # the first counts are shared between the ranges missing from the index
+            per_range = num_counts if depth else max(1, num_counts // len(ranges))
+            for r_since, r_until in ranges:
+                num = max(1, min(per_range, r_until - r_since))
+                ts = timeslice(r_since, r_until, num)
+                probes.append(list(zip(ts[:-1], ts[1:])))
+
+            counts = self._count_results(
+                url, payload, [probe for group in probes for probe in group]
+            )
+
+            ranges = []
+            for group in probes:
+                group_counts = counts[: len(group)]
+                counts = counts[len(group) :]
+                known = sorted(c for c in group_counts if c is not None)
+                median = known[len(known) // 2] if known else 0
+                for (p_since, p_until), count in zip(group, group_counts):
+                    # a burst of activity, count it again to find where the slices should be cut
+                    burst = (
+                        count is not None
+                        and count > max_results * self.batch_size
+                        and count > 2 * median
+                    )
+                    if burst and depth + 1 < max_depth and p_until - p_since > 1:
+                        ranges.append((p_since, p_until))
+                    else:
+                        counted.append((p_since, p_until, count))
+
+        counted.sort()
+        slices = plan_slices(counted, self.batch_size)
+        total = sum(count for _, _, count in counted if count)
+        self._slice_target = total / max(1, len(slices))
+        log.debug(
+            f"Planned {len(slices)} slices between {since} and {until} for {total:.0f} results using {len(counted)} counts"
+        )
+        return slices
+
+    def _count_results(self, url, payload, ranges):
+        """Returns the number of results in each (since, until) range, None if it couldnt be counted"""
+
+        def count(since, until):
+            try:
+                res = self._get(url, mapslice(dict(payload, size=1), since, until))
+            except (HTTPError, requests.Timeout) as exc:
+                log.debug(f"Count Failed -- {exc}")
+                return None
+            if not res.total_results and res.data:
+                # the response is missing its metadata
+                return None
+            return res.total_results
+
+        self.num_probes += len(ranges)
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            counts = list(executor.map(lambda r: count(*r), ranges))
+
+        if self._density_index is not None:
+            for (since, until), total in zip(ranges, counts):
+                if total is not None:
+                    self._density_index.record(since, until, total)
+        return counts
 
     def _reset(self):
         self.num_suc = 0
         self.num_req = 0
         self.num_batches = 0
+        self.num_probes = 0
+
+    def _sync(self, kind, state_dir, overlap=3600, cache_format="pickle.gz", **kwargs):
+        """Searches for the items posted since the last sync of the same query, see `PushshiftAPI.sync`"""
+        if kind not in ("submission", "comment"):
+            raise ValueError("kind must be either 'submission' or 'comment'")
+        for param in (
+            "until",
+            "limit",
+            "ids",
+            "mem_safe",
+            "safe_exit",
+            "stream",
+            "dedup",
+            "work_queue",
+            "sink",
+            # the state of a sync is keyed on its query, a function cant be part of the key
+            "filter_fn",
+        ):
+            if param in kwargs:
+                raise ValueError(f"{param} is not supported by sync")
+        if self.num_processes > 1:
+            # sharded searches return their results from the shard caches, rather than in the response
+            raise ValueError("num_processes is not supported by sync")
+
+        query = {k: v for k, v in kwargs.items() if k not in _SEARCH_OPTIONS}
+        key = sync_key(query, kind, kwargs.get("filters"))
+        Path(state_dir).mkdir(exist_ok=True, parents=True)
+        state_path = f"{state_dir}/{key}_sync.json"
+        try:
+            with open(state_path) as handle:
+                state = json.load(handle)
+        except FileNotFoundError:
+            state = {"key": key, "high_water": None, "recent": {}, "chunks": 0}
+
+        # search again from a little before the newest item seen, Pushshift can ingest items late
+        if state["high_water"] is not None:
+            kwargs["since"] = int(state["high_water"] - overlap)
+        kwargs["until"] = int(time.time())
+        log.info(f"Syncing {key} from {kwargs.get('since')} to {kwargs['until']}")
+
+        if "filter" in kwargs:
+            # ids and creation times track the items already retrieved, the key uses the filter as passed
+            fields = kwargs["filter"]
+            fields = fields.split(",") if isinstance(fields, str) else list(fields)
+            kwargs["filter"] = fields + [
+                field for field in ("id", "created_utc") if field not in fields
+            ]
+
+        # items from the overlap which were already retrieved are dropped
+        dedup = IdSet()
+        for item_id in state["recent"]:
+            dedup.add(id_key(item_id))
+
+        resp = self._search(kind, dedup=dedup, **kwargs)
+        items = resp.responses
+
+        if items:
+            # append the new items to the items from previous syncs
+            cache = Cache({}, False, state_dir, key=key, cache_format=cache_format)
+            cache.chunk_offset = state["chunks"]
+            cache.cache_responses(list(items))
+            cache.close()
+            state["chunks"] += 1
+
+        created = [item["created_utc"] for item in items if "created_utc" in item]
+        if created:
+            state["high_water"] = max(created + [state["high_water"] or 0])
+        elif state["high_water"] is None:
+            state["high_water"] = kwargs["until"]
+
+        recent = dict(state["recent"])
+        recent.update(
+            (item["id"], item["created_utc"])
+            for item in items
+            if "id" in item and "created_utc" in item
+        )
+        state["recent"] = {
+            item_id: created_utc
+            for item_id, created_utc in recent.items()
+            if created_utc >= state["high_water"] - overlap
+        }
+        state["until"] = kwargs["until"]
+        write_file(write_json, state_path, state)
+        return resp
 
     def _search(
         self,
@@ -239,8 +656,309 @@ class PushshiftAPIBase:
         safe_exit=False,
         cache_dir=None,
         filter_fn=None,
+        stream=False,
+        stream_buffer=10,
+        cache_format="pickle.gz",
+        dedup=False,
+        filters=None,
+        work_queue=None,
+        sink=None,
         **kwargs,
     ):
+        if work_queue is not None:
+            work_queue = self._init_queue(work_queue, safe_exit, kwargs)
+        elif self.num_processes > 1 and "ids" not in kwargs:
+            if stream:
+                raise ValueError("stream cannot be used with num_processes")
+            if sink is not None:
+                raise ValueError("sink cannot be used with num_processes")
+            return self._search_sharded(
+                kind,
+                kwargs,
+                max_results_per_request=max_results_per_request,
+                mem_safe=mem_safe,
+                search_window=search_window,
+                dataset=dataset,
+                safe_exit=safe_exit,
+                cache_dir=cache_dir,
+                filter_fn=filter_fn,
+                cache_format=cache_format,
+                dedup=dedup,
+                filters=filters,
+            )
+
+        url = self._init_search(
+            kind,
+            max_ids_per_request,
+            max_results_per_request,
+            mem_safe,
+            dataset,
+            safe_exit,
+            cache_dir,
+            filter_fn,
+            kwargs,
+            stream,
+            stream_buffer,
+            cache_format,
+            dedup,
+            filters,
+            sink,
+        )
+
+        if stream:
+            # run the search in the background, feeding responses to the generator
+            thread = threading.Thread(
+                target=self._stream_search,
+                args=(url, search_window, work_queue),
+                daemon=True,
+            )
+            thread.start()
+            return self.req.resp
+
+        return self._run_search(url, search_window, work_queue)
+
+    def _init_queue(self, work_queue, safe_exit, kwargs):
+        """Validates the parameters of a distributed search, returns its `WorkQueue`"""
+        if safe_exit:
+            raise ValueError(
+                "safe_exit cannot be used with work_queue, the queue records the progress of the search"
+            )
+        if "limit" in kwargs:
+            raise ValueError("limit cannot be used with work_queue")
+        if "since" not in kwargs and "ids" not in kwargs:
+            # every node has to search the same window
+            raise ValueError("since must be set when using work_queue")
+        if self.num_processes > 1:
+            raise ValueError("num_processes cannot be used with work_queue")
+
+        if isinstance(work_queue, (str, Path)):
+            return WorkQueue(work_queue)
+        return work_queue
+
+    def _shard_config(self):
+        """Returns the parameters of the PushshiftAPI each shard process creates"""
+        num = self.num_processes
+        # each process gets an equal share of the workers and the rate limit, in whole requests per minute
+        config = dict(
+            self._config,
+            num_processes=1,
+            num_workers=max(1, math.ceil(self.num_workers / num)),
+            rate_limit=max(1, int(self._config["rate_limit"] // num)),
+            # the density index is saved by a single process
+            index_dir=None,
+        )
+        if isinstance(self._response_cache, ResponseCache):
+            # sqlite connections cant be sent to another process, each opens its own
+            config["response_cache"] = self._response_cache.path
+        return config
+
+    def _search_sharded(self, kind, kwargs, **options):
+        """
+        Splits the search window into num_processes shards which are searched in separate processes,
+        each process caches its results and the caches are merged into one Response
+        """
+        if kind == "submission_comment_ids":
+            raise ValueError("num_processes cannot be used with submission_comment_ids")
+        if self.praw is not None:
+            raise ValueError("num_processes cannot be used with PRAW enrichment")
+        if self._config["rate_limiter"] is not None:
+            raise ValueError("rate_limiter cant be shared between processes")
+        if "limit" in kwargs and (
+            options["filter_fn"] is not None or options["filters"] is not None
+        ):
+            # the limit counts results before they are filtered, which depends on how the window is sliced
+            raise ValueError(
+                "limit cannot be used with filter_fn or filters when num_processes is set"
+            )
+
+        # search options are pickled to be sent to the processes, which fails for lambdas and nested functions
+        for name, value in dict(options, **kwargs).items():
+            try:
+                pickle.dumps(value)
+            except (pickle.PicklingError, AttributeError, TypeError) as exc:
+                raise ValueError(
+                    f"{name} cant be sent to the processes of a num_processes search, functions must be "
+                    f"defined at the top level of a module, see the README - {exc}"
+                ) from exc
+
+        num = self.num_processes
+        until = int(kwargs.get("until", time.time()))
+        since = int(kwargs.get("since", until - options["search_window"] * 86400))
+        limit = kwargs.get("limit", None)
+        config = self._shard_config()
+
+        # newest shard first, matching the order results are returned in
+        ts = timeslice(since, until, num)
+        shards = [dict(kwargs, since=s, until=u) for s, u in list(zip(ts[:-1], ts[1:]))[::-1]]
+        if limit is not None:
+            shards = self._shard_limits(kind, kwargs, options, shards, limit)
+        # shards cache their results, rather than sending them back to this process
+        options = dict(options, mem_safe=not options["safe_exit"])
+        log.info(f"Searching {len(shards)} shards between {since} and {until}")
+
+        with ProcessPoolExecutor(max_workers=num) as executor:
+            futures = [
+                executor.submit(
+                    _search_shard,
+                    type(self),
+                    config,
+                    self._base_url,
+                    kind,
+                    shard,
+                    options,
+                )
+                for shard in shards
+            ]
+            manifests = [future.result() for future in futures]
+
+        key = hashlib.md5(
+            "".join(manifest["key"] for manifest in manifests).encode("utf-8")
+        ).hexdigest()
+        cache = Cache(
+            {},
+            False,
+            cache_dir=options["cache_dir"],
+            key=key,
+            cache_format=options["cache_format"],
+        )
+        for manifest in manifests:
+            cache.add_chunks(manifest["chunks"], manifest["size"])
+        cache.close()
+
+        log.info(f"Merged {len(manifests)} shards:: Items: {cache.size}")
+        return Response(cache)
+
+    def _shard_limits(self, kind, kwargs, options, shards, limit):
+        """
+        Splits the limit between the shards newest first, using a count of the results in each shard,
+        so that only the shards holding the newest limit results are searched.
+        Returns the parameters of each shard with results to retrieve
+        """
+        # only the query is needed to count results, nothing is cached
+        url = self._init_search(
+            kind,
+            500,
+            options["max_results_per_request"],
+            False,
+            options["dataset"],
+            False,
+            None,
+            None,
+            dict(kwargs),
+        )
+        try:
+            ranges = [(shard["since"], shard["until"]) for shard in shards]
+            counts = self._count_results(url, self.req.payload, ranges)
+        finally:
+            self._sessions.close()
+
+        limited = []
+        remaining = limit
+        for i, (shard, count) in enumerate(zip(shards, counts)):
+            if remaining <= 0:
+                break
+            if count is None:
+                # without a count, this and older shards may each hold every remaining result
+                log.warning(
+                    f"Unable to count the results between {shard['since']} and {shard['until']}, "
+                    "results older than the limit may be returned"
+                )
+                limited.extend(dict(older, limit=remaining) for older in shards[i:])
+                break
+            if count > 0:
+                # empty shards arent searched
+                limited.append(dict(shard, limit=min(count, remaining)))
+                remaining -= count
+        return limited
+
+    def _stream_search(self, url, search_window, work_queue=None):
+        try:
+            self._run_search(url, search_window, work_queue)
+        except BaseException as exc:
+            self.req.resp.finish(exc)
+        else:
+            self.req.resp.finish()
+
+    def _run_search(self, url, search_window, work_queue=None):
+        try:
+            if work_queue is not None:
+                self._run_queue(url, search_window, work_queue)
+
+            while work_queue is None and self._searching():
+                if self._needs_total():
+                    # check to see how many results are remaining
+                    self.req.req_list.appendleft((url, self.req.payload))
+                    self._multithread(check_total=True)
+                    if not self._update_limit():
+                        continue
+
+                self._gen_requests(url, search_window)
+
+                if self.req.limit > 0 and len(self.req.req_list) > 0:
+                    self._multithread()
+
+            self.req.save_cache()
+        finally:
+            # make sure cached responses are on disk, even if the search failed
+            self.req.close()
+            self._save_index()
+            # sessions are kept open between batches and count requests, release them once the search is done
+            self._sessions.close()
+        return self.req.sink if self.req.sink is not None else self.req.resp
+
+    def _run_queue(self, url, search_window, queue):
+        """Retrieves requests leased from the work queue, until every node has finished the search"""
+        if not queue.seeded:
+            # nodes which start before the queue is seeded all plan the search, the first plan is used
+            self._gen_requests(url, search_window)
+            queue.seed(list(self.req.req_list))
+            self.req.req_list.clear()
+        else:
+            self.req.check_sigs()
+
+        # new time slices and retries are added to the queue from here on, and as
+        # the queue decides when the search is done, nodes dont have a limit
+        self.req.work_queue = queue
+        self.req.limit = math.inf
+
+        try:
+            while not self.req.exit.is_set():
+                self.req.lease(self.batch_size)
+                if self.req.req_list:
+                    self._multithread()
+                elif queue.finished:
+                    break
+                else:
+                    # other nodes hold the remaining leases, they can add new requests
+                    # or fail to complete them
+                    time.sleep(queue.poll_interval)
+        finally:
+            # return leased requests which werent sent so another node can retrieve them
+            self.req.release()
+
+    def _save_index(self):
+        if self._density_index is not None:
+            self._density_index.save()
+
+    def _init_search(
+        self,
+        kind,
+        max_ids_per_request,
+        max_results_per_request,
+        mem_safe,
+        dataset,
+        safe_exit,
+        cache_dir,
+        filter_fn,
+        kwargs,
+        stream=False,
+        stream_buffer=10,
+        cache_format="pickle.gz",
+        dedup=False,
+        filters=None,
+        sink=None,
+    ):
+        """Validates the search parameters and prepares a new `Request`, returns the endpoint url."""
 
         # TODO: remove this warning once 404s stop happening
         if kind == "submission_comment_ids":
@@ -253,8 +971,18 @@ class PushshiftAPIBase:
             err_msg = "Aggregations support for {} has not yet been implemented, please use the PSAW package for your request"
             raise NotImplementedError(err_msg.format(kwargs["aggs"]))
 
+        # enriched items are filtered on data from Reddit, so only optimize Pushshift only searches
+        optimize = kwargs.pop("optimize", True)
+        if optimize and self.praw is None and kind != "submission_comment_ids":
+            optimize_query(kwargs, filters, filter_fn, dedup)
+
         self.meta = Metadata({})
-        self.resp_dict = {}
+        self._shards_down = False
+        self._slice_target = 0
+        self._probe = None
+        self._density_index = None
+        if self.index_dir is not None and "ids" not in kwargs:
+            self._density_index = DensityIndex(kwargs, kind, self.index_dir)
         self.req = Request(
             copy.deepcopy(kwargs),
             filter_fn,
@@ -265,6 +993,15 @@ class PushshiftAPIBase:
             safe_exit,
             cache_dir,
             self.praw,
+            stream,
+            stream_buffer,
+            cache_format,
+            dedup,
+            self.enrich_workers,
+            self.enrich_rate_limit,
+            self.praw_fields,
+            filters,
+            sink,
         )
 
         # reset stat tracking
@@ -275,36 +1012,62 @@ class PushshiftAPIBase:
         else:
             endpoint = f"{dataset}/{kind}/search"
 
-        url = self.base_url.format(endpoint=endpoint)
+        return self.base_url.format(endpoint=endpoint)
 
-        while (
+    def _searching(self):
+        return (
             self.req.limit is None or self.req.limit > 0
-        ) and not self.req.exit.is_set():
-            # set/update limit
-            if "ids" not in self.req.payload and len(self.req.req_list) == 0:
-                # check to see how many results are remaining
-                self.req.req_list.appendleft((url, self.req.payload))
-                self._multithread(check_total=True)
-                total_avail = self.meta.total_results
-
-                if self.req.limit is None:
-                    log.info(f"{total_avail} result(s) available in Pushshift")
-                    self.req.limit = total_avail
-                elif total_avail < self.req.limit:
-                    log.info(
-                        f"{self.req.limit - total_avail} result(s) not found in Pushshift"
-                    )
-                    log.info(f"{total_avail} total available")
-                    self.req.limit = total_avail
+        ) and not self.req.exit.is_set()
 
-            # generate payloads
-            self.req.gen_url_payloads(url, self.batch_size, search_window)
+    def _needs_total(self):
+        return "ids" not in self.req.payload and len(self.req.req_list) == 0
 
-            # check for exit signals
-            self.req.check_sigs()
+    def _update_limit(self):
+        """Sets the limit from the count request, returns False if the count request failed"""
+        probe, self._probe = self._probe, None
+        if probe is None:
+            # the count request was requeued, remove it so it is retried as a count request
+            self.req.req_list.popleft()
+            return False
+
+        total_avail = probe.total_results
+        data = probe.data
+
+        if self.req.limit is None:
+            log.info(f"{total_avail} result(s) available in Pushshift")
+            self.req.limit = total_avail
+        elif total_avail < self.req.limit:
+            log.info(f"{self.req.limit - total_avail} result(s) not found in Pushshift")
+            log.info(f"{total_avail} total available")
+            self.req.limit = total_avail
+
+        if data is not None and 0 < total_avail <= len(data) and self.req.limit > 0:
+            # the count request already returned every result, there is nothing left to slice
+            log.debug(f"Count request returned all {total_avail} result(s)")
+            self.req.save_resp(data)
+            self.req.limit = 0
+        return True
+
+    def _slice_planner(self):
+        # slices are planned from counts when using the density planner or index, otherwise they are uniform
+        if self.slice_planner == "density" or self._density_index is not None:
+            return self._plan_slices
+        return None
+
+    def _gen_requests(self, url, search_window):
+        # generate payloads
+        self.req.gen_url_payloads(
+            url, self.batch_size, search_window, self._slice_planner()
+        )
+
+        # check for exit signals
+        self.req.check_sigs()
 
-            if self.req.limit > 0 and len(self.req.req_list) > 0:
-                self._multithread()
 
-        self.req.save_cache()
-        return self.req.resp
+def _search_shard(api_class, config, base_url, kind, kwargs, options):
+    # runs in a separate process, returns the chunks its results were cached in
+    api = api_class(**config)
+    api._base_url = base_url
+    api._search(kind, **options, **kwargs)
+    cache = api.req._cache
+    return {"key": cache.key, "chunks": list(cache.response_cache), "size": cache.size}
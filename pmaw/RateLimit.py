@@ -1,6 +1,9 @@
 import logging
+import math
 import time
 import random
+import threading
+from collections import deque
 
 log = logging.getLogger(__name__)
 
@@ -15,45 +18,140 @@ class RateLimit:
         limit_type="average",
         max_sleep=60,
         jitter=None,
+        burst=5,
+        min_rate=1,
+        max_rate=None,
+        additive_increase=6,
+        multiplicative_decrease=0.5,
     ):
+        """
+        Input:
+            rate_limit (int, optional) - Target number of requests per minute, defaults to 60
+            base_backoff (float, optional) - Base delay in seconds for exponential backoff, defaults to 0.5s
+            limit_type (str, optional) - One of 'average', 'backoff', 'token_bucket', 'sliding_window', 'adaptive', or None to disable, defaults to 'average'
+            max_sleep (int, optional) - Maximum sleep time in seconds for 'average' and 'backoff', defaults to 60s
+            jitter (str, optional) - Jitter to use with backoff, defaults to None, options are None, full, equal, decorr
+            burst (int, optional) - Number of requests 'token_bucket' and 'adaptive' allow without delay after being idle, defaults to 5
+            min_rate (float, optional) - Lowest rate in requests per minute 'adaptive' will back off to, defaults to 1
+            max_rate (float, optional) - Highest rate in requests per minute 'adaptive' will increase to, defaults to None for no maximum
+            additive_increase (float, optional) - Requests per minute 'adaptive' adds for each minute of fast successful requests, defaults to 6
+            multiplicative_decrease (float, optional) - Factor 'adaptive' multiplies the rate by when Pushshift is overloaded, defaults to 0.5
+        """
+        if limit_type and limit_type not in (
+            "average",
+            "backoff",
+            "token_bucket",
+            "sliding_window",
+            "adaptive",
+        ):
+            raise ValueError(f"Unknown limit_type {limit_type}")
+
         self.rate_limit = rate_limit
-        self.cache = list()
+        self.cache = deque()
         self.base = base_backoff
         self.limit_type = limit_type
         self.max_sleep = max_sleep
         self.jitter = jitter
         self.sleep = self.base
+        self.burst = burst
+
+        # the limiter can be shared by multiple PushshiftAPI instances and their workers
+        self._lock = threading.Lock()
+
+        # token bucket state
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+        # adaptive state, rate is the currently discovered sustainable rate
+        self.rate = rate_limit
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.latency = None
+        self.min_latency = None
+        self.last_decrease = 0
+
+        # time until which requests are paused by a Retry-After header
+        self.paused_until = 0
 
         # track failures and attempts
         self.last_batch = 0
         self.attempts = 0
         self.num_fail = 0
 
+    @property
+    def current_rate(self):
+        """Current target rate in requests per minute, for 'adaptive' this is the discovered sustainable rate"""
+        if self.limit_type == "adaptive":
+            return self.rate
+        return self.rate_limit
+
     def delay(self):
+        """Returns the number of seconds to wait before sending the next request"""
         if self.limit_type:
-            if self.limit_type == "average":
-                return min(self.max_sleep, self._average())
-            elif self.limit_type == "backoff":
-                return self._backoff()
+            with self._lock:
+                # honour the server's Retry-After before any other limit
+                paused = max(0, self.paused_until - time.monotonic())
+                if self.limit_type == "average":
+                    return max(paused, min(self.max_sleep, self._average()))
+                elif self.limit_type == "backoff":
+                    return max(paused, self._backoff())
+                elif self.limit_type == "token_bucket":
+                    return paused + self._token_bucket()
+                elif self.limit_type == "sliding_window":
+                    return paused + self._sliding_window()
+                elif self.limit_type == "adaptive":
+                    return paused + self._token_bucket(self.rate)
         else:
             return 0
 
-    def _req_fail(self):
-        self.num_fail += 1
+    def _req_success(self, latency):
+        """Records a successful request which took latency seconds"""
+        with self._lock:
+            # smoothed latency, compared against the lowest seen to detect a slowing server
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency = 0.8 * self.latency + 0.2 * latency
+            if self.min_latency is None or self.latency < self.min_latency:
+                self.min_latency = self.latency
+
+            if self.limit_type == "adaptive" and self.latency <= 2 * self.min_latency:
+                # additive increase, spread across a minute worth of requests
+                self.rate += self.additive_increase / self.rate
+                if self.max_rate is not None:
+                    self.rate = min(self.max_rate, self.rate)
+
+    def _req_fail(self, overloaded=True, retry_after=None):
+        """Records a failed request, overloaded is True for 429s, 5xx, and timeouts"""
+        with self._lock:
+            self.num_fail += 1
+
+            now = time.monotonic()
+            if retry_after is not None:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+            # multiplicative decrease, at most once a second so that a burst of
+            # failures from concurrent requests only counts once
+            if self.limit_type == "adaptive" and overloaded and now - self.last_decrease > 1:
+                self.last_decrease = now
+                self.rate = max(self.min_rate, self.rate * self.multiplicative_decrease)
 
     def _check_fail(self):
-        # reset attempts if no new failures
-        if self.last_batch == self.num_fail:
-            self.num_fail = 0
-            self.last_batch = 0
-            self.attempts = 0
-            self.sleep = self.base
-        else:
-            # store last batch num failures
-            self.last_batch = self.num_fail
+        with self._lock:
+            # reset attempts if no new failures
+            if self.last_batch == self.num_fail:
+                self.num_fail = 0
+                self.last_batch = 0
+                self.attempts = 0
+                self.sleep = self.base
+            else:
+                # store last batch num failures
+                self.last_batch = self.num_fail
 
-            # increase number of attempted batches
-            self.attempts += 1
+                # increase number of attempted batches
+                self.attempts += 1
 
     def _expo(self):
         return min(self.max_sleep, self.base * pow(2, self.attempts))
@@ -79,20 +177,14 @@ class RateLimit:
         curr_time = time.time()
         self.cache.append(curr_time)
 
-        num_req = len(self.cache)
-        first_req = min(self.cache)
-        last_req = max(self.cache)
-
-        # remove requests older than 60 seconds old
-        while curr_time - first_req > 60:
-
-            try:
-                self.cache.remove(first_req)
-            except ValueError:
-                log.debug(f"{first_req} has already been removed RL cache")
+        # remove requests older than 60 seconds old, requests are appended
+        # in order so the oldest request is always first
+        while curr_time - self.cache[0] > 60:
+            self.cache.popleft()
 
-            num_req = len(self.cache)
-            first_req = min(self.cache)
+        num_req = len(self.cache)
+        first_req = self.cache[0]
+        last_req = self.cache[-1]
 
         # return 0 if no other requests on cache
         if last_req == first_req:
@@ -108,3 +200,31 @@ class RateLimit:
                 return 0
             else:
                 return 60 * (num_req) / self.rate_limit - period
+
+    def _token_bucket(self, rate_limit=None):
+        # refill tokens for the time elapsed, up to the burst size
+        now = time.monotonic()
+        rate = (rate_limit or self.rate_limit) / 60
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+        # take a token, a negative balance reserves a future token for this request
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0
+        return -self.tokens / rate
+
+    def _sliding_window(self):
+        # log of request start times, including start times reserved in the future
+        now = time.monotonic()
+        while self.cache and now - self.cache[0] >= 60:
+            self.cache.popleft()
+
+        # start once the rate_limit-th most recent request leaves the window,
+        # a fractional rate_limit allows the next whole request
+        limit = max(1, int(math.ceil(self.rate_limit)))
+        start = now
+        if len(self.cache) >= limit:
+            start = max(now, self.cache[-limit] + 60)
+        self.cache.append(start)
+        return start - now
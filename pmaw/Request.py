@@ -3,16 +3,16 @@ import copy
 import datetime as dt
 from collections import deque
 import warnings
-from threading import Event
+from threading import Event, Lock, current_thread, main_thread
 import signal
-import time
-
-from praw.exceptions import RedditAPIException
 
 from pmaw.Cache import Cache
+from pmaw.Enricher import Enricher
 from pmaw.utils.slices import timeslice, mapslice
-from pmaw.utils.filter import apply_filter
+from pmaw.utils.filter import apply_filter, compile_filters
+from pmaw.utils.dedup import get_dedup
 from pmaw.Response import Response
+from pmaw.StreamResponse import StreamResponse
 
 
 log = logging.getLogger(__name__)
@@ -32,6 +32,15 @@ class Request:
         safe_exit,
         cache_dir=None,
         praw=None,
+        stream=False,
+        stream_buffer=10,
+        cache_format="pickle.gz",
+        dedup=None,
+        enrich_workers=1,
+        enrich_rate_limit=100,
+        praw_fields=None,
+        filters=None,
+        sink=None,
     ):
         self.kind = kind
         self.max_ids_per_request = min(500, max_ids_per_request)
@@ -44,10 +53,29 @@ class Request:
         self.exit = Event()
         self.praw = praw
         self._filter = filter_fn
+        self._filters = compile_filters(filters) if filters is not None else None
+        self._dedup = get_dedup(dedup, self.limit)
+        # enriched items are saved from the enrichment threads
+        self._resp_lock = Lock()
+        self._enricher = None
+        # shared queue of a distributed search, set once the queue has been seeded
+        self.work_queue = None
+
+        # requests created and completed since the last journal checkpoint
+        self._added = []
+        self._completed = []
 
         if filter_fn is not None and not callable(filter_fn):
             raise ValueError("filter_fn must be a callable function")
 
+        if stream and (mem_safe or safe_exit):
+            raise ValueError("stream cannot be used with mem_safe or safe_exit")
+
+        # results are written to the sink instead of being kept in the response
+        self.sink = sink
+        if sink is not None and (stream or mem_safe or safe_exit):
+            raise ValueError("sink cannot be used with stream, mem_safe or safe_exit")
+
         if safe_exit and self.payload.get("until", None) is None:
             # warn the user not to use safe_exit without setting until,
             # doing otherwise will make it impossible to resume without modifying
@@ -64,7 +92,13 @@ class Request:
                     "safe_exit is not implemented when PRAW is used for metadata enrichment"
                 )
 
-            self.enrich_list = deque()
+            self._enricher = Enricher(
+                praw,
+                self._save_enriched,
+                enrich_workers,
+                enrich_rate_limit,
+                fields=praw_fields,
+            )
 
             if not kind == "submission_comment_ids":
                 # id filter causes an error for submission_comment_ids endpoint
@@ -83,13 +117,18 @@ class Request:
             # instantiate cache
             _tmp = copy.deepcopy(payload)
             _tmp["kind"] = kind
-            self._cache = Cache(_tmp, safe_exit, cache_dir=cache_dir)
+            self._cache = Cache(
+                _tmp, safe_exit, cache_dir=cache_dir, cache_format=cache_format
+            )
             if safe_exit:
                 info = self._cache.load_info()
                 if info is not None:
                     self.req_list.extend(info["req_list"])
                     self.payload = info["payload"]
                     self.limit = info["limit"]
+                    if self._dedup is not None:
+                        # ids seen before the last checkpoint
+                        self._dedup = self._cache.load_dedup() or self._dedup
                     log.info(
                         f"Loaded Cache:: Responses: {self._cache.size} - Pending Requests: {len(self.req_list)} - Items Remaining: {self.limit}"
                     )
@@ -97,9 +136,17 @@ class Request:
             self._cache = None
 
         # instantiate response
-        self.resp = Response(self._cache)
+        if stream:
+            self.resp = StreamResponse(self.exit, stream_buffer)
+        else:
+            self.resp = Response(self._cache)
 
     def check_sigs(self):
+        # signal handlers can only be set from the main thread, streamed searches
+        # are stopped by closing the response instead
+        if current_thread() is not main_thread():
+            return
+
         try:
             getattr(signal, "SIGHUP")
             sigs = ("TERM", "HUP", "INT")
@@ -109,97 +156,129 @@ class Request:
         for sig in sigs:
             signal.signal(getattr(signal, "SIG" + sig), self._exit)
 
-    def _enrich_data(self):
-        # create batch of fullnames up to 100
-        fullnames = []
-        while len(fullnames) < 100:
-            try:
-                fullnames.append(self.enrich_list.popleft())
-            except IndexError:
-                break
-
-        # exit loop if nothing to enrich
-        if len(fullnames) == 0:
-            return
-
-        try:
-            # TODO: may need to change praw usage based on multithread performance
-            resp_gen = self.praw.info(fullnames=fullnames)
-            praw_data = [vars(obj) for obj in resp_gen]
-            results = self._apply_filter(praw_data)
-            self.resp.responses.extend(results)
-
-        except RedditAPIException:
-            self.enrich_list.extend(fullnames)
-
-    def _idle_task(self, interval):
-        start = time.time()
-        current = time.time()
-
-        if self.praw:
-            # make multiple enrich requests based on sleep interval
-            while current - start < interval and len(self.enrich_list) > 0:
-
-                self._enrich_data()
+    def _save_enriched(self, praw_data):
+        results = self._apply_filter(praw_data)
+        with self._resp_lock:
+            self._save(results)
 
-                current = time.time()
+    def save_cache(self, drain=True):
+        """
+        Saves responses to the cache when needed
 
-        current = time.time()
-        diff = current - start
+        Input:
+            drain (bool, optional) - Wait for pending PRAW enrichment to finish, defaults to True.
+                Checkpoints during a search dont wait, so enrichment continues alongside Pushshift requests
+        """
+        if self._enricher is not None and drain:
+            self._enricher.join()
 
-        if diff < interval and diff >= 0:
-            time.sleep(interval - diff)
+        with self._resp_lock:
+            self._save_cache()
 
-    def save_cache(self):
+    def _save_cache(self):
         # trim extra responses
         self.trim()
 
-        # enrich if needed
-        if self.praw:
-            while len(self.enrich_list) > 0:
-                self._enrich_data()
-
-        if (
-            self.safe_exit
-            and not self.limit == None
-            and (self.limit == 0 or self.exit.is_set())
-        ):
-            # save request info to cache
-            self._cache.save_info(
-                req_list=self.req_list, payload=self.payload, limit=self.limit
-            )
-            # save responses to cache
+        if self.safe_exit and self.limit is not None:
+            # save responses to cache, then record the progress of the search
             self.resp.to_cache()
+            self._cache.checkpoint(
+                self._added, self._completed, payload=self.payload, limit=self.limit
+            )
+            if self._dedup is not None:
+                # saved after the checkpoint, a crash in between can only cause duplicates
+                self._cache.save_dedup(self._dedup)
+            self._added = []
+            self._completed = []
         elif self.mem_safe:
             self.resp.to_cache()
 
+    def close(self):
+        """Stops enrichment and waits for cached responses and the sink to finish being written to disk"""
+        if self._enricher is not None:
+            self._enricher.close()
+        if self._cache is not None:
+            self._cache.close()
+        if self.sink is not None:
+            self.sink.close()
+
     def _exit(self, signo, _frame):
         self.exit.set()
 
     def _apply_filter(self, results):
-        # apply user defined filter function before storing
+        # apply the compiled filters to the batch, then the user defined filter function, before storing
+        if self._filters is not None:
+            results = self._filters(results)
         if self._filter is not None:
             return apply_filter(results, self._filter)
         else:
             return results
 
+    def slice_done(self, url_pay, num_results):
+        """Marks a request as completed so that it isnt repeated when resuming"""
+        if self.work_queue is not None:
+            self.work_queue.complete(url_pay, num_results)
+        elif self.safe_exit:
+            self._completed.append((url_pay, num_results))
+
+    def retry(self, url_pay):
+        """Requeues a failed request so that it is retried before any other pending request"""
+        if self.work_queue is not None:
+            self.work_queue.requeue([url_pay])
+        else:
+            self.req_list.appendleft(url_pay)
+
+    def lease(self, num):
+        """Leases up to num requests from the work queue when there are no pending requests left on this node"""
+        if self.work_queue is not None and not self.req_list and not self.exit.is_set():
+            self.req_list.extend(self.work_queue.lease(num))
+
+    def release(self):
+        """Returns leased requests which werent sent to the work queue, so other nodes can retrieve them"""
+        if self.work_queue is not None:
+            self.work_queue.requeue(list(self.req_list))
+            self.req_list.clear()
+
+    def _add_requests(self, url_payloads):
+        if self.work_queue is not None:
+            self.work_queue.put(url_payloads)
+            return
+        self.req_list.extend(url_payloads)
+        if self.safe_exit:
+            self._added.extend(url_payloads)
+
     def save_resp(self, results):
+        if self._dedup is not None:
+            # duplicates from overlapping slices and retries dont count towards the limit
+            results = self._dedup.remove_duplicates(results)
+
         # dont filter results before updating limit: limit is the max number of results
         # extracted from Pushshift, filtering can reduce the results < limit
         if self.kind == "submission_comment_ids":
             self.limit -= 1
         else:
+            # results past the limit would be trimmed, drop them before they are
+            # enriched or handed to a streaming consumer
+            if len(results) > self.limit:
+                results = results[: max(self.limit, 0)]
             self.limit -= len(results)
 
-        if self.praw:
-            # save fullnames of objects to be enriched with metadata by PRAW
+        if self._enricher is not None:
+            # queue fullnames of objects to be enriched with metadata by PRAW
             if self.kind == "submission_comment_ids":
-                self.enrich_list.extend([self.prefix + res for res in results])
+                self._enricher.put([self.prefix + res for res in results])
             else:
-                self.enrich_list.extend([self.prefix + res["id"] for res in results])
+                self._enricher.put([self.prefix + res["id"] for res in results])
         else:
             results = self._apply_filter(results)
-            self.resp.responses.extend(results)
+            with self._resp_lock:
+                self._save(results)
+
+    def _save(self, results):
+        if self.sink is not None:
+            self.sink.write(results)
+        else:
+            self.resp.extend(results)
 
     def _add_nec_args(self, payload):
         """Adds arguments to the payload as necessary."""
@@ -240,14 +319,27 @@ class Request:
     def gen_slices(self, url, payload, after, before, num):
         # create time slices
         ts = timeslice(after, before, num)
+        self.add_slices(url, payload, zip(ts[:-1], ts[1:]))
+
+    def add_slices(self, url, payload, slices):
+        """Adds a request for each (since, until) slice"""
         url_payloads = [
-            (url, mapslice(copy.deepcopy(payload), ts[i], ts[i + 1]))
-            for i in range(num)
+            (url, mapslice(copy.deepcopy(payload), since, until))
+            for since, until in slices
         ]
-        self.req_list.extend(url_payloads)
-
-    def gen_url_payloads(self, url, batch_size, search_window):
-        """Creates a list of url payload tuples"""
+        self._add_requests(url_payloads)
+
+    def gen_url_payloads(self, url, batch_size, search_window, planner=None):
+        """
+        Creates a list of url payload tuples
+
+        Input:
+            url (str) - Endpoint url
+            batch_size (int) - Number of slices to split the search window into
+            search_window (int) - Size in days of the search window when since isnt set
+            planner (function, optional) - Called with (url, payload, since, until) to plan (since, until) slices
+                instead of splitting the window into batch_size equal slices
+        """
         url_payloads = []
 
         # check if new payloads have to be made
@@ -286,7 +378,7 @@ class Request:
                         (url + "?ids=" + id_str, self.payload) for id_str in ids_split
                     ]
                 # add payloads to req_list
-                self.req_list.extend(url_payloads)
+                self._add_requests(url_payloads)
 
             else:
                 if "since" not in self.payload:
@@ -309,7 +401,11 @@ class Request:
                     num = batch_size
 
                 # generate payloads
-                self.gen_slices(url, self.payload, after, before, num)
+                if planner is not None:
+                    slices = planner(url, self.payload, after, before)
+                    self.add_slices(url, self.payload, slices)
+                else:
+                    self.gen_slices(url, self.payload, after, before, num)
 
     def _id_list(self, payload):
         if not isinstance(payload["ids"], list):
@@ -320,13 +416,6 @@ class Request:
 
     def trim(self):
         if self.limit:
-            if self.praw:
-                while self.limit < 0:
-                    try:
-                        self.enrich_list.pop()
-                        self.limit += 1
-                    except IndexError as exc:
-                        break
             if self.limit < 0:
                 log.debug(f"Trimming {self.limit*-1} requests")
                 self.resp.responses = self.resp.responses[: self.limit]
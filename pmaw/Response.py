@@ -2,6 +2,7 @@ import logging
 from collections.abc import Generator
 
 from pmaw.Cache import Cache
+from pmaw.CacheReader import CacheReader
 
 log = logging.getLogger(__name__)
 
@@ -32,9 +33,26 @@ class Response(Generator):
         cache = Cache.load_with_key(key, cache_dir)
         return Response(cache)
 
+    def reader(self, **kwargs):
+        """
+        Returns a CacheReader with random access to the cached responses, which unlike the generator can be read repeatedly
+
+        Input:
+            kwargs - `CacheReader` arguments
+        Output:
+            CacheReader
+        """
+        if self._cache is None:
+            raise ValueError("reader requires responses to be cached with mem_safe or safe_exit")
+        return CacheReader(self._cache, **kwargs)
+
+    def extend(self, results):
+        self.responses.extend(results)
+
     def to_cache(self):
+        # hand the list off to the cache writer rather than clearing it
         self._cache.cache_responses(self.responses)
-        self.responses.clear()
+        self.responses = []
 
     def _next_resp(self):
         resp = self.responses[self.i]
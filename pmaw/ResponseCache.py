@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from pmaw.utils.params import encode_params
+
+log = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """ResponseCache: SQLite cache of Pushshift response bodies, so repeated requests are served locally"""
+
+    def __init__(self, path="./cache/responses.sqlite", ttl=86400, max_size=1024**3):
+        """
+        Input:
+            path (str, optional) - SQLite database file, defaults to ./cache/responses.sqlite
+            ttl (float, optional) - Seconds a response is served from the cache for, defaults to 1 day. None to never expire
+            max_size (int, optional) - Maximum size in bytes of the cached responses, least recently used responses are evicted beyond this. Defaults to 1GB
+        """
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        Path(self.path).parent.mkdir(exist_ok=True, parents=True)
+        self._lock = threading.Lock()
+        # shared between worker threads, access is serialized by the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB, size INTEGER, created REAL, accessed REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        self._conn.commit()
+        self.size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def key(url, payload):
+        """Returns the cache key for a request, parameters are sorted so their order doesnt matter"""
+        params = sorted(encode_params(payload))
+        key_str = json.dumps([url, params]).encode("utf-8")
+        return hashlib.sha1(key_str).hexdigest()
+
+    def get(self, url, payload):
+        """Returns the cached response body for a request as bytes, None if it isnt cached or has expired"""
+        key = self.key(url, payload)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, size, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[2] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.size -= row[1]
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return zlib.decompress(row[0])
+
+    def set(self, url, payload, body):
+        """Caches the response body for a request, as bytes or str"""
+        key = self.key(url, payload)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        body = zlib.compress(body, 1)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, body, len(body), now, now),
+            )
+            self.size += len(body) - (old[0] if old else 0)
+            if self.max_size is not None and self.size > self.max_size:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # remove least recently used responses until the cache is 90% full
+        target = self.max_size * 0.9
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        )
+        evict = []
+        for key, size in rows:
+            if self.size <= target:
+                break
+            evict.append((key,))
+            self.size -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+        log.debug(f"Evicted {len(evict)} cached responses")
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": self.size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,34 @@
+from pmaw.Metadata import Metadata
+
+
+class Result:
+    """Result: Outcome of a single successful request, returned by the worker which made it"""
+
+    __slots__ = ("data", "metadata", "status", "latency", "cached")
+
+    def __init__(self, data, metadata, status=200, latency=0.0, cached=False):
+        """
+        Input:
+            data (list) - Items returned by Pushshift
+            metadata (Metadata) - Metadata of the response
+            status (int, optional) - HTTP status of the response, defaults to 200
+            latency (float, optional) - Seconds from sending the request to receiving the response, defaults to 0
+            cached (bool, optional) - True if the response was served from the response cache, defaults to False
+        """
+        self.data = data
+        self.metadata = metadata
+        self.status = status
+        self.latency = latency
+        self.cached = cached
+
+    @classmethod
+    def from_body(cls, body, status=200, latency=0.0, cached=False):
+        """Returns a Result for a decoded response body"""
+        return cls(
+            body["data"], Metadata(body.get("metadata", {})), status, latency, cached
+        )
+
+    @property
+    def total_results(self):
+        """Total number of results for the request's query and time slice"""
+        return self.metadata.total_results
@@ -0,0 +1,87 @@
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """
+    SessionPool: Provides each worker thread with its own keep-alive session and tracks connection reuse,
+    sessions of threads which have exited are handed to new threads so their connections stay open
+    """
+
+    def __init__(self, pool_size=10, connect_timeout=10, read_timeout=60):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # [owner thread, session] for each open session
+        self._sessions = []
+
+        # stats for sessions which have already been closed
+        self._closed = {"sessions": 0, "connections": 0, "requests": 0}
+
+    def get(self, url, params=None):
+        return self.session().get(url, params=params, timeout=self.timeout)
+
+    def session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            with self._lock:
+                # workers of an earlier batch or count pass have exited, reuse their sessions
+                for owned in self._sessions:
+                    if not owned[0].is_alive():
+                        owned[0] = threading.current_thread()
+                        session = owned[1]
+                        break
+                else:
+                    session = self._new_session()
+                    self._sessions.append([threading.current_thread(), session])
+            self._local.session = session
+        return session
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        return session
+
+    def close(self):
+        """Closes all sessions, sessions are re-created on the next request"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            for _, session in sessions:
+                stats = self._session_stats(session)
+                for key in self._closed:
+                    self._closed[key] += stats[key]
+                session.close()
+        self._local = threading.local()
+
+    @property
+    def stats(self):
+        """Number of sessions, connections opened and requests sent, connections are reused when requests > connections"""
+        with self._lock:
+            stats = dict(self._closed)
+            for _, session in self._sessions:
+                for key, value in self._session_stats(session).items():
+                    stats[key] += value
+        stats["reused"] = stats["requests"] - stats["connections"]
+        return stats
+
+    @staticmethod
+    def _session_stats(session):
+        stats = {"sessions": 1, "connections": 0, "requests": 0}
+        adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    stats["connections"] += pool.num_connections
+                    stats["requests"] += pool.num_requests
+        return stats
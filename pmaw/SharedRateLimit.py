@@ -0,0 +1,70 @@
+import logging
+import time
+
+from pmaw.RateLimit import RateLimit
+from pmaw.utils.sqlite import connect, transaction
+
+log = logging.getLogger(__name__)
+
+
+class SharedRateLimit(RateLimit):
+    """SharedRateLimit: Token bucket stored in a SQLite file, so that several processes and nodes share one rate budget"""
+
+    def __init__(self, path="./cache/queue.sqlite", rate_limit=60, burst=5, **kwargs):
+        """
+        Input:
+            path (str, optional) - SQLite database file shared by every node, defaults to ./cache/queue.sqlite
+            rate_limit (int, optional) - Target number of requests per minute across every node, defaults to 60
+            burst (int, optional) - Number of requests allowed without delay after being idle, defaults to 5
+            kwargs - Other `RateLimit` arguments, such as base_backoff and max_sleep
+        """
+        super().__init__(rate_limit, limit_type="token_bucket", burst=burst, **kwargs)
+        self.path = str(path)
+        self._conn = connect(self.path)
+        with transaction(self._conn, self._lock) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_budget ("
+                "id INTEGER PRIMARY KEY, tokens REAL, updated REAL, paused_until REAL)"
+            )
+            # wall clock time is used as it is comparable between processes
+            conn.execute(
+                "INSERT OR IGNORE INTO rate_budget VALUES (0, ?, ?, 0)",
+                (burst, time.time()),
+            )
+
+    def delay(self):
+        """Returns the number of seconds to wait before sending the next request, taking a token from the shared bucket"""
+        rate = self.rate_limit / 60
+        with transaction(self._conn, self._lock) as conn:
+            now = time.time()
+            tokens, updated, paused_until = conn.execute(
+                "SELECT tokens, updated, paused_until FROM rate_budget WHERE id = 0"
+            ).fetchone()
+
+            # refill tokens for the time elapsed, clocks of other nodes may be slightly ahead
+            tokens = min(self.burst, tokens + max(0, now - updated) * rate) - 1
+            updated = max(updated, now)
+            conn.execute(
+                "UPDATE rate_budget SET tokens = ?, updated = ? WHERE id = 0",
+                (tokens, updated),
+            )
+
+        # a negative balance reserves a future token for this request
+        paused = max(0, paused_until - now)
+        if tokens >= 0:
+            return paused
+        return paused + -tokens / rate
+
+    def _req_fail(self, overloaded=True, retry_after=None):
+        """Records a failed request, a Retry-After header pauses every node"""
+        super()._req_fail(overloaded, retry_after)
+        if retry_after is not None:
+            with transaction(self._conn, self._lock) as conn:
+                conn.execute(
+                    "UPDATE rate_budget SET paused_until = MAX(paused_until, ?) WHERE id = 0",
+                    (time.time() + retry_after,),
+                )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,280 @@
+import abc
+import csv
+import gzip
+import json
+import logging
+import sqlite3
+from pathlib import Path
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:
+    pyarrow = None
+
+log = logging.getLogger(__name__)
+
+
+def _to_json(value):
+    # enriched items can contain PRAW objects, which are written as their str
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _to_scalar(value):
+    # nested values are written as JSON in columnar and tabular sinks
+    if isinstance(value, (dict, list, tuple)):
+        return _to_json(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class Sink(abc.ABC):
+    """Sink: Writes results to a file as they are retrieved, holding at most batch_size results in memory"""
+
+    def __init__(self, path, batch_size=1000):
+        """
+        Input:
+            path (str) - File to write the results to, its folder is created if it doesnt exist
+            batch_size (int, optional) - Number of results buffered before they are written, defaults to 1000
+        """
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.num_written = 0
+        self.closed = False
+        self._buffer = []
+        Path(self.path).parent.mkdir(exist_ok=True, parents=True)
+
+    def write(self, results):
+        """Buffers results, writing a batch once batch_size results are buffered"""
+        if self.closed:
+            raise ValueError(f"Cannot write to closed sink {self.path}")
+        self._buffer.extend(results)
+        while len(self._buffer) >= self.batch_size:
+            batch = self._buffer[: self.batch_size]
+            self._buffer = self._buffer[self.batch_size :]
+            self._write(batch)
+            self.num_written += len(batch)
+
+    def flush(self):
+        """Writes the buffered results"""
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._write(batch)
+            self.num_written += len(batch)
+
+    def close(self):
+        """Writes the buffered results and closes the file, the file is complete once closed"""
+        if not self.closed:
+            try:
+                self.flush()
+            finally:
+                self.closed = True
+                self._close()
+
+    def __len__(self):
+        return self.num_written + len(self._buffer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @abc.abstractmethod
+    def _write(self, batch):
+        """Writes a batch of results to the file"""
+
+    def _close(self):
+        pass
+
+
+class NDJSONSink(Sink):
+    """NDJSONSink: Newline delimited JSON, one result per line, gzip compressed when the path ends with .gz"""
+
+    def __init__(self, path, batch_size=1000):
+        super().__init__(path, batch_size)
+        if self.path.endswith(".gz"):
+            self._handle = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=1)
+        else:
+            self._handle = open(self.path, "w", encoding="utf-8")
+
+    def _write(self, batch):
+        self._handle.write("".join(_to_json(result) + "\n" for result in batch))
+
+    def _close(self):
+        self._handle.close()
+
+
+class CSVSink(Sink):
+    """CSVSink: CSV file with a column for each field, nested fields are written as JSON"""
+
+    def __init__(self, path, fields=None, batch_size=1000):
+        """
+        Input:
+            path (str) - File to write the results to
+            fields (list, optional) - Fields to write as columns, defaults to the fields of the first batch.
+                Fields which arent columns are dropped
+            batch_size (int, optional) - Number of results buffered before they are written, defaults to 1000
+        """
+        super().__init__(path, batch_size)
+        self.fields = list(fields) if fields is not None else None
+        self._handle = open(self.path, "w", encoding="utf-8", newline="")
+        self._writer = None
+
+    def _write(self, batch):
+        if self._writer is None:
+            if self.fields is None:
+                self.fields = list(_union_fields(batch))
+            self._writer = csv.DictWriter(
+                self._handle, self.fields, extrasaction="ignore"
+            )
+            self._writer.writeheader()
+        self._writer.writerows(
+            {field: _to_scalar(result.get(field)) for field in self.fields}
+            for result in batch
+        )
+
+    def _close(self):
+        if self._writer is None and self.fields is not None:
+            # no results, write just the header
+            csv.DictWriter(self._handle, self.fields).writeheader()
+        self._handle.close()
+
+
+class ParquetSink(Sink):
+    """ParquetSink: Parquet file written one row group per batch"""
+
+    def __init__(self, path, schema=None, batch_size=10000, compression="zstd"):
+        """
+        Input:
+            path (str) - File to write the results to
+            schema (pyarrow.Schema, optional) - Schema of the file, fields which arent in the schema are dropped.
+                Defaults to a schema inferred from the first batch, with nested and mixed type fields written as JSON strings
+            batch_size (int, optional) - Number of results in each row group, defaults to 10000
+            compression (str, optional) - Parquet compression codec, defaults to 'zstd'
+        """
+        if pyarrow is None:
+            raise ImportError("pyarrow is required for ParquetSink")
+        super().__init__(path, batch_size)
+        self.schema = schema
+        self.compression = compression
+        self._writer = None
+        self._mismatched = set()
+
+    def _write(self, batch):
+        if self.schema is None:
+            self.schema = _infer_schema(batch)
+        if self._writer is None:
+            self._writer = parquet.ParquetWriter(
+                self.path, self.schema, compression=self.compression
+            )
+
+        columns = []
+        for field in self.schema:
+            values = [result.get(field.name) for result in batch]
+            if pyarrow.types.is_string(field.type) or pyarrow.types.is_large_string(
+                field.type
+            ):
+                values = [None if v is None else _to_text(v) for v in values]
+            columns.append(self._column(field, values))
+        self._writer.write_table(pyarrow.Table.from_arrays(columns, schema=self.schema))
+
+    def _column(self, field, values):
+        try:
+            return pyarrow.array(values, type=field.type)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            pass
+        # the schema cant change once the file has been started, values which dont fit are dropped
+        if field.name not in self._mismatched:
+            self._mismatched.add(field.name)
+            log.warning(
+                f"Values of {field.name} dont match the {field.type} type of {self.path}, pass a schema to keep them"
+            )
+        column = []
+        for value in values:
+            try:
+                pyarrow.scalar(value, type=field.type)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                value = None
+            column.append(value)
+        return pyarrow.array(column, type=field.type)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+        else:
+            # no results, write a file with just the schema
+            schema = self.schema if self.schema is not None else pyarrow.schema([])
+            parquet.write_table(schema.empty_table(), self.path)
+
+
+class SQLiteSink(Sink):
+    """SQLiteSink: SQLite table with a column for each field, columns are added for fields seen in later batches"""
+
+    def __init__(self, path, table="results", batch_size=1000):
+        """
+        Input:
+            path (str) - SQLite database file to write the results to
+            table (str, optional) - Table to insert the results into, created if it doesnt exist. Defaults to 'results'
+            batch_size (int, optional) - Number of results inserted in each transaction, defaults to 1000
+        """
+        super().__init__(path, batch_size)
+        self.table = table
+        # results enriched by PRAW are written from the enrichment threads, one at a time
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (_row INTEGER PRIMARY KEY)')
+        self._columns = {
+            row[1] for row in self._conn.execute(f'PRAGMA table_info("{table}")')
+        }
+
+    def _write(self, batch):
+        fields = list(_union_fields(batch))
+        for field in fields:
+            if field not in self._columns:
+                self._conn.execute(f'ALTER TABLE "{self.table}" ADD COLUMN "{field}"')
+                self._columns.add(field)
+
+        columns = ", ".join(f'"{field}"' for field in fields)
+        params = ", ".join("?" for _ in fields)
+        with self._conn:
+            self._conn.executemany(
+                f'INSERT INTO "{self.table}" ({columns}) VALUES ({params})',
+                (
+                    tuple(_to_scalar(result.get(field)) for field in fields)
+                    for result in batch
+                ),
+            )
+
+    def _close(self):
+        self._conn.close()
+
+
+def _union_fields(batch):
+    # fields of every result in the batch, in the order they are first seen
+    fields = {}
+    for result in batch:
+        fields.update(dict.fromkeys(result))
+    return fields
+
+
+def _to_text(value):
+    return value if isinstance(value, str) else _to_json(value)
+
+
+def _infer_schema(batch):
+    fields = []
+    for name in _union_fields(batch):
+        values = [result.get(name) for result in batch]
+        kinds = {type(v) for v in values if v is not None}
+        if kinds == {bool}:
+            arrow_type = pyarrow.bool_()
+        elif kinds == {int}:
+            arrow_type = pyarrow.int64()
+        elif kinds and kinds <= {int, float}:
+            arrow_type = pyarrow.float64()
+        else:
+            # strings, and nested or mixed types like edited: False | 1629990795.0, are written as JSON
+            arrow_type = pyarrow.string()
+        fields.append(pyarrow.field(name, arrow_type))
+    return pyarrow.schema(fields)
@@ -0,0 +1,83 @@
+import logging
+import queue
+
+from pmaw.Response import Response
+
+log = logging.getLogger(__name__)
+
+
+class StreamResponse(Response):
+    """StreamResponse: A generator which returns responses while the search is still running."""
+
+    # marks the end of the search in the queue
+    _END = object()
+
+    def __init__(self, exit, buffer_size=10):
+        super().__init__()
+        # each queue item is a list of responses from a single request, when the queue
+        # is full the search waits until responses have been consumed
+        self._queue = queue.Queue(maxsize=buffer_size)
+        self._exit = exit
+        self._closed = False
+        self._finished = False
+        self.num_received = 0
+
+    def extend(self, results):
+        if not results:
+            return
+        self._put(list(results))
+        self.num_received += len(results)
+
+    def finish(self, exc=None):
+        """Called by the search once it has completed, or with the exception that stopped it"""
+        self._put(self._END if exc is None else exc)
+
+    def _put(self, item):
+        while not self._closed:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def to_cache(self):
+        # responses are handed to the consumer instead of being cached
+        pass
+
+    def send(self, ignored_arg):
+        while self.i >= len(self.responses):
+            if self._finished:
+                raise StopIteration
+
+            item = self._queue.get()
+            if item is self._END:
+                self._finished = True
+                self.responses = []
+                self.i = 0
+                raise StopIteration
+            elif isinstance(item, BaseException):
+                self._finished = True
+                raise item
+
+            self.num_returned += len(self.responses)
+            self.responses = item
+            self.i = 0
+        return self._next_resp()
+
+    def close(self):
+        # stop the search if the consumer stops iterating early
+        if not self._finished:
+            self._exit.set()
+        self._closed = True
+        self._finished = True
+        self.responses = []
+        self.i = 0
+
+    def throw(self, type=None, value=None, traceback=None):
+        log.debug("Cleaning up responses")
+        self.close()
+        raise StopIteration
+
+    def __len__(self):
+        # number of responses received from Pushshift which have not been returned yet
+        return max(self.num_received - (self.num_returned + self.i), 0)
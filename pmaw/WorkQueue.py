@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+from pmaw.Journal import slice_id
+from pmaw.utils.sqlite import connect, transaction
+
+log = logging.getLogger(__name__)
+
+# states of a request in the queue
+PENDING = 0
+LEASED = 1
+DONE = 2
+
+
+class WorkQueue:
+    """WorkQueue: SQLite queue of pending requests, shared by the nodes of a distributed search"""
+
+    def __init__(
+        self, path="./cache/queue.sqlite", lease_timeout=300, poll_interval=5, node=None
+    ):
+        """
+        Input:
+            path (str, optional) - SQLite database file shared by every node, defaults to ./cache/queue.sqlite
+            lease_timeout (float, optional) - Seconds a node has to complete a leased request before it is
+                leased to another node, defaults to 300s
+            poll_interval (float, optional) - Seconds to wait before checking for new requests while other
+                nodes hold the remaining leases, defaults to 5s
+            node (str, optional) - Name of this node, defaults to the hostname and process id
+        """
+        self.path = str(path)
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self.node = node or f"{socket.gethostname()}-{os.getpid()}"
+        self._seeded = False
+
+        self._lock = threading.Lock()
+        # shared between worker threads, access is serialized by the lock
+        self._conn = connect(self.path)
+        with transaction(self._conn, self._lock) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS requests ("
+                "id TEXT PRIMARY KEY, position INTEGER, state INTEGER, node TEXT, expires REAL, num_results INTEGER)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS requests_position ON requests (state, position)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    @property
+    def seeded(self):
+        """True once a node has added the initial requests of the search"""
+        if not self._seeded:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT 1 FROM info WHERE key = 'seeded'"
+                ).fetchone()
+            self._seeded = row is not None
+        return self._seeded
+
+    def seed(self, url_payloads):
+        """Adds the initial requests of the search, returns False if another node already added them"""
+        with transaction(self._conn, self._lock) as conn:
+            if conn.execute("SELECT 1 FROM info WHERE key = 'seeded'").fetchone():
+                seeded = False
+            else:
+                self._insert(conn, url_payloads)
+                conn.execute("INSERT INTO info VALUES ('seeded', ?)", (self.node,))
+                seeded = True
+        self._seeded = True
+        log.debug(f"Seeded queue with {len(url_payloads)} requests: {seeded}")
+        return seeded
+
+    def put(self, url_payloads):
+        """Adds requests to the back of the queue, requests which were added before are ignored"""
+        if url_payloads:
+            with transaction(self._conn, self._lock) as conn:
+                self._insert(conn, url_payloads)
+
+    def _insert(self, conn, url_payloads):
+        end = conn.execute("SELECT COALESCE(MAX(position), 0) FROM requests").fetchone()[0]
+        conn.executemany(
+            "INSERT OR IGNORE INTO requests (id, position, state) VALUES (?, ?, ?)",
+            [
+                (slice_id(url_pay), end + i + 1, PENDING)
+                for i, url_pay in enumerate(url_payloads)
+            ],
+        )
+
+    def lease(self, num):
+        """Leases up to num requests from the front of the queue, including requests whose lease expired"""
+        now = time.time()
+        with transaction(self._conn, self._lock) as conn:
+            rows = conn.execute(
+                "SELECT id FROM requests WHERE state = ? OR (state = ? AND expires < ?) "
+                "ORDER BY position LIMIT ?",
+                (PENDING, LEASED, now, num),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE requests SET state = ?, node = ?, expires = ? WHERE id = ?",
+                [(LEASED, self.node, now + self.lease_timeout, row[0]) for row in rows],
+            )
+        return [tuple(json.loads(row[0])) for row in rows]
+
+    def complete(self, url_pay, num_results):
+        """Marks a leased request as completed, it wont be leased again"""
+        with transaction(self._conn, self._lock) as conn:
+            conn.execute(
+                "UPDATE requests SET state = ?, node = ?, num_results = ? WHERE id = ?",
+                (DONE, self.node, num_results, slice_id(url_pay)),
+            )
+
+    def requeue(self, url_payloads):
+        """Returns leased requests to the front of the queue in order, so failed requests are retried first"""
+        if not url_payloads:
+            return
+        with transaction(self._conn, self._lock) as conn:
+            start = conn.execute(
+                "SELECT COALESCE(MIN(position), 0) FROM requests"
+            ).fetchone()[0] - len(url_payloads)
+            conn.executemany(
+                "UPDATE requests SET state = ?, node = NULL, expires = NULL, position = ? "
+                "WHERE id = ? AND state = ?",
+                [
+                    (PENDING, start + i, slice_id(url_pay), LEASED)
+                    for i, url_pay in enumerate(url_payloads)
+                ],
+            )
+
+    @property
+    def finished(self):
+        """True once the search was seeded and every request has been completed"""
+        if not self.seeded:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM requests WHERE state != ?", (DONE,)
+            ).fetchone()
+        return row[0] == 0
+
+    @property
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*), COALESCE(SUM(num_results), 0) FROM requests GROUP BY state"
+            ).fetchall()
+        counts = {state: (count, results) for state, count, results in rows}
+        return {
+            "pending": counts.get(PENDING, (0, 0))[0],
+            "leased": counts.get(LEASED, (0, 0))[0],
+            "done": counts.get(DONE, (0, 0))[0],
+            "results": counts.get(DONE, (0, 0))[1],
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
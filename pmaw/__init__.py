@@ -10,9 +10,17 @@ __author__ = "Matthew Podolak"
 __license__ = "MIT"
 
 from .RateLimit import RateLimit
+from .SharedRateLimit import SharedRateLimit
 from .Request import Request
 from .Response import Response
+from .StreamResponse import StreamResponse
+from .Sink import Sink, NDJSONSink, CSVSink, ParquetSink, SQLiteSink
 from .Cache import Cache
+from .CacheReader import CacheReader
+from .DensityIndex import DensityIndex
+from .ResponseCache import ResponseCache
+from .WorkQueue import WorkQueue
 from .PushshiftAPIBase import PushshiftAPIBase
 from .PushshiftAPI import PushshiftAPI
+from .AsyncPushshiftAPI import AsyncPushshiftAPI
 from .Metadata import Metadata
@@ -0,0 +1,4 @@
+"""
+Benchmarks for PMAW which run against a local Pushshift stub server
+"""
+from .server import StubServer
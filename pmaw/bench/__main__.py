@@ -0,0 +1,57 @@
+"""
+Runs the benchmark suite against the stub server, printing a JSON line for each scenario.
+
+    python -m pmaw.bench [suite ...] [--output results.json] [--cassettes cassettes] [--num-items 5000] [--repeat 1]
+"""
+import argparse
+import json
+
+from pmaw.bench import suite
+from pmaw.bench.cassettes import load_items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pmaw.bench", description="Benchmarks PMAW against a local Pushshift stub server"
+    )
+    parser.add_argument(
+        "suites", nargs="*", help=f"suites to run, defaults to all of {', '.join(suite.SUITES)}"
+    )
+    parser.add_argument("--output", help="write the results and environment to this JSON file")
+    parser.add_argument(
+        "--cassettes", help="folder of recorded cassettes whose items the stub server copies fields from"
+    )
+    parser.add_argument("--num-items", type=int, help="number of items on the stub server")
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="runs of each scenario, the median is reported"
+    )
+    parser.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for _, name, _, _ in suite.scenarios(args.suites):
+            print(name)
+        return
+
+    templates = None
+    if args.cassettes:
+        # only recorded items with their fields, rather than id searches filtered to ids
+        templates = [
+            item
+            for item in load_items(args.cassettes)
+            if "created_utc" in item and "subreddit" in item
+        ]
+
+    results = []
+    for result in suite.run(args.suites, args.num_items, args.repeat, templates):
+        print(json.dumps(result), flush=True)
+        results.append(result)
+
+    if args.output:
+        env = dict(suite.environment(), cassettes=args.cassettes)
+        with open(args.output, "w") as handle:
+            json.dump({"environment": env, "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
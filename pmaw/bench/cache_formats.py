@@ -0,0 +1,56 @@
+"""
+Compares write and read throughput and file size of the cache formats, using the responses recorded in the cassettes.
+
+    python -m pmaw.bench.cache_formats [cassette_dir]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from pmaw.utils.cache_formats import FORMATS, get_format
+from pmaw.bench.cassettes import load_items
+
+
+def run(items, formats=FORMATS, repeat=3):
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for name in formats:
+            try:
+                chunk_format = get_format(name)
+            except ImportError as exc:
+                results.append({"format": name, "skipped": str(exc)})
+                continue
+
+            path = os.path.join(folder, f"chunk.{chunk_format.extension}")
+            write, read = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                chunk_format.write(path, items)
+                write.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                loaded = chunk_format.read(path)
+                read.append(time.perf_counter() - start)
+
+            assert len(loaded) == len(items)
+            results.append(
+                {
+                    "format": name,
+                    "items": len(items),
+                    "bytes": os.path.getsize(path),
+                    "write_items_per_second": round(len(items) / min(write)),
+                    "read_items_per_second": round(len(items) / min(read)),
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    cassette_dir = sys.argv[1] if len(sys.argv) > 1 else "cassettes"
+    # repeat the recorded responses to get a chunk closer to a file_checkpoint, as
+    # distinct objects so that pickle cant store references to repeated items
+    items = [json.loads(json.dumps(item)) for item in load_items(cassette_dir) * 2]
+    for result in run(items):
+        print(json.dumps(result))
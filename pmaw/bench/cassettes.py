@@ -0,0 +1,54 @@
+import glob
+import gzip
+import json
+import os
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def load_bodies(cassette_dir="cassettes", host="pushshift.io"):
+    """Returns the raw JSON bodies of successful responses recorded in the vcrpy cassettes"""
+    if yaml is None:
+        raise ImportError("pyyaml is required to load cassettes")
+
+    bodies = []
+    for path in sorted(glob.glob(os.path.join(cassette_dir, "*"))):
+        with open(path) as handle:
+            cassette = yaml.safe_load(handle)
+        for interaction in cassette["interactions"]:
+            if host not in interaction["request"]["uri"]:
+                continue
+            response = interaction["response"]
+            if response["status"]["code"] != 200:
+                continue
+            headers = {k.lower(): v for k, v in response["headers"].items()}
+            encoding = headers.get("content-encoding", [None])[0]
+
+            body = response["body"]["string"]
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            if encoding == "gzip":
+                body = gzip.decompress(body)
+            elif encoding == "br":
+                # skip brotli responses unless brotli is installed
+                if brotli is None:
+                    continue
+                body = brotli.decompress(body)
+            bodies.append(body)
+    return bodies
+
+
+def load_items(cassette_dir="cassettes"):
+    """Returns every submission and comment recorded in the cassettes"""
+    items = []
+    for body in load_bodies(cassette_dir):
+        items.extend(json.loads(body).get("data", []))
+    return items
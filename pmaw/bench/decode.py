@@ -0,0 +1,53 @@
+"""
+Compares the throughput of the JSON decoders on the response bodies recorded in the cassettes.
+
+    python -m pmaw.bench.decode [cassette_dir]
+"""
+import json
+import sys
+import time
+
+from pmaw.utils.decode import DECODERS, get_decoder
+from pmaw.bench.cassettes import load_bodies
+
+
+def _text_loads(body):
+    # the previous approach, decoding the body to str before parsing it
+    return json.loads(body.decode("utf-8"))
+
+
+def run(bodies, decoders=DECODERS, repeat=5):
+    num_bytes = sum(len(body) for body in bodies)
+    results = []
+    for name in ("json (str)",) + tuple(decoders):
+        if name == "json (str)":
+            loads = _text_loads
+        else:
+            try:
+                loads = get_decoder(name)
+            except ImportError as exc:
+                results.append({"decoder": name, "skipped": str(exc)})
+                continue
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for body in bodies:
+                loads(body)
+            times.append(time.perf_counter() - start)
+
+        results.append(
+            {
+                "decoder": name,
+                "responses": len(bodies),
+                "bytes": num_bytes,
+                "mb_per_second": round(num_bytes / min(times) / 1e6, 1),
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    cassette_dir = sys.argv[1] if len(sys.argv) > 1 else "cassettes"
+    for result in run(load_bodies(cassette_dir)):
+        print(json.dumps(result))
@@ -0,0 +1,54 @@
+"""
+Compares the 'batch' and 'stream' schedulers against a stub server where a fraction of responses are slow.
+
+    python -m pmaw.bench.scheduler
+"""
+import json
+import time
+
+from pmaw import PushshiftAPI
+from pmaw.bench.server import StubServer
+
+
+def run(
+    num_items=20000,
+    num_workers=10,
+    latency=0.02,
+    slow_latency=0.5,
+    slow_fraction=0.1,
+    schedulers=("batch", "stream"),
+):
+    results = []
+    for scheduler in schedulers:
+        with StubServer(
+            num_items=num_items,
+            latency=latency,
+            slow_latency=slow_latency,
+            slow_fraction=slow_fraction,
+        ) as server:
+            api = server.api(
+                PushshiftAPI,
+                num_workers=num_workers,
+                limit_type=None,
+                scheduler=scheduler,
+            )
+            start = time.perf_counter()
+            resp = api.search_submissions(since=server.since, until=server.until)
+            elapsed = time.perf_counter() - start
+
+            results.append(
+                {
+                    "scheduler": scheduler,
+                    "num_workers": num_workers,
+                    "results": len(resp),
+                    "requests": server.num_requests,
+                    "seconds": round(elapsed, 3),
+                    "requests_per_second": round(server.num_requests / elapsed, 2),
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    for result in run():
+        print(json.dumps(result))
@@ -0,0 +1,268 @@
+import bisect
+import json
+from collections import deque
+import logging
+import random
+import socketserver
+import threading
+import time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+log = logging.getLogger(__name__)
+
+
+class StubServer:
+    """StubServer: Local HTTP server which synthesizes Pushshift search responses for benchmarking"""
+
+    def __init__(
+        self,
+        num_items=10000,
+        since=1600000000,
+        until=1600000000 + 30 * 86400,
+        latency=0.0,
+        slow_latency=0.0,
+        slow_fraction=0.0,
+        seed=0,
+        capacity=None,
+        retry_after=None,
+        burst_fraction=0.0,
+        num_bursts=3,
+        burst_width=3600,
+        rejected_fraction=0.0,
+        shards_down_fraction=0.0,
+        templates=None,
+    ):
+        """
+        Input:
+            num_items (int, optional) - Number of items to synthesize, defaults to 10000
+            since (int, optional) - Epoch time of the oldest item
+            until (int, optional) - Epoch time after the newest item
+            latency (float, optional) - Seconds added to every response, defaults to 0
+            slow_latency (float, optional) - Seconds added to slow responses, defaults to 0
+            slow_fraction (float, optional) - Fraction of responses which are slow, defaults to 0
+            seed (int, optional) - Seed for the synthesized items and latencies, defaults to 0
+            capacity (float, optional) - Requests per second accepted before responding with 429s, defaults to None for no limit
+            retry_after (float, optional) - Retry-After header value sent with 429s, defaults to None
+            burst_fraction (float, optional) - Fraction of items concentrated in short bursts of activity, defaults to 0 for items spread evenly
+            num_bursts (int, optional) - Number of bursts, defaults to 3
+            burst_width (int, optional) - Length of each burst in seconds, defaults to 3600
+            rejected_fraction (float, optional) - Fraction of requests which are randomly rejected with a 429, defaults to 0
+            shards_down_fraction (float, optional) - Fraction of responses whose metadata reports a failed shard, defaults to 0
+            templates (list, optional) - Recorded items, like those returned by `cassettes.load_items`, which synthesized items
+                copy their other fields from for realistic response sizes. Defaults to None for items with only a few fields
+        """
+        self.since = since
+        self.until = until
+        self.latency = latency
+        self.slow_latency = slow_latency
+        self.slow_fraction = slow_fraction
+        self.capacity = capacity
+        self.retry_after = retry_after
+        self.rejected_fraction = rejected_fraction
+        self.shards_down_fraction = shards_down_fraction
+        self.num_requests = 0
+        self.num_rejected = 0
+        self.num_shards_down = 0
+        self.bytes_sent = 0
+        self._accepted = deque()
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+        # items are kept sorted by ascending created_utc for range lookups
+        bursts = []
+        if burst_fraction > 0:
+            bursts = [
+                self._random.randrange(since, until - burst_width)
+                for _ in range(num_bursts)
+            ]
+        num_burst_items = int(num_items * burst_fraction) if bursts else 0
+        self.timestamps = sorted(
+            [self._random.randrange(since, until) for _ in range(num_items - num_burst_items)]
+            + [
+                self._random.choice(bursts) + self._random.randrange(burst_width)
+                for _ in range(num_burst_items)
+            ]
+        )
+        self.items = []
+        for i, ts in enumerate(self.timestamps):
+            item = dict(self._random.choice(templates)) if templates else {}
+            item.update(id=_base36(i + 36**5), created_utc=ts)
+            item.setdefault("score", self._random.randrange(100))
+            item.setdefault(
+                "subreddit", self._random.choice(("science", "programming", "aww"))
+            )
+            item.setdefault("author", f"user{self._random.randrange(1000)}")
+            self.items.append(item)
+        self._by_id = {item["id"]: item for item in self.items}
+
+    @property
+    def base_url(self):
+        """Base url to use in place of `PushshiftAPIBase._base_url`"""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/{{{{endpoint}}}}"
+
+    def api(self, api_class, **kwargs):
+        """Instantiates `api_class` with requests sent to this server"""
+        api = api_class(**kwargs)
+        api._base_url = self.base_url
+        return api
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, body = server.respond(self.path)
+                self.send_response(status)
+                if status == 429 and server.retry_after is not None:
+                    self.send_header("Retry-After", str(server.retry_after))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        # ThreadingHTTPServer needs python 3.7
+        class Server(socketserver.ThreadingMixIn, HTTPServer):
+            # the default backlog of 5 drops connections when many workers connect at once
+            request_queue_size = 128
+            daemon_threads = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _delay(self):
+        with self._lock:
+            self.num_requests += 1
+            slow = self._random.random() < self.slow_fraction
+        return self.latency + (self.slow_latency if slow else 0)
+
+    def _over_capacity(self):
+        if self.capacity is None and not self.rejected_fraction:
+            return False
+        with self._lock:
+            if self.rejected_fraction and self._random.random() < self.rejected_fraction:
+                self.num_rejected += 1
+                return True
+            if self.capacity is None:
+                return False
+            now = time.monotonic()
+            while self._accepted and now - self._accepted[0] >= 1:
+                self._accepted.popleft()
+            if len(self._accepted) >= self.capacity:
+                self.num_rejected += 1
+                return True
+            self._accepted.append(now)
+            return False
+
+    def respond(self, path):
+        """Returns the status and body for a request path"""
+        time.sleep(self._delay())
+
+        if self._over_capacity():
+            return 429, b'{"detail": "Too Many Requests"}'
+
+        query = parse_qs(urlparse(path).query)
+        size = int(query.get("size", [100])[0])
+
+        if "ids" in query:
+            ids = ",".join(query["ids"]).split(",")
+            hits = [self._by_id[i] for i in ids if i in self._by_id]
+            es_query = {"query": {"ids": {"values": ids}}}
+        else:
+            since = int(float(query.get("since", [self.since])[0]))
+            until = int(float(query.get("until", [self.until])[0]))
+            lo = bisect.bisect_left(self.timestamps, since)
+            hi = bisect.bisect_left(self.timestamps, until)
+            # newest first, matching order=desc
+            hits = self._match(self.items[lo:hi][::-1], query)
+            es_query = {
+                "query": {
+                    "bool": {
+                        "must": [
+                            {
+                                "bool": {
+                                    "must": [
+                                        {"range": {"created_utc": {"gte": since * 1000}}},
+                                        {"range": {"created_utc": {"lt": until * 1000}}},
+                                    ]
+                                }
+                            }
+                        ]
+                    }
+                }
+            }
+
+        data = hits[:size]
+        if "filter" in query:
+            fields = ",".join(query["filter"]).split(",")
+            data = [{k: item[k] for k in fields if k in item} for item in data]
+
+        with self._lock:
+            shards_down = bool(self.shards_down_fraction) and (
+                self._random.random() < self.shards_down_fraction
+            )
+            self.num_shards_down += shards_down
+
+        body = {
+            "data": data,
+            "metadata": {
+                "es": {
+                    "_shards": {"total": 8, "successful": 7 if shards_down else 8},
+                    "hits": {"total": {"value": len(hits)}},
+                },
+                "es_query": es_query,
+            },
+        }
+        body = json.dumps(body).encode("utf-8")
+        with self._lock:
+            self.bytes_sent += len(body)
+        return 200, body
+
+    @staticmethod
+    def _match(hits, query):
+        """Applies the score, num_comments, subreddit, and author parameters"""
+        for field in ("score", "num_comments"):
+            if field in query:
+                value = query[field][0]
+                if value.startswith(">"):
+                    hits = [h for h in hits if h.get(field, 0) > int(value[1:])]
+                elif value.startswith("<"):
+                    hits = [h for h in hits if h.get(field, 0) < int(value[1:])]
+                else:
+                    hits = [h for h in hits if h.get(field, 0) == int(value)]
+        for field in ("subreddit", "author"):
+            if field in query:
+                values = set(",".join(query[field]).lower().split(","))
+                hits = [h for h in hits if h[field].lower() in values]
+        return hits
+
+
+def _base36(num):
+    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
+    out = ""
+    while num:
+        num, rem = divmod(num, 36)
+        out = chars[rem] + out
+    return out or "0"
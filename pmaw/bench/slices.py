@@ -0,0 +1,52 @@
+"""
+Compares the 'uniform' and 'density' slice planners against a stub server where most items are posted in short bursts.
+
+    python -m pmaw.bench.slices
+"""
+import json
+import time
+
+from pmaw import PushshiftAPI
+from pmaw.bench.server import StubServer
+
+
+def run(
+    num_items=20000,
+    num_workers=10,
+    latency=0.02,
+    burst_fraction=0.8,
+    slice_planners=("uniform", "density"),
+):
+    results = []
+    for slice_planner in slice_planners:
+        with StubServer(
+            num_items=num_items, latency=latency, burst_fraction=burst_fraction
+        ) as server:
+            api = server.api(
+                PushshiftAPI,
+                num_workers=num_workers,
+                limit_type=None,
+                slice_planner=slice_planner,
+            )
+            start = time.perf_counter()
+            resp = api.search_submissions(since=server.since, until=server.until)
+            elapsed = time.perf_counter() - start
+
+            results.append(
+                {
+                    "slice_planner": slice_planner,
+                    "results": len(resp),
+                    "requests": server.num_requests,
+                    "count_requests": api.num_probes,
+                    "requests_per_100_results": round(
+                        server.num_requests / len(resp) * 100, 2
+                    ),
+                    "seconds": round(elapsed, 3),
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    for result in run():
+        print(json.dumps(result))
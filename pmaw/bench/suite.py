@@ -0,0 +1,197 @@
+"""
+Benchmark suite measuring searches against the stub server across PushshiftAPI settings.
+
+    python -m pmaw.bench [suite ...] [--output results.json] [--cassettes cassettes]
+
+Each scenario runs in a new process so that its peak RSS is measured on its own.
+"""
+import multiprocessing
+import platform
+import queue
+import statistics
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from pmaw import PushshiftAPI, __version__
+from pmaw.bench.server import StubServer
+
+# settings shared by every scenario, each scenario overrides some of them
+SERVER = dict(num_items=5000, latency=0.02, slow_latency=0.2, slow_fraction=0.05)
+API = dict(num_workers=10, limit_type=None)
+
+# a server which rejects requests beyond 15 requests per second, with rate limits allowing 20
+_LIMITED = dict(capacity=15, retry_after=0.2)
+_RATE_LIMIT = dict(rate_limit=1200, base_backoff=0.05, max_sleep=2)
+
+SUITES = {
+    "num_workers": [{"api": {"num_workers": n}} for n in (1, 5, 10, 20, 40)],
+    "batch_size": [{"api": {"batch_size": n}} for n in (5, 10, 20, 50)],
+    "scheduler": [{"api": {"scheduler": s}} for s in ("batch", "stream")],
+    "limit_type": [
+        {"server": _LIMITED, "api": dict(_RATE_LIMIT, limit_type=limit_type)}
+        for limit_type in (
+            "average",
+            "backoff",
+            "token_bucket",
+            "sliding_window",
+            "adaptive",
+        )
+    ],
+    "jitter": [
+        {
+            "server": {"rejected_fraction": 0.1},
+            "api": dict(_RATE_LIMIT, limit_type="backoff", jitter=jitter),
+        }
+        for jitter in (None, "full", "equal", "decorr")
+    ],
+    "slice_planner": [
+        {"server": {"burst_fraction": 0.8}, "api": {"slice_planner": planner}}
+        for planner in ("uniform", "density")
+    ],
+    "shards_down": [
+        {"server": {"shards_down_fraction": fraction}} for fraction in (0.0, 0.2)
+    ],
+}
+
+
+def scenarios(suites=None):
+    """Returns (suite, name, server settings, api settings) for each scenario in the suites, defaults to every suite"""
+    for suite in suites or SUITES:
+        if suite not in SUITES:
+            raise ValueError(f"Unknown suite {suite}, options are {', '.join(SUITES)}")
+        settings = [
+            dict(scenario.get("server", {}), **scenario.get("api", {}))
+            for scenario in SUITES[suite]
+        ]
+        # scenarios are named by the settings which vary within their suite
+        varying = [
+            k
+            for k in dict.fromkeys(k for setting in settings for k in setting)
+            if len({repr(setting.get(k)) for setting in settings}) > 1
+        ]
+        for scenario, setting in zip(SUITES[suite], settings):
+            name = ",".join(f"{k}={setting.get(k)}" for k in varying)
+            yield (
+                suite,
+                f"{suite}/{name}",
+                dict(SERVER, **scenario.get("server", {})),
+                dict(API, **scenario.get("api", {})),
+            )
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return round(rss / (1024**2 if sys.platform == "darwin" else 1024), 1)
+
+
+def measure(server_settings, api_settings, templates=None):
+    """Runs a submission search over the whole stub server window, returns its metrics"""
+    with StubServer(templates=templates, **server_settings) as server:
+        api = server.api(PushshiftAPI, **api_settings)
+        start = time.perf_counter()
+        resp = api.search_submissions(since=server.since, until=server.until)
+        elapsed = time.perf_counter() - start
+        num_results = len(resp)
+
+        return {
+            "results": num_results,
+            "requests": server.num_requests,
+            "rejected": server.num_rejected,
+            "shards_down": server.num_shards_down,
+            "seconds": round(elapsed, 3),
+            "requests_per_second": round(server.num_requests / elapsed, 2),
+            "requests_per_result": (
+                round(server.num_requests / num_results, 4) if num_results else None
+            ),
+            "mb_received": round(server.bytes_sent / 1e6, 2),
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+
+
+def _measure_isolated(results, server_settings, api_settings, templates):
+    try:
+        results.put((None, measure(server_settings, api_settings, templates)))
+    except Exception as exc:
+        results.put((repr(exc), None))
+
+
+def run_scenario(server_settings, api_settings, templates=None, isolated=True):
+    """Measures a scenario, in a new process when isolated so earlier scenarios dont affect its peak RSS"""
+    if not isolated:
+        return measure(server_settings, api_settings, templates)
+    # ProcessPoolExecutor only accepts a context from python 3.7
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(
+        target=_measure_isolated,
+        args=(results, server_settings, api_settings, templates),
+    )
+    process.start()
+    try:
+        while True:
+            try:
+                error, metrics = results.get(timeout=1)
+                break
+            except queue.Empty:
+                if not process.is_alive():
+                    raise RuntimeError(
+                        f"Scenario process exited with code {process.exitcode}"
+                    )
+    finally:
+        process.join()
+    if error is not None:
+        raise RuntimeError(f"Scenario failed: {error}")
+    return metrics
+
+
+def run(suites=None, num_items=None, repeat=1, templates=None, isolated=True):
+    """
+    Runs the scenarios of the suites, yielding a result for each
+
+    Input:
+        suites (list, optional) - Names of the suites to run, defaults to every suite
+        num_items (int, optional) - Number of items on the stub server, defaults to 5000
+        repeat (int, optional) - Number of times each scenario is run, the run with the median wall time is reported. Defaults to 1
+        templates (list, optional) - Recorded items the stub server copies fields from, see `cassettes.load_items`
+        isolated (bool, optional) - Run each scenario in a new process, defaults to True
+    Output:
+        Generator of dicts with the scenario, its settings, and its metrics
+    """
+    for suite, name, server_settings, api_settings in scenarios(suites):
+        if num_items is not None:
+            server_settings["num_items"] = num_items
+        runs = [
+            run_scenario(server_settings, api_settings, templates, isolated)
+            for _ in range(repeat)
+        ]
+        median = statistics.median_low(r["seconds"] for r in runs)
+        metrics = next(r for r in runs if r["seconds"] == median)
+        yield dict(
+            {
+                "suite": suite,
+                "scenario": name,
+                "server": server_settings,
+                "api": api_settings,
+                "runs": repeat,
+            },
+            **metrics,
+        )
+
+
+def environment():
+    """Describes where the benchmarks were run, stored with the results so they can be compared"""
+    return {
+        "pmaw": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "created": int(time.time()),
+    }
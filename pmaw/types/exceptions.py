@@ -3,3 +3,19 @@ from requests import HTTPError
 
 class HTTPNotFoundError(HTTPError):
     """Error class for 404 error"""
+
+
+class HTTPTooManyRequestsError(HTTPError):
+    """Error class for 429 error, retry_after is the number of seconds requested by the server if provided"""
+
+    def __init__(self, *args, retry_after=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+
+
+class HTTPServerError(HTTPError):
+    """Error class for 5xx errors"""
+
+    def __init__(self, *args, retry_after=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
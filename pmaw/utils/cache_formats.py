@@ -0,0 +1,163 @@
+import gzip
+import io
+import json
+import pickle
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:
+    pyarrow = None
+
+
+class PickleFormat:
+    """Gzip compressed pickle of the list of responses, the original cache format"""
+
+    extension = "pickle.gz"
+
+    def __init__(self, level=9):
+        self.level = level
+
+    def write(self, path, responses):
+        with gzip.open(path, "wb", compresslevel=self.level) as handle:
+            pickle.dump(responses, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def read(self, path):
+        with gzip.open(path, "rb") as handle:
+            return pickle.load(handle)
+
+
+class NDJSONFormat:
+    """Newline delimited JSON, one response per line, optionally compressed with gzip, zstd, or lz4"""
+
+    def __init__(self, codec=None, level=None):
+        self.codec = codec
+        self.level = level
+        if codec == "zst" and zstandard is None:
+            raise ImportError("zstandard is required for the ndjson.zst cache format")
+        if codec == "lz4" and lz4_frame is None:
+            raise ImportError("lz4 is required for the ndjson.lz4 cache format")
+
+    @property
+    def extension(self):
+        return f"ndjson.{self.codec}" if self.codec else "ndjson"
+
+    def _open(self, path, mode):
+        if self.codec is None:
+            return open(path, mode)
+        elif self.codec == "gz":
+            return gzip.open(path, mode, compresslevel=self.level or 1)
+        elif self.codec == "lz4":
+            return lz4_frame.open(path, mode, compression_level=self.level or 0)
+        elif self.codec == "zst":
+            handle = open(path, mode)
+            if mode == "wb":
+                cctx = zstandard.ZstdCompressor(level=self.level or 3)
+                return cctx.stream_writer(handle, closefd=True)
+            return zstandard.ZstdDecompressor().stream_reader(handle, closefd=True)
+
+    def write(self, path, responses):
+        with self._open(path, "wb") as handle:
+            with io.TextIOWrapper(handle, encoding="utf-8") as text:
+                for resp in responses:
+                    text.write(json.dumps(resp, separators=(",", ":")))
+                    text.write("\n")
+
+    def read(self, path):
+        with self._open(path, "rb") as handle:
+            with io.TextIOWrapper(handle, encoding="utf-8") as text:
+                return [json.loads(line) for line in text if line.strip()]
+
+
+class ParquetFormat:
+    """Columnar Parquet file with one row per response, fields missing from a response are read as None"""
+
+    extension = "parquet"
+
+    def __init__(self, compression="zstd"):
+        if pyarrow is None:
+            raise ImportError("pyarrow is required for the parquet cache format")
+        self.compression = compression
+
+    def write(self, path, responses):
+        # union of fields across all responses, the schema would otherwise only use the first response
+        fields = {}
+        for resp in responses:
+            fields.update(dict.fromkeys(resp))
+
+        columns = {}
+        json_columns = []
+        for field in fields:
+            values = [resp.get(field) for resp in responses]
+            if any(isinstance(v, (dict, list)) for v in values):
+                # nested fields vary too much between responses for a fixed schema
+                values = [None if v is None else json.dumps(v) for v in values]
+                json_columns.append(field)
+            try:
+                columns[field] = pyarrow.array(values)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                # mixed types like edited: False | 1629990795.0
+                columns[field] = pyarrow.array(
+                    [None if v is None else json.dumps(v) for v in values]
+                )
+                json_columns.append(field)
+
+        table = pyarrow.table(columns).replace_schema_metadata(
+            {"pmaw_json_columns": json.dumps(json_columns)}
+        )
+        parquet.write_table(table, path, compression=self.compression)
+
+    def read(self, path):
+        table = parquet.read_table(path)
+        metadata = table.schema.metadata or {}
+        json_columns = json.loads(metadata.get(b"pmaw_json_columns", b"[]"))
+
+        responses = table.to_pylist()
+        for resp in responses:
+            for field in json_columns:
+                if resp[field] is not None:
+                    resp[field] = json.loads(resp[field])
+        return responses
+
+
+_FORMATS = {
+    "pickle.gz": lambda: PickleFormat(),
+    "ndjson": lambda: NDJSONFormat(),
+    "ndjson.gz": lambda: NDJSONFormat("gz"),
+    "ndjson.zst": lambda: NDJSONFormat("zst"),
+    "ndjson.lz4": lambda: NDJSONFormat("lz4"),
+    "parquet": lambda: ParquetFormat(),
+}
+
+FORMATS = tuple(_FORMATS)
+
+
+def get_format(cache_format):
+    """Returns the chunk format for a format name or instance"""
+    if not isinstance(cache_format, str):
+        return cache_format
+    try:
+        return _FORMATS[cache_format]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown cache_format {cache_format}, options are {', '.join(FORMATS)}"
+        )
+
+
+def format_from_filename(filename):
+    """Returns the chunk format for a cached responses filename, None if it is not a chunk"""
+    # longest extensions first so that ndjson.gz isnt matched as ndjson
+    for name in sorted(FORMATS, key=len, reverse=True):
+        if filename.endswith("." + name):
+            return name
+    return None
@@ -0,0 +1,54 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+_DECODERS = {
+    "orjson": lambda: orjson and orjson.loads,
+    "simdjson": lambda: simdjson and simdjson.loads,
+    "ujson": lambda: ujson and ujson.loads,
+    # json.loads accepts bytes, detecting the encoding itself
+    "json": lambda: json.loads,
+}
+
+# fastest first, used when no decoder is specified
+DECODERS = tuple(_DECODERS)
+
+
+def get_decoder(decoder=None):
+    """
+    Returns a function decoding a JSON response body from bytes
+
+    Input:
+        decoder (str, optional) - One of 'orjson', 'simdjson', 'ujson', or 'json'. Defaults to None for the
+            fastest one installed
+    Output:
+        function
+    """
+    if decoder is None:
+        for name in DECODERS:
+            loads = _DECODERS[name]()
+            if loads:
+                return loads
+    elif decoder not in _DECODERS:
+        raise ValueError(
+            f"Unknown json_decoder {decoder}, options are {', '.join(DECODERS)}"
+        )
+
+    loads = _DECODERS[decoder]()
+    if not loads:
+        raise ImportError(f"{decoder} is required for json_decoder='{decoder}'")
+    return loads
@@ -0,0 +1,103 @@
+import abc
+import hashlib
+import math
+import re
+
+# reddit ids are base36, other ids are kept as they are
+_BASE36 = re.compile(r"[0-9a-zA-Z]+\Z")
+
+
+def id_key(item):
+    """Returns a compact key for an item, base36 reddit ids are decoded to integers"""
+    item_id = item if isinstance(item, str) else item.get("id")
+    if item_id is None:
+        return None
+    if isinstance(item_id, str) and _BASE36.match(item_id):
+        return int(item_id, 36)
+    return item_id
+
+
+class Deduplicator(abc.ABC):
+    """Base class for deduplication stages, subclasses implement add"""
+
+    def __init__(self):
+        self.num_duplicates = 0
+
+    @abc.abstractmethod
+    def add(self, key):
+        """Adds a key, returns False if the key has already been seen"""
+
+    def remove_duplicates(self, results):
+        """Returns the results which have not been seen before, items without an id are kept"""
+        unique = []
+        for item in results:
+            key = id_key(item)
+            if key is None or self.add(key):
+                unique.append(item)
+        self.num_duplicates += len(results) - len(unique)
+        return unique
+
+
+class IdSet(Deduplicator):
+    """Exact deduplication using a set of integer decoded ids"""
+
+    def __init__(self):
+        super().__init__()
+        self.ids = set()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, key):
+        if key in self.ids:
+            return False
+        self.ids.add(key)
+        return True
+
+
+class BloomFilter(Deduplicator):
+    """
+    Approximate deduplication in fixed memory for very large searches, about error_rate of
+    new items are incorrectly dropped as duplicates once capacity items have been added.
+    The default capacity allocates about 30MB, and each add takes roughly 10-20µs
+    """
+
+    def __init__(self, capacity=10000000, error_rate=1e-5):
+        super().__init__()
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        # odd step so that positions dont repeat
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        new = False
+        for pos in self._positions(key):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not self.bits[byte] & mask:
+                new = True
+                self.bits[byte] |= mask
+        return new
+
+
+def get_dedup(dedup, limit=None):
+    """Returns the deduplication stage for a dedup option, None if dedup is disabled"""
+    if dedup is None or dedup is False:
+        return None
+    elif dedup is True or dedup == "set":
+        return IdSet()
+    elif dedup == "bloom":
+        if isinstance(limit, int) and limit > 0:
+            # duplicates and the last batch can add more ids than the limit
+            return BloomFilter(capacity=max(100000, 2 * limit))
+        return BloomFilter()
+    elif isinstance(dedup, Deduplicator):
+        return dedup
+    raise ValueError(f"Unknown dedup {dedup}, options are True, 'set', or 'bloom'")
@@ -0,0 +1,45 @@
+_PLAIN = (str, int, float, bool, type(None))
+
+
+def _plain(value):
+    """Converts a value to plain data, nested PRAW models are replaced by their name"""
+    if isinstance(value, _PLAIN):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    # Redditor and Subreddit models convert to their name
+    return str(value)
+
+
+def get_projection(fields):
+    """
+    Returns a function converting a PRAW object into a plain dict
+
+    Input:
+        fields (list, dict, optional) - Attributes to keep, or a dict of output keys to attribute
+            names or functions called with the PRAW object. None keeps all attributes, like vars(obj)
+    Output:
+        function
+    """
+    if fields is None:
+        return vars
+    if isinstance(fields, str):
+        fields = [fields]
+    if not isinstance(fields, dict):
+        fields = {field: field for field in fields}
+
+    def project(obj):
+        # only attributes which have been fetched are read, getattr would make
+        # a request to Reddit for each missing attribute
+        attrs = vars(obj)
+        item = {}
+        for key, field in fields.items():
+            if callable(field):
+                item[key] = _plain(field(obj))
+            else:
+                item[key] = _plain(attrs.get(field))
+        return item
+
+    return project
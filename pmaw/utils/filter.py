@@ -1,3 +1,6 @@
+import re
+
+
 def apply_filter(array, filter_fn):
     filtered_array = []
     for item in array:
@@ -12,3 +15,110 @@ def apply_filter(array, filter_fn):
             )
 
     return filtered_array
+
+
+_COMPARISONS = ("==", "!=", ">", ">=", "<", "<=")
+
+
+class _Missing:
+    """Value of missing fields in ordering comparisons, which never match"""
+
+    def __lt__(self, other):
+        return False
+
+    __le__ = __gt__ = __ge__ = __lt__
+
+
+_MISSING = _Missing()
+
+# cheaper conditions are checked first, so that later ones are skipped more often
+_COST = {"exists": 0, "==": 1, "!=": 1, ">": 1, ">=": 1, "<": 1, "<=": 1}
+
+
+def _condition(field, op, arg, name, namespace):
+    """Returns a python expression testing an item field for an (op, arg) condition, arg is bound to name in namespace"""
+    value = f"item.get({field!r})"
+    if op in ("==", "!="):
+        namespace[name] = arg
+        return f"{value} {op} {name}"
+    elif op in _COMPARISONS:
+        namespace[name] = arg
+        # items without the field are filtered out
+        return f"item.get({field!r}, _MISSING) {op} {name}"
+    elif op in ("in", "not in"):
+        try:
+            namespace[name] = frozenset(arg)
+        except TypeError:
+            namespace[name] = list(arg)
+        return f"{value} {op} {name}"
+    elif op == "contains":
+        namespace[name] = arg
+        return f"({name} in ({value} or ''))"
+    elif op == "regex":
+        namespace[name] = re.compile(arg).search
+        return f"{name}({value} or '') is not None"
+    elif op == "exists":
+        return f"{value} {'is not' if arg else 'is'} None"
+    raise ValueError(
+        f"Unknown filter operator {op}, options are {', '.join(_COMPARISONS)}, in, not in, contains, regex, exists"
+    )
+
+
+def compile_filters(filters):
+    """
+    Compiles a filter spec into a function which filters a batch of items
+
+    Input:
+        filters (dict) - Maps fields to an (op, value) tuple, a list of (op, value) tuples which must all
+            match, or a value the field must be equal to. Operators are ==, !=, >, >=, <, <=, in,
+            not in, contains, regex, and exists
+    Output:
+        function - Accepts a list of items and returns the items which match every condition
+    """
+    if not isinstance(filters, dict):
+        raise ValueError("filters must be a dict of fields to conditions")
+
+    conditions = []
+    namespace = {"_MISSING": _MISSING}
+    for field, spec in filters.items():
+        if not isinstance(field, str):
+            raise ValueError(f"Invalid field {field}, fields must be strings")
+        if isinstance(spec, list):
+            specs = spec
+        elif isinstance(spec, tuple):
+            specs = [spec]
+        else:
+            specs = [("==", spec)]
+
+        for condition in specs:
+            if not isinstance(condition, tuple) or len(condition) != 2:
+                raise ValueError(
+                    f"Invalid condition {condition} for {field}, conditions are (op, value) tuples"
+                )
+            op, arg = condition
+            name = f"_arg{len(conditions)}"
+            expr = _condition(field, op, arg, name, namespace)
+            conditions.append((_COST.get(op, 2), expr))
+
+    conditions.sort(key=lambda condition: condition[0])
+    test = " and ".join(expr for _, expr in conditions) or "True"
+
+    # a single comprehension avoids a function call for each item and condition
+    batch = eval(f"lambda results: [item for item in results if {test}]", namespace)
+    match = eval(f"lambda item: {test}", namespace)
+
+    def evaluate(results):
+        try:
+            return batch(results)
+        except TypeError:
+            # a field had a value which cant be compared, like None, those items dont match
+            filtered = []
+            for item in results:
+                try:
+                    if match(item):
+                        filtered.append(item)
+                except TypeError:
+                    pass
+            return filtered
+
+    return evaluate
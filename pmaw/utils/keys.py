@@ -0,0 +1,32 @@
+import hashlib
+import json
+
+# parameters which dont change which items match a query
+_RANGE_PARAMS = ("since", "until", "limit", "size", "filter")
+
+
+def _to_json(value):
+    # sets are sorted so that their keys dont depend on iteration order
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def query_key(payload, kind):
+    """Returns a key for a query which is the same for any time range it is run over"""
+    query = {k: v for k, v in payload.items() if k not in _RANGE_PARAMS}
+    query["kind"] = kind
+    key_str = json.dumps(query, sort_keys=True, default=_to_json).encode("utf-8")
+    return hashlib.md5(key_str).hexdigest()
+
+
+def sync_key(payload, kind, filters=None):
+    """Returns a key for a synced query, which also depends on the fields returned and the filters applied"""
+    query = dict(payload)
+    if "filter" in payload:
+        fields = payload["filter"]
+        fields = fields.split(",") if isinstance(fields, str) else fields
+        query["sync_filter"] = sorted(field for field in fields if field)
+    if filters is not None:
+        query["sync_filters"] = filters
+    return query_key(query, kind)
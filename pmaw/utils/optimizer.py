@@ -0,0 +1,161 @@
+import dis
+import logging
+
+log = logging.getLogger(__name__)
+
+# Pushshift parameters which accept a >n or <n range
+_RANGE_PARAMS = ("score", "num_comments")
+# Pushshift parameters which accept a comma separated list of values
+_LIST_PARAMS = ("subreddit", "author")
+
+_LOAD_FAST = ("LOAD_FAST", "LOAD_FAST_CHECK", "LOAD_FAST_BORROW")
+
+
+def fn_fields(filter_fn):
+    """
+    Infers the fields a filter function reads from its item, using its bytecode
+
+    Input:
+        filter_fn (function) - Filter function accepting a single item
+    Output:
+        set of field names, or None if the item is used in any other way than item[<str>] or item.get(<str>)
+    """
+    code = getattr(filter_fn, "__code__", None)
+    if code is None or code.co_argcount < 1:
+        return None
+    arg = code.co_varnames[0]
+    if arg in code.co_cellvars:
+        # the item is used by a nested function
+        return None
+
+    fields = set()
+    instructions = list(dis.get_instructions(code))
+    for i, instruction in enumerate(instructions):
+        if instruction.opname in _LOAD_FAST and instruction.argval == arg:
+            following = instructions[i + 1 : i + 3]
+            if len(following) < 2:
+                return None
+            first, second = following
+            if (
+                first.opname == "LOAD_CONST"
+                and isinstance(first.argval, str)
+                and (
+                    second.opname == "BINARY_SUBSCR"
+                    or (second.opname == "BINARY_OP" and "[" in second.argrepr)
+                )
+            ):
+                # item["field"]
+                fields.add(first.argval)
+            elif (
+                first.opname in ("LOAD_METHOD", "LOAD_ATTR")
+                and first.argval == "get"
+                and second.opname == "LOAD_CONST"
+                and isinstance(second.argval, str)
+            ):
+                # item.get("field")
+                fields.add(second.argval)
+            else:
+                return None
+        elif "FAST" in instruction.opname or instruction.opname == "LOAD_CLOSURE":
+            names = instruction.argval
+            if not isinstance(names, tuple):
+                names = (names,)
+            if arg in names:
+                # stored, deleted, or loaded together with another variable
+                return None
+    return fields
+
+
+def _conditions(spec):
+    if isinstance(spec, list):
+        return spec
+    elif isinstance(spec, tuple):
+        return [spec]
+    return [("==", spec)]
+
+
+def pushdown(filters):
+    """
+    Returns Pushshift parameters equivalent to the conditions in a filters spec which Pushshift supports,
+    results still need to be filtered client side as only one condition per parameter can be pushed down
+
+    Input:
+        filters (dict) - Filter spec, see `compile_filters`
+    Output:
+        dict of Pushshift parameters
+    """
+    params = {}
+    for field, spec in filters.items():
+        for op, arg in _conditions(spec):
+            if field in params:
+                break
+            if field in _RANGE_PARAMS:
+                if not isinstance(arg, int) or isinstance(arg, bool):
+                    continue
+                # ranges are exclusive
+                if op in (">", "<"):
+                    params[field] = f"{op}{arg}"
+                elif op == ">=":
+                    params[field] = f">{arg - 1}"
+                elif op == "<=":
+                    params[field] = f"<{arg + 1}"
+            elif field in _LIST_PARAMS:
+                if op == "==" and isinstance(arg, str):
+                    params[field] = arg
+                elif (
+                    op == "in"
+                    and isinstance(arg, (list, tuple, set, frozenset))
+                    and len(arg) > 0
+                    and all(isinstance(value, str) for value in arg)
+                ):
+                    params[field] = ",".join(sorted(arg))
+    return params
+
+
+def _split_fields(fields):
+    if isinstance(fields, str):
+        return [field for field in fields.split(",") if field]
+    return list(fields)
+
+
+def optimize_query(payload, filters=None, filter_fn=None, dedup=False):
+    """
+    Adds the fields needed by filters, filter_fn and dedup to the filter parameter, so results
+    returned with only the requested fields can still be filtered, and pushes conditions from
+    filters which Pushshift supports into the query
+
+    Input:
+        payload (dict) - Pushshift query, modified in place
+        filters (dict, optional) - Filter spec applied to the results
+        filter_fn (function, optional) - Filter function applied to the results
+        dedup (optional) - Deduplication option, ids are needed when enabled
+    Output:
+        dict - payload
+    """
+    if "filter" in payload:
+        needed = set()
+        if filters is not None:
+            needed.update(filters)
+        if filter_fn is not None:
+            used = fn_fields(filter_fn)
+            if used is None:
+                log.debug("Unable to infer the fields used by filter_fn")
+            else:
+                needed.update(used)
+        # an empty IdSet is falsy, only None and False disable dedup
+        if dedup is not None and dedup is not False:
+            needed.add("id")
+
+        fields = _split_fields(payload["filter"])
+        missing = sorted(needed - set(fields))
+        if missing:
+            log.debug(f"Adding fields {missing} needed for filtering")
+            payload["filter"] = fields + missing
+
+    if filters is not None and "ids" not in payload:
+        for param, value in pushdown(filters).items():
+            if param not in payload:
+                log.debug(f"Pushing {param}={value} down to Pushshift")
+                payload[param] = value
+
+    return payload
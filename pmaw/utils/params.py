@@ -0,0 +1,11 @@
+def encode_params(payload):
+    """Converts a payload into query parameters in the same form `requests` would send them."""
+    params = []
+    for key, value in payload.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            params.extend((key, str(v)) for v in value)
+        else:
+            params.append((key, str(value)))
+    return params
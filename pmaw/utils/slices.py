@@ -12,3 +12,52 @@ def mapslice(payload, since, until):
     payload["until"] = until
     payload["since"] = since
     return payload
+
+
+def plan_slices(ranges, num_slices):
+    """
+    Splits counted time ranges into slices containing roughly equal numbers of results,
+    results are assumed to be spread evenly within each range. The slices cover every range,
+    including ranges counted as empty
+
+    Input:
+        ranges (list) - Adjacent (since, until, count) tuples in ascending order, count is None if unknown
+        num_slices (int) - Number of slices to split the known results into
+    Output:
+        list of (since, until) tuples in ascending order
+    """
+    total = sum(count for _, _, count in ranges if count)
+    target = total / max(1, num_slices)
+
+    slices = []
+    start = None
+    filled = 0
+    for since, until, count in ranges:
+        if count is None:
+            # uncounted ranges get a slice of their own
+            if start is not None and since > start:
+                slices.append((start, since))
+            start, filled = None, 0
+            slices.append((since, until))
+            continue
+        if start is None:
+            start = since
+        end = until
+        if count == 0:
+            # empty ranges join a slice, so results added since they were counted arent missed
+            continue
+
+        # cut the range where each slice reaches the target number of results
+        used = 0
+        while filled + (count - used) >= target and len(slices) < num_slices - 1:
+            used += target - filled
+            cut = since + int((until - since) * used / count)
+            if cut > start:
+                slices.append((start, cut))
+                start = cut
+            filled = 0
+        filled += count - used
+
+    if start is not None and end > start:
+        slices.append((start, end))
+    return slices
@@ -0,0 +1,33 @@
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def connect(path, timeout=60):
+    """
+    Opens a SQLite database which can be shared by several processes and nodes
+
+    Input:
+        path (str) - SQLite database file, its folder is created if it doesnt exist
+        timeout (float, optional) - Seconds to wait for another process to release the database, defaults to 60s
+    Output:
+        sqlite3.Connection in autocommit mode, use `transaction` to group statements
+    """
+    Path(path).parent.mkdir(exist_ok=True, parents=True)
+    # the rollback journal is used rather than WAL, which only works between processes on the same host
+    return sqlite3.connect(
+        str(path), timeout=timeout, check_same_thread=False, isolation_level=None
+    )
+
+
+@contextmanager
+def transaction(conn, lock):
+    """Runs statements in a write transaction, other processes cant write until it is committed"""
+    with lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
@@ -26,6 +26,13 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     license='MIT License',
     install_requires=['requests', 'praw'],
+    extras_require={
+        'async': ['aiohttp'],
+        'zstd': ['zstandard'],
+        'lz4': ['lz4'],
+        'parquet': ['pyarrow'],
+        'orjson': ['orjson'],
+    },
     keywords='reddit api wrapper pushshift multithread data collection cache',
     classifiers=[
         "Development Status :: 3 - Alpha",
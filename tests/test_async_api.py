@@ -0,0 +1,102 @@
+import asyncio
+import time
+import pytest
+from pmaw.utils.params import encode_params
+
+aiohttp = pytest.importorskip("aiohttp")
+from pmaw import AsyncPushshiftAPI
+
+
+def test_encode_params():
+    payload = {"q": "java", "track_total_hits": True, "size": 100, "ids": []}
+    params = encode_params(payload)
+    assert params == [("q", "java"), ("track_total_hits", "True"), ("size", "100")]
+
+
+def test_encode_params_list():
+    params = encode_params({"ids": ["a", "b"], "until": None})
+    assert params == [("ids", "a"), ("ids", "b")]
+
+
+def test_search_is_coroutine():
+    api = AsyncPushshiftAPI()
+    search = api.search_submissions(q="test")
+    assert asyncio.iscoroutine(search)
+    # nothing is requested until the coroutine is awaited
+    assert not hasattr(api, "req")
+    search.close()
+
+
+def test_comment_ids_rejects_filters():
+    api = AsyncPushshiftAPI()
+    with pytest.raises(ValueError):
+        asyncio.run(api.search_submission_comment_ids(ids=["a"], filter_fn=len))
+
+
+def test_search_options_not_sent():
+    from pmaw.bench import StubServer
+
+    with StubServer(num_items=200) as server:
+        api = server.api(AsyncPushshiftAPI, limit_type=None)
+        posts = asyncio.run(
+            api.search_submissions(
+                since=server.since, until=server.until, stream_buffer=5
+            )
+        )
+        assert len(posts) == 200
+        assert "stream_buffer" not in api.req.payload
+
+    with pytest.raises(NotImplementedError):
+        asyncio.run(api.search_submissions(q="test", stream=True))
+    with pytest.raises(NotImplementedError):
+        asyncio.run(api.search_submissions(q="test", work_queue="queue.db"))
+
+
+@pytest.mark.parametrize("option", [{"scheduler": "batch"}, {"checkpoint_interval": 5}])
+def test_unsupported_options(option):
+    with pytest.raises(NotImplementedError):
+        AsyncPushshiftAPI(**option)
+
+
+def test_matches_threaded():
+    from pmaw import PushshiftAPI
+    from pmaw.bench import StubServer
+
+    with StubServer(num_items=2000) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        posts = api.search_submissions(since=server.since, until=server.until)
+        async_api = server.api(AsyncPushshiftAPI, limit_type=None, num_workers=50)
+        async_posts = asyncio.run(
+            async_api.search_submissions(since=server.since, until=server.until)
+        )
+        ids = sorted(post["id"] for post in posts)
+        assert ids == sorted(post["id"] for post in async_posts)
+        assert len(ids) == 2000
+
+
+def test_density_planning_doesnt_block():
+    from pmaw.bench import StubServer
+
+    async def search(api, server):
+        gaps = []
+
+        async def tick():
+            last = time.monotonic()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                gaps.append(now - last)
+                last = now
+
+        ticker = asyncio.ensure_future(tick())
+        posts = await api.search_submissions(since=server.since, until=server.until)
+        ticker.cancel()
+        return posts, gaps
+
+    with StubServer(num_items=500, latency=0.3) as server:
+        api = server.api(AsyncPushshiftAPI, limit_type=None, slice_planner="density")
+        posts, gaps = asyncio.run(search(api, server))
+        assert len(posts) == 500
+        assert api.num_probes > 0
+        # the event loop keeps running while results are counted
+        assert max(gaps) < 0.2
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from pmaw import PushshiftAPI
+from pmaw.bench import StubServer, suite
+from pmaw.bench.__main__ import main
+
+
+def test_stub_server_faults():
+    templates = [{"title": "a post", "selftext": "x" * 100, "score": 5}]
+    with StubServer(
+        num_items=500,
+        rejected_fraction=0.2,
+        shards_down_fraction=0.2,
+        templates=templates,
+    ) as server:
+        api = server.api(PushshiftAPI, limit_type=None, shards_down_behavior=None)
+        posts = list(api.search_submissions(since=server.since, until=server.until))
+        assert len(posts) == 500
+        assert all(post["title"] == "a post" and post["score"] == 5 for post in posts)
+        assert server.num_rejected > 0
+        assert server.num_shards_down > 0
+
+
+def test_scenarios():
+    names = [name for _, name, _, _ in suite.scenarios(["limit_type"])]
+    assert names[0] == "limit_type/limit_type=average"
+    assert len(names) == len(set(names)) == 5
+    with pytest.raises(ValueError):
+        list(suite.scenarios(["unknown"]))
+
+
+def test_run(tmp_path, capsys):
+    results = list(suite.run(["scheduler"], num_items=300, repeat=2, isolated=False))
+    assert [r["scenario"] for r in results] == [
+        "scheduler/scheduler=batch",
+        "scheduler/scheduler=stream",
+    ]
+    for result in results:
+        assert result["results"] == 300
+        assert result["requests_per_result"] == pytest.approx(
+            result["requests"] / 300, abs=1e-3
+        )
+        assert result["seconds"] > 0
+
+    # each scenario is run in a new process
+    output = tmp_path / "results.json"
+    main(["shards_down", "--num-items", "200", "--output", str(output)])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    with open(output) as handle:
+        saved = json.load(handle)
+    assert saved["environment"]["pmaw"]
+    assert [r["scenario"] for r in saved["results"]] == [
+        json.loads(line)["scenario"] for line in lines
+    ]
+
+
+def test_isolated_scenario():
+    server_settings = dict(suite.SERVER, num_items=200, latency=0, slow_fraction=0)
+    metrics = suite.run_scenario(server_settings, suite.API)
+    assert metrics["results"] == 200
+    assert metrics["peak_rss_mb"] is None or metrics["peak_rss_mb"] > 0
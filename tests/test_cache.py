@@ -1,7 +1,56 @@
+import pytest
 from pmaw import Cache
+from pmaw.utils.cache_formats import get_format
 
 
 def test_no_info():
     cache = Cache({}, False, cache_dir="./rand_cache")
     info = cache.load_info()
     assert info is None
+
+
+@pytest.mark.parametrize("cache_format", ["pickle.gz", "ndjson", "ndjson.gz"])
+def test_cache_format_round_trip(tmp_path, cache_format):
+    responses = [{"id": "abc", "created_utc": 1, "all_awardings": [{"name": "x"}]}]
+    cache = Cache({"q": "test"}, False, cache_dir=tmp_path, cache_format=cache_format)
+    cache.cache_responses(responses)
+    assert cache.response_cache[0].endswith(cache_format)
+    assert cache.load_resp(0) == responses
+
+
+def test_mixed_formats(tmp_path):
+    cache = Cache({"q": "test"}, False, cache_dir=tmp_path, cache_format="ndjson.gz")
+    cache.cache_responses([{"id": "a"}])
+    cache.format = get_format("pickle.gz")
+    cache.cache_responses([{"id": "b"}, {"id": "c"}])
+    cache.flush()
+
+    loaded = Cache.load_with_key(cache.key, cache_dir=tmp_path)
+    assert loaded.size == 3
+    chunks = sorted(loaded.response_cache)
+    assert [loaded.load_resp(loaded.response_cache.index(c)) for c in chunks] == [
+        [{"id": "a"}],
+        [{"id": "b"}, {"id": "c"}],
+    ]
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        Cache({}, False, cache_dir=tmp_path, cache_format="csv")
+
+
+@pytest.mark.parametrize(
+    "cache_format,module",
+    [("ndjson.zst", "zstandard"), ("ndjson.lz4", "lz4"), ("parquet", "pyarrow")],
+)
+def test_optional_formats(tmp_path, cache_format, module):
+    pytest.importorskip(module)
+    responses = [
+        {"id": "a", "edited": False, "all_awardings": []},
+        {"id": "b", "edited": 1629990795.0, "gildings": {"gid_1": 1}},
+    ]
+    cache = Cache({}, False, cache_dir=tmp_path, cache_format=cache_format)
+    cache.cache_responses(responses)
+    loaded = cache.load_resp(0)
+    # parquet reads fields missing from a response as None
+    assert [{k: v for k, v in r.items() if k in e} for r, e in zip(loaded, responses)] == responses
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+from pmaw import Cache, CacheReader, PushshiftAPI, Response
+from pmaw.bench import StubServer
+
+
+def cache_chunks(tmp_path, cache_format, sizes=(3, 4, 5)):
+    cache = Cache({"q": "test"}, False, cache_dir=tmp_path, cache_format=cache_format)
+    i = 0
+    for size in sizes:
+        cache.cache_responses([{"id": str(n), "n": n} for n in range(i, i + size)])
+        i += size
+    cache.flush()
+    return cache
+
+
+@pytest.mark.parametrize("cache_format", ["ndjson", "ndjson.gz", "pickle.gz"])
+def test_random_access(tmp_path, cache_format):
+    cache = cache_chunks(tmp_path, cache_format)
+    with CacheReader(cache, max_chunks=1) as reader:
+        assert len(reader) == 12
+        assert reader[0]["n"] == 0
+        assert reader[11]["n"] == 11
+        assert reader[-5]["n"] == 7
+        assert [r["n"] for r in reader[2:9:3]] == [2, 5, 8]
+        assert [r["n"] for r in reader] == list(range(12))
+        assert reader.get("6") == {"id": "6", "n": 6}
+        assert reader.get("missing") is None
+        with pytest.raises(IndexError):
+            reader[12]
+
+
+def test_offset_index(tmp_path):
+    cache = cache_chunks(tmp_path, "ndjson")
+    with CacheReader(cache) as reader:
+        assert reader[4]["n"] == 4
+    index_path = f"{tmp_path}/{cache.response_cache[1]}.idx"
+    assert os.path.exists(index_path)
+
+    with open(index_path, "rb") as handle:
+        # an offset for each of the 4 lines, and the end of the chunk
+        assert len(handle.read()) == 5 * 8
+
+    with CacheReader.load_with_key(cache.key, cache_dir=tmp_path) as reader:
+        assert [r["n"] for r in reader[3:7]] == [3, 4, 5, 6]
+
+
+def test_mappings_evicted(tmp_path):
+    cache = cache_chunks(tmp_path, "ndjson", sizes=(2,) * 10)
+    with CacheReader(cache, max_chunks=2) as reader:
+        mapped = []
+        for i in range(0, 20, 2):
+            reader[i]
+            mapped.append(reader._loaded[i // 2])
+        assert [r["n"] for r in reader] == list(range(20))
+        # only the most recently used chunks stay mapped
+        assert len(reader._loaded) == 2
+        assert all(chunk._map.closed for chunk in mapped[:-2])
+
+
+def test_id_index(tmp_path):
+    cache = cache_chunks(tmp_path, "ndjson")
+    with CacheReader(cache) as reader:
+        assert reader.get("5") == {"id": "5", "n": 5}
+        # chunks after the match arent read
+        assert sorted(reader._ids) == [0, 1]
+    with open(f"{tmp_path}/{cache.response_cache[1]}.ids") as handle:
+        assert handle.read() == '["3", "4", "5", "6"]'
+
+    with CacheReader.load_with_key(cache.key, cache_dir=tmp_path) as reader:
+        # ids are read from the saved index, without mapping the chunk
+        assert reader._chunk_ids(1) == {"3": 0, "4": 1, "5": 2, "6": 3}
+        assert len(reader._loaded) == 0
+        assert reader.get("11") == {"id": "11", "n": 11}
+
+
+def test_response_reader(tmp_path):
+    with StubServer(num_items=500) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        posts = api.search_submissions(
+            since=server.since,
+            until=server.until,
+            mem_safe=True,
+            cache_dir=tmp_path,
+            cache_format="ndjson",
+        )
+        reader = posts.reader()
+        ids = [post["id"] for post in posts]
+        assert len(reader) == len(ids) == 500
+        assert [post["id"] for post in reader] == ids
+        assert reader.get(ids[250]) == reader[250]
+
+    with pytest.raises(ValueError):
+        Response().reader()
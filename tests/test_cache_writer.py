@@ -0,0 +1,58 @@
+import os
+import threading
+
+import pytest
+from pmaw import Cache, PushshiftAPI, Response
+from pmaw.CacheWriter import CacheWriter
+from pmaw.bench import StubServer
+
+
+def test_writes_in_background(tmp_path):
+    written = threading.Event()
+    release = threading.Event()
+
+    def write(path, data):
+        release.wait()
+        with open(path, "w") as handle:
+            handle.write(data)
+        written.set()
+
+    writer = CacheWriter()
+    writer.submit(write, str(tmp_path / "chunk"), "data")
+    # submit returns before the chunk is written
+    assert not written.is_set()
+    release.set()
+    writer.close()
+    assert (tmp_path / "chunk").read_text() == "data"
+    assert os.listdir(tmp_path) == ["chunk"]
+
+
+def test_write_error(tmp_path):
+    def write(path, data):
+        raise OSError("disk full")
+
+    writer = CacheWriter()
+    writer.submit(write, str(tmp_path / "chunk"), "data")
+    with pytest.raises(OSError):
+        writer.flush()
+    assert os.listdir(tmp_path) == []
+
+
+def test_load_waits_for_writes(tmp_path):
+    cache = Cache({}, False, cache_dir=tmp_path)
+    responses = [{"id": str(i)} for i in range(1000)]
+    cache.cache_responses(responses)
+    assert cache.load_resp(0) == responses
+
+
+def test_mem_safe_search(tmp_path):
+    with StubServer(num_items=3000) as server:
+        api = server.api(PushshiftAPI, limit_type=None, file_checkpoint=1)
+        posts = api.search_submissions(
+            since=server.since, until=server.until, mem_safe=True, cache_dir=tmp_path
+        )
+        assert len(posts) == 3000
+        assert len(posts._cache.response_cache) > 1
+
+        cached = Response.load_cache(posts._cache.key, cache_dir=tmp_path)
+        assert len(set(post["id"] for post in cached)) == 3000
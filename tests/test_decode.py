@@ -0,0 +1,36 @@
+import json
+
+import pytest
+from pmaw import PushshiftAPI
+from pmaw.bench import StubServer
+from pmaw.utils import decode
+from pmaw.utils.decode import DECODERS, get_decoder
+
+body = json.dumps({"data": [{"id": "a", "title": "café \U0001f600"}], "metadata": {}})
+
+
+@pytest.mark.parametrize("name", DECODERS)
+def test_decoders(name):
+    try:
+        loads = get_decoder(name)
+    except ImportError:
+        pytest.skip(f"{name} isnt installed")
+    assert loads(body.encode("utf-8")) == json.loads(body)
+
+
+def test_fallback(monkeypatch):
+    for name in ("orjson", "simdjson", "ujson"):
+        monkeypatch.setattr(decode, name, None)
+    assert get_decoder() is json.loads
+    with pytest.raises(ImportError):
+        get_decoder("orjson")
+    with pytest.raises(ValueError):
+        get_decoder("yaml")
+
+
+@pytest.mark.parametrize("json_decoder", [None, "json"])
+def test_search(json_decoder):
+    with StubServer(num_items=500) as server:
+        api = server.api(PushshiftAPI, limit_type=None, json_decoder=json_decoder)
+        posts = api.search_submissions(since=server.since, until=server.until)
+        assert len(posts) == 500
@@ -0,0 +1,85 @@
+import pytest
+from pmaw import PushshiftAPI
+from pmaw.Request import Request
+from pmaw.bench import StubServer
+from pmaw.utils.dedup import BloomFilter, Deduplicator, IdSet, get_dedup, id_key
+
+
+def test_id_key():
+    assert id_key({"id": "zz"}) == 36 * 36 - 1
+    assert id_key("t3_abc") == "t3_abc"
+    assert id_key({"title": "no id"}) is None
+    # only ascii alphanumeric ids are decoded from base36
+    assert id_key("ab½") == "ab½"
+
+
+def test_bloom_capacity_from_limit():
+    assert get_dedup("bloom", limit=1000000).capacity == 2000000
+    assert get_dedup("bloom", limit=10).capacity == 100000
+    assert get_dedup("bloom").capacity == 10000000
+
+
+@pytest.mark.parametrize("dedup", [IdSet(), BloomFilter(capacity=1000)])
+def test_remove_duplicates(dedup):
+    assert dedup.remove_duplicates([{"id": "a"}, {"id": "b"}, {"id": "a"}]) == [
+        {"id": "a"},
+        {"id": "b"},
+    ]
+    assert dedup.remove_duplicates([{"id": "b"}, {"id": "c"}, {}]) == [{"id": "c"}, {}]
+    assert dedup.num_duplicates == 2
+
+
+def test_bloom_error_rate():
+    bloom = BloomFilter(capacity=10000, error_rate=1e-3)
+    new = sum(bloom.add(key) for key in range(10000))
+    # a few new keys may be reported as already seen
+    assert new > 9950
+
+
+def test_incomplete_deduplicator():
+    class Incomplete(Deduplicator):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_unknown_dedup():
+    with pytest.raises(ValueError):
+        get_dedup("list")
+
+
+def test_dedup_before_limit():
+    req = Request({"limit": 3}, None, "submission", 100, 500, False, False, dedup=True)
+    req.save_resp([{"id": "a"}, {"id": "b"}])
+    req.save_resp([{"id": "b"}, {"id": "c"}])
+    assert req.limit == 0
+    assert [r["id"] for r in req.resp.responses] == ["a", "b", "c"]
+
+
+def test_resume_with_dedup(tmp_path):
+    with StubServer(num_items=2000) as server:
+        api = server.api(PushshiftAPI, limit_type=None, file_checkpoint=1)
+        kwargs = dict(
+            since=server.since,
+            until=server.until,
+            safe_exit=True,
+            cache_dir=tmp_path,
+            dedup=True,
+        )
+
+        calls = []
+
+        def crash(item):
+            calls.append(item)
+            if len(calls) > 1000:
+                raise KeyboardInterrupt
+            return True
+
+        with pytest.raises(KeyboardInterrupt):
+            api.search_submissions(filter_fn=crash, **kwargs)
+
+        posts = api.search_submissions(**kwargs)
+        assert len(set(post["id"] for post in posts)) == 2000
+        # ids retrieved before the crash were loaded from the cache
+        assert len(api.req._dedup) == 2000
@@ -0,0 +1,77 @@
+from pmaw import PushshiftAPI
+from pmaw.DensityIndex import DensityIndex
+from pmaw.bench import StubServer
+
+
+def test_record_and_lookup(tmp_path):
+    index = DensityIndex({"subreddit": "science"}, "submission", tmp_path)
+    index.record(100, 200, 50)
+    # only the unrecorded parts of a wider range are updated
+    index.record(0, 300, 100)
+    assert index.intervals == [[0, 100, 25.0], [100, 200, 50], [200, 300, 25.0]]
+    assert index.lookup(50, 350) == [
+        (50, 100, 12.5),
+        (100, 200, 50.0),
+        (200, 300, 25.0),
+        (300, 350, None),
+    ]
+
+
+def test_refine(tmp_path):
+    index = DensityIndex({}, "submission", tmp_path)
+    index.record(0, 100, 100)
+    index.record(0, 10, 90)
+    assert index.intervals == [[0, 10, 90], [10, 100, 10.0]]
+
+
+def test_key_ignores_range(tmp_path):
+    index = DensityIndex({"q": "a", "since": 1, "until": 2}, "comment", tmp_path)
+    index.record(0, 100, 10)
+    index.save()
+
+    loaded = DensityIndex({"q": "a", "until": 5, "limit": 10}, "comment", tmp_path)
+    assert loaded.intervals == [[0, 100, 10]]
+    assert DensityIndex({"q": "a"}, "submission", tmp_path).intervals == []
+
+
+def test_merge(tmp_path):
+    index = DensityIndex({}, "submission", tmp_path, max_intervals=4)
+    for i in range(5):
+        index.record(i * 10, i * 10 + 10, 1)
+    assert len(index.intervals) <= 4
+    assert sum(c for _, _, c in index.intervals) == 5
+
+
+def test_reuse_across_searches(tmp_path):
+    with StubServer(num_items=5000, burst_fraction=0.8) as server:
+        requests = []
+        for _ in range(2):
+            api = server.api(
+                PushshiftAPI, limit_type=None, slice_planner="density", index_dir=tmp_path
+            )
+            start = server.num_requests
+            posts = api.search_submissions(since=server.since, until=server.until)
+            assert len(posts) > 4900
+            requests.append(server.num_requests - start)
+
+        # the second search plans its slices from the index
+        assert api.num_probes == 0
+        assert requests[1] < requests[0]
+
+
+def test_stale_index(tmp_path):
+    # results are only posted in short bursts when the index is recorded
+    with StubServer(num_items=500, burst_fraction=1.0) as server:
+        api = server.api(
+            PushshiftAPI, limit_type=None, slice_planner="density", index_dir=tmp_path
+        )
+        posts = api.search_submissions(since=server.since, until=server.until)
+        assert len(posts) == 500
+    assert any(count == 0 for _, _, count in api._density_index.intervals)
+
+    # results are later found across the whole window, including ranges the index has as empty
+    with StubServer(num_items=2000) as server:
+        api = server.api(PushshiftAPI, limit_type=None, index_dir=tmp_path)
+        posts = api.search_submissions(since=server.since, until=server.until)
+        assert api.num_probes == 0
+        assert len(posts) == 2000
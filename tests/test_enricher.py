@@ -0,0 +1,115 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from praw.exceptions import RedditAPIException
+from pmaw import PushshiftAPI
+from pmaw.Enricher import Enricher
+from pmaw.bench import StubServer
+from pmaw.utils.enrich import get_projection
+
+
+class FakeReddit:
+    def __init__(self, fail_once=False):
+        self.calls = []
+        self.fail_once = fail_once
+        self._lock = threading.Lock()
+
+    def info(self, fullnames):
+        with self._lock:
+            self.calls.append(list(fullnames))
+            if self.fail_once:
+                self.fail_once = False
+                raise RedditAPIException([["RATELIMIT", "try again", None]])
+        return [SimpleNamespace(id=name[3:], name=name) for name in fullnames]
+
+
+def test_enrich_batches():
+    reddit = FakeReddit()
+    enriched = []
+    enricher = Enricher(reddit, enriched.extend, num_workers=2, rate_limit=6000)
+    enricher.put([f"t3_{i}" for i in range(250)])
+    enricher.join()
+    enricher.close()
+
+    assert sorted(item["id"] for item in enriched) == sorted(str(i) for i in range(250))
+    assert all(len(call) <= 100 for call in reddit.calls)
+    assert len(enricher) == 0
+
+
+def test_retry_failed_batch():
+    reddit = FakeReddit(fail_once=True)
+    enriched = []
+    enricher = Enricher(reddit, enriched.extend, rate_limit=6000)
+    enricher.put(["t1_a", "t1_b"])
+    enricher.join()
+    enricher.close()
+    assert sorted(item["id"] for item in enriched) == ["a", "b"]
+
+
+def test_callback_error():
+    def fail(items):
+        raise ValueError("filter failed")
+
+    enricher = Enricher(FakeReddit(), fail, rate_limit=6000)
+    enricher.put(["t3_a"])
+    with pytest.raises(ValueError):
+        enricher.join()
+    enricher.close()
+
+
+def test_search_with_enrichment():
+    reddit = FakeReddit()
+    with StubServer(num_items=1500) as server:
+        api = server.api(
+            PushshiftAPI, limit_type=None, praw=reddit, enrich_rate_limit=6000
+        )
+        posts = api.search_submissions(
+            since=server.since,
+            until=server.until,
+            limit=1200,
+            filter_fn=lambda item: int(item["id"], 36) % 2 == 0,
+        )
+        posts = list(posts)
+
+    assert sum(len(call) for call in reddit.calls) == 1200
+    assert all(item["name"].startswith("t3_") for item in posts)
+    assert all(int(item["id"], 36) % 2 == 0 for item in posts)
+
+
+class FakeRedditor:
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+
+def test_projection():
+    obj = SimpleNamespace(
+        id="a", score=5, author=FakeRedditor("spez"), _reddit=object(), tags=["x"]
+    )
+    assert get_projection(["id", "author", "tags", "missing"])(obj) == {
+        "id": "a",
+        "author": "spez",
+        "tags": ["x"],
+        "missing": None,
+    }
+    project = get_projection({"post": "id", "double": lambda o: o.score * 2})
+    assert project(obj) == {"post": "a", "double": 10}
+    assert get_projection(None)(obj) is vars(obj)
+
+
+def test_search_with_fields():
+    with StubServer(num_items=300) as server:
+        api = server.api(
+            PushshiftAPI,
+            limit_type=None,
+            praw=FakeReddit(),
+            enrich_rate_limit=6000,
+            praw_fields=["id"],
+        )
+        posts = list(api.search_submissions(since=server.since, until=server.until))
+
+    assert len(posts) == 300
+    assert all(list(post) == ["id"] for post in posts)
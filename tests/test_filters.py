@@ -0,0 +1,70 @@
+import pytest
+from pmaw import PushshiftAPI
+from pmaw.bench import StubServer
+from pmaw.utils.filter import compile_filters
+
+items = [
+    {"id": "a", "score": 5, "subreddit": "science", "body": "Quantum physics"},
+    {"id": "b", "score": 15, "subreddit": "aww", "body": "a cat"},
+    {"id": "c", "score": 25, "subreddit": "science", "body": None},
+    {"id": "d", "subreddit": "programming"},
+]
+
+
+def ids(results):
+    return [item["id"] for item in results]
+
+
+def test_comparisons():
+    assert ids(compile_filters({"score": (">", 10)})(items)) == ["b", "c"]
+    assert ids(compile_filters({"score": [(">=", 5), ("<", 25)]})(items)) == ["a", "b"]
+    assert ids(compile_filters({"score": ("!=", 5)})(items)) == ["b", "c", "d"]
+    assert ids(compile_filters({"subreddit": "science"})(items)) == ["a", "c"]
+
+
+def test_membership_and_text():
+    assert ids(compile_filters({"subreddit": ("in", ["aww", "programming"])})(items)) == [
+        "b",
+        "d",
+    ]
+    assert ids(compile_filters({"body": ("regex", "(?i)quantum")})(items)) == ["a"]
+    assert ids(compile_filters({"body": ("contains", "cat")})(items)) == ["b"]
+    assert ids(compile_filters({"score": ("exists", False)})(items)) == ["d"]
+
+
+def test_invalid_filters():
+    with pytest.raises(ValueError):
+        compile_filters({"score": ("~", 1)})
+    with pytest.raises(ValueError):
+        compile_filters({"score": [5]})
+    with pytest.raises(ValueError):
+        compile_filters([("score", ">", 5)])
+
+
+def test_search_with_filters():
+    with StubServer(num_items=1000) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        posts = api.search_submissions(
+            since=server.since,
+            until=server.until,
+            filters={"score": (">=", 50), "subreddit": ("in", ["science", "aww"])},
+            filter_fn=lambda item: item["score"] % 2 == 0,
+        )
+        posts = list(posts)
+        everything = list(
+            api.search_submissions(since=server.since, until=server.until)
+        )
+
+    expected = [
+        post["id"]
+        for post in everything
+        if post["score"] >= 50
+        and post["subreddit"] in ("science", "aww")
+        and post["score"] % 2 == 0
+    ]
+    assert sorted(ids(posts)) == sorted(expected)
+
+
+def test_uncomparable_values():
+    results = [{"id": "a", "score": None}, {"id": "b", "score": 20}, {"id": "c"}]
+    assert ids(compile_filters({"score": (">", 10)})(results)) == ["b"]
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+from pmaw import PushshiftAPI
+from pmaw.Journal import Journal
+from pmaw.bench import StubServer
+
+
+def slice_(since, until):
+    return ("url", {"since": since, "until": until})
+
+
+def test_replay(tmp_path):
+    journal = Journal(tmp_path, "key")
+    assert journal.load() is None
+
+    journal.checkpoint(
+        [slice_(0, 10), slice_(10, 20)], [], [("1-key-5.pickle.gz", 5)], {"q": 1}, 100
+    )
+    journal.checkpoint([slice_(5, 10)], [(slice_(0, 10), 100)], [], {"q": 1}, 0)
+
+    state = Journal(tmp_path, "key").load()
+    assert state["req_list"] == [slice_(10, 20), slice_(5, 10)]
+    assert state["chunks"] == [("1-key-5.pickle.gz", 5)]
+    assert state["limit"] == 0
+    assert list(state["completed"].values()) == [100]
+
+
+def test_incomplete_record(tmp_path):
+    journal = Journal(tmp_path, "key")
+    journal.checkpoint([slice_(0, 10)], [], [], {}, 100)
+    with open(journal.log_path, "a") as handle:
+        handle.write('{"seq": 2, "added"')
+
+    state = Journal(tmp_path, "key").load()
+    assert state["req_list"] == [slice_(0, 10)]
+
+
+def test_compact(tmp_path):
+    journal = Journal(tmp_path, "key", compact_every=2)
+    journal.checkpoint([slice_(0, 10), slice_(10, 20)], [], [], {}, 100)
+    journal.checkpoint([], [(slice_(0, 10), 50)], [], {}, 50)
+    assert os.path.getsize(journal.log_path) == 0
+
+    journal.checkpoint([], [(slice_(10, 20), 50)], [], {}, 0)
+    resumed = Journal(tmp_path, "key")
+    state = resumed.load()
+    assert state["req_list"] == []
+    assert state["limit"] == 0
+    assert resumed.seq == 3
+
+
+def test_resume_after_crash(tmp_path):
+    with StubServer(num_items=3000) as server:
+        api = server.api(PushshiftAPI, limit_type=None, file_checkpoint=1)
+        kwargs = dict(
+            since=server.since, until=server.until, safe_exit=True, cache_dir=tmp_path
+        )
+
+        calls = []
+
+        def crash(item):
+            calls.append(item)
+            if len(calls) > 1000:
+                raise KeyboardInterrupt
+            return True
+
+        with pytest.raises(KeyboardInterrupt):
+            api.search_submissions(filter_fn=crash, **kwargs)
+        crashed = server.num_requests
+
+        posts = api.search_submissions(**kwargs)
+        ids = [post["id"] for post in posts]
+        assert len(ids) == len(set(ids)) == 3000
+        resumed = server.num_requests - crashed
+
+        api.search_submissions(since=server.since, until=server.until)
+        full = server.num_requests - crashed - resumed
+        # completed requests arent repeated
+        assert resumed < full
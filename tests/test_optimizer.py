@@ -0,0 +1,78 @@
+from pmaw import PushshiftAPI
+from pmaw.bench import StubServer
+from pmaw.utils.dedup import IdSet
+from pmaw.utils.optimizer import fn_fields, optimize_query, pushdown
+
+
+def helper(item):
+    return True
+
+
+def test_fn_fields():
+    assert fn_fields(lambda item: item["score"] > 2 and item.get("author") != "x") == {
+        "score",
+        "author",
+    }
+    # the item is passed on, or used as a whole
+    assert fn_fields(lambda item: helper(item)) is None
+    assert fn_fields(lambda item: "score" in item) is None
+    assert fn_fields(lambda item: [item[k] for k in ("score",)]) is None
+    assert fn_fields(helper) == set()
+
+
+def test_pushdown():
+    filters = {
+        "score": [(">=", 10), ("<", 50)],
+        "subreddit": ("in", ["science", "aww"]),
+        "author": ("regex", "^user1"),
+        "num_comments": (">", 1.5),
+    }
+    assert pushdown(filters) == {"score": ">9", "subreddit": "aww,science"}
+
+
+def test_optimize_query():
+    payload = {"filter": "id,title", "subreddit": "all"}
+    optimize_query(
+        payload,
+        filters={"subreddit": "science", "score": ("<=", 5)},
+        filter_fn=lambda item: item["author"] != "x",
+        dedup=True,
+    )
+    assert payload == {
+        "filter": ["id", "title", "author", "score", "subreddit"],
+        # parameters set by the user arent replaced
+        "subreddit": "all",
+        "score": "<6",
+    }
+
+
+def test_optimize_query_dedup():
+    # an empty IdSet still needs ids
+    assert optimize_query({"filter": ["title"]}, dedup=IdSet()) == {
+        "filter": ["title", "id"]
+    }
+    assert optimize_query({"filter": ["title"]}, dedup=False) == {"filter": ["title"]}
+
+
+def test_search_pushdown():
+    filters = {"score": (">", 80), "subreddit": "science"}
+    kwargs = dict(filter=["id"], filters=filters, filter_fn=lambda item: item["author"])
+    with StubServer(num_items=2000) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        posts = api.search_submissions(
+            since=server.since, until=server.until, optimize=False, **kwargs
+        )
+        # without the fields used by the filters nothing matches
+        assert len(posts) == 0
+        unoptimized = server.bytes_sent
+
+        posts = api.search_submissions(since=server.since, until=server.until, **kwargs)
+        optimized = server.bytes_sent - unoptimized
+
+        expected = [
+            item["id"]
+            for item in server.items
+            if item["score"] > 80 and item["subreddit"] == "science"
+        ]
+    assert sorted(post["id"] for post in posts) == sorted(expected)
+    assert optimized < unoptimized / 2
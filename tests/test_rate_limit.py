@@ -0,0 +1,124 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pmaw import RateLimit, PushshiftAPI
+
+
+def test_token_bucket_burst():
+    rl = RateLimit(rate_limit=60, limit_type="token_bucket", burst=3)
+    delays = [rl.delay() for _ in range(5)]
+    assert delays[:3] == [0, 0, 0]
+    # remaining requests are reserved one second apart at 60 requests per minute
+    assert delays[3] == pytest.approx(1, abs=0.05)
+    assert delays[4] == pytest.approx(2, abs=0.05)
+
+
+def test_sliding_window():
+    rl = RateLimit(rate_limit=3, limit_type="sliding_window")
+    delays = [rl.delay() for _ in range(4)]
+    assert delays[:3] == [0, 0, 0]
+    assert delays[3] == pytest.approx(60, abs=0.05)
+    assert len(rl.cache) == 4
+
+
+def test_sliding_window_float_rate():
+    rl = RateLimit(rate_limit=2.5, limit_type="sliding_window")
+    delays = [rl.delay() for _ in range(4)]
+    assert delays[:3] == [0, 0, 0]
+    assert delays[3] == pytest.approx(60, abs=0.05)
+
+
+def test_concurrent_reservations_token_bucket():
+    rl = RateLimit(rate_limit=600, limit_type="token_bucket", burst=1)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        delays = sorted(executor.map(lambda _: rl.delay(), range(100)))
+    # each request gets its own slot, 0.1s apart at 600 requests per minute
+    for i in range(1, 100):
+        assert delays[i] - delays[i - 1] == pytest.approx(0.1, abs=0.05)
+
+
+def test_concurrent_reservations_sliding_window():
+    rl = RateLimit(rate_limit=10, limit_type="sliding_window")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        delays = sorted(executor.map(lambda _: rl.delay(), range(50)))
+    # each request gets its own slot, 10 requests start in each 60s window
+    for i in range(50):
+        assert delays[i] == pytest.approx(60 * (i // 10), abs=0.05)
+    starts = sorted(rl.cache)
+    assert len(starts) == 50
+    for i in range(10, 50):
+        assert starts[i] - starts[i - 10] > 60 - 1e-6
+
+
+def test_average_evicts_old_requests():
+    rl = RateLimit(rate_limit=60)
+    rl.cache.extend([0, 1, 2])
+    assert rl.delay() == 0
+    assert len(rl.cache) == 1
+
+
+def test_shared_rate_limiter():
+    rl = RateLimit(limit_type="token_bucket")
+    api_a = PushshiftAPI(rate_limiter=rl)
+    api_b = PushshiftAPI(rate_limiter=rl)
+    assert api_a._rate_limit is api_b._rate_limit
+
+
+def test_invalid_limit_type():
+    with pytest.raises(ValueError):
+        RateLimit(limit_type="leaky")
+
+
+def test_adaptive_increase():
+    rl = RateLimit(rate_limit=60, limit_type="adaptive", additive_increase=6)
+    for _ in range(60):
+        rl._req_success(0.1)
+    # roughly 6 requests per minute are added for each minute of requests
+    assert 65 < rl.current_rate < 67
+
+
+def test_adaptive_decrease():
+    rl = RateLimit(rate_limit=60, limit_type="adaptive", min_rate=20)
+    rl._req_fail(overloaded=True)
+    assert rl.current_rate == 30
+    # concurrent failures only back off once
+    rl._req_fail(overloaded=True)
+    assert rl.current_rate == 30
+    rl.last_decrease = 0
+    rl._req_fail(overloaded=True)
+    assert rl.current_rate == 20
+    rl.last_decrease = 0
+    rl._req_fail(overloaded=False)
+    assert rl.current_rate == 20
+
+
+def test_adaptive_holds_when_slow():
+    rl = RateLimit(rate_limit=60, limit_type="adaptive")
+    rl._req_success(0.1)
+    rate = rl.current_rate
+    for _ in range(10):
+        rl._req_success(2)
+    assert rl.current_rate - rate < 0.2
+
+
+def test_retry_after():
+    rl = RateLimit(rate_limit=6000, limit_type="token_bucket")
+    rl._req_fail(retry_after=2)
+    assert rl.delay() == pytest.approx(2, abs=0.05)
+
+
+def test_adaptive_search():
+    from pmaw.bench import StubServer
+
+    with StubServer(num_items=2000, capacity=20, retry_after=0.5) as server:
+        api = server.api(PushshiftAPI, limit_type="adaptive", rate_limit=3000)
+        posts = api.search_submissions(since=server.since, until=server.until)
+        assert len(posts) == 2000
+        assert server.num_rejected > 0
+        assert api._rate_limit.current_rate < 3000
+
+
+def test_retry_after_header():
+    assert PushshiftAPI._retry_after("3") == 3
+    assert PushshiftAPI._retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert PushshiftAPI._retry_after("soon") is None
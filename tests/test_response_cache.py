@@ -0,0 +1,71 @@
+import time
+
+from pmaw import PushshiftAPI
+from pmaw.ResponseCache import ResponseCache
+from pmaw.bench import StubServer
+
+
+def test_get_set(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    assert cache.get("url", {"a": 1}) is None
+    cache.set("url", {"a": 1, "b": [1, 2]}, b"body")
+    # parameter order doesnt matter
+    assert cache.get("url", {"b": [1, 2], "a": 1}) == b"body"
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_ttl(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=0.05)
+    cache.set("url", {}, "body")
+    time.sleep(0.1)
+    assert cache.get("url", {}) is None
+    assert cache.size == 0
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_size=100)
+    for i in range(20):
+        cache.set("url", {"i": i}, b"body" * i)
+        # keep the first response recently used
+        cache.get("url", {"i": 0})
+    assert cache.size <= 100
+    assert cache.get("url", {"i": 0}) == b""
+    assert cache.get("url", {"i": 1}) is None
+
+
+def test_persisted(tmp_path):
+    ResponseCache(tmp_path / "responses.sqlite").set("url", {}, "body")
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    # str bodies are encoded
+    assert cache.get("url", {}) == b"body"
+    assert cache.size > 0
+
+
+def test_search_served_from_cache(tmp_path):
+    with StubServer(num_items=2000) as server:
+        for _ in range(2):
+            api = server.api(
+                PushshiftAPI,
+                limit_type=None,
+                response_cache=tmp_path / "responses.sqlite",
+            )
+            start = server.num_requests
+            posts = api.search_submissions(since=server.since, until=server.until)
+            assert len(posts) == 2000
+        assert server.num_requests == start
+        assert api._response_cache.misses == 0
+
+
+def test_shards_down_not_cached(tmp_path):
+    with StubServer(num_items=500, shards_down_fraction=1.0) as server:
+        api = server.api(
+            PushshiftAPI,
+            limit_type=None,
+            shards_down_behavior=None,
+            response_cache=tmp_path / "responses.sqlite",
+        )
+        posts = api.search_submissions(since=server.since, until=server.until)
+        assert len(posts) == 500
+        # responses which may be incomplete are requested again by later searches
+        assert api._response_cache.size == 0
@@ -0,0 +1,52 @@
+from pmaw import PushshiftAPI
+from pmaw.bench import StubServer
+from pmaw.types.exceptions import HTTPServerError
+
+
+def test_get_result(tmp_path):
+    with StubServer(num_items=300) as server:
+        api = server.api(
+            PushshiftAPI, limit_type=None, response_cache=tmp_path / "responses.sqlite"
+        )
+        url = api.base_url.format(endpoint="reddit/submission/search")
+        payload = {"since": server.since, "until": server.until, "size": 100}
+
+        res = api._get(url, payload)
+        assert len(res.data) == 100
+        assert res.total_results == 300
+        assert res.status == 200
+        assert res.latency > 0
+        assert not res.cached
+        assert api._get(url, payload).cached
+
+
+def test_concurrency_doesnt_change_slicing():
+    requests = []
+    for num_workers in (1, 30):
+        with StubServer(num_items=5000, slow_fraction=0.3, slow_latency=0.01) as server:
+            api = server.api(
+                PushshiftAPI, limit_type=None, num_workers=num_workers, batch_size=10
+            )
+            posts = api.search_submissions(since=server.since, until=server.until)
+            ids = [post["id"] for post in posts]
+            assert len(ids) == len(set(ids)) == 5000
+            requests.append(server.num_requests)
+    # each slice is split using its own total, regardless of the order requests complete in
+    assert requests[0] == requests[1]
+
+
+def test_count_request_retried():
+    with StubServer(num_items=500) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        get = api._get
+        calls = []
+
+        def fail_first(url, payload={}):
+            calls.append(payload)
+            if len(calls) == 1:
+                raise HTTPServerError("HTTP 503 - Service Unavailable")
+            return get(url, payload)
+
+        api._get = fail_first
+        posts = api.search_submissions(since=server.since, until=server.until)
+        assert len(posts) == 500
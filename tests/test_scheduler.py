@@ -0,0 +1,36 @@
+import pytest
+from pmaw import PushshiftAPI
+from pmaw.bench import StubServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubServer(num_items=3000, slow_latency=0.05, slow_fraction=0.2) as server:
+        yield server
+
+
+@pytest.mark.parametrize("scheduler", ["batch", "stream"])
+def test_all_results(server, scheduler):
+    api = server.api(PushshiftAPI, limit_type=None, scheduler=scheduler)
+    posts = api.search_submissions(since=server.since, until=server.until)
+    ids = [post["id"] for post in posts]
+    assert len(ids) == 3000 and len(set(ids)) == 3000
+
+
+@pytest.mark.parametrize("scheduler", ["batch", "stream"])
+def test_limit(server, scheduler):
+    api = server.api(PushshiftAPI, limit_type=None, scheduler=scheduler)
+    posts = api.search_submissions(since=server.since, until=server.until, limit=250)
+    assert len(posts) == 250
+
+
+def test_checkpoints(server):
+    api = server.api(PushshiftAPI, limit_type=None, batch_size=5)
+    api.search_submissions(since=server.since, until=server.until)
+    # the final partial batch ends once the limit is reached
+    assert api.num_req // 5 - 1 <= api.num_batches <= api.num_req // 5
+
+
+def test_invalid_scheduler():
+    with pytest.raises(ValueError):
+        PushshiftAPI(scheduler="lockstep")
@@ -0,0 +1,95 @@
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import pytest
+import requests
+from pmaw import PushshiftAPI
+from pmaw.SessionPool import SessionPool
+from pmaw.bench import StubServer
+
+
+class ThreadingServer(socketserver.ThreadingMixIn, HTTPServer):
+    # ThreadingHTTPServer needs python 3.7
+    daemon_threads = True
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = b'{"data": []}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+def test_connection_reuse(server_url):
+    pool = SessionPool(pool_size=2)
+    for _ in range(5):
+        pool.get(server_url)
+    stats = pool.stats
+    assert stats["sessions"] == 1
+    assert stats["requests"] == 5 and stats["connections"] == 1
+    assert stats["reused"] == 4
+
+
+def test_session_per_thread(server_url):
+    pool = SessionPool(pool_size=2)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda _: pool.get(server_url), range(10)))
+    assert pool.stats["requests"] == 10
+    assert pool.stats["sessions"] <= 2
+
+
+def test_reuse_after_thread_exits(server_url):
+    pool = SessionPool(pool_size=2)
+    for _ in range(3):
+        # each pass of a search uses new worker threads
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(pool.get, server_url).result()
+    stats = pool.stats
+    assert stats["sessions"] == 1 and stats["connections"] == 1
+    assert stats["reused"] == 2
+
+
+def test_search_keeps_sessions_open():
+    with StubServer(num_items=1000) as server:
+        api = server.api(PushshiftAPI, limit_type=None, num_workers=2)
+        api.search_submissions(since=server.since, until=server.until, limit=900)
+        # the count request and every batch share the sessions of the search
+        stats = api.pool_stats
+        assert stats["sessions"] == 2
+        assert stats["connections"] <= 2
+
+
+def test_stats_after_close(server_url):
+    pool = SessionPool()
+    pool.get(server_url)
+    pool.close()
+    pool.get(server_url)
+    stats = pool.stats
+    assert stats["sessions"] == 2 and stats["requests"] == 2
+
+
+def test_timeout():
+    pool = SessionPool(connect_timeout=0.5, read_timeout=0.5)
+    server = ThreadingServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    # server never accepts the request, so reading the response times out
+    with pytest.raises(requests.Timeout):
+        pool.get(f"http://127.0.0.1:{server.server_address[1]}/")
+    server.server_close()
@@ -0,0 +1,88 @@
+import pytest
+from pmaw import PushshiftAPI, RateLimit
+from pmaw.Cache import Cache
+from pmaw.bench import StubServer
+
+
+def popular(item):
+    # module level so that it can be sent to other processes
+    return item["score"] > 50
+
+
+def test_sharded_search(tmp_path):
+    with StubServer(num_items=3000) as server:
+        kwargs = dict(since=server.since, until=server.until, filter_fn=popular)
+        api = server.api(PushshiftAPI, limit_type=None)
+        expected = sorted(post["id"] for post in api.search_submissions(**kwargs))
+
+        api = server.api(PushshiftAPI, limit_type=None, num_processes=3)
+        posts = api.search_submissions(cache_dir=tmp_path, **kwargs)
+        assert len(posts) == len(expected)
+        assert sorted(post["id"] for post in posts) == expected
+
+
+def test_sharded_limit(tmp_path):
+    with StubServer(num_items=3000) as server:
+        api = server.api(PushshiftAPI, limit_type=None, num_processes=3)
+        posts = api.search_submissions(
+            since=server.since, until=server.until, limit=1500, cache_dir=tmp_path
+        )
+        ids = [post["id"] for post in posts]
+        assert len(ids) == len(set(ids)) == 1500
+
+
+def test_sharded_sliding_window(tmp_path):
+    with StubServer(num_items=1000) as server:
+        api = server.api(
+            PushshiftAPI, limit_type="sliding_window", rate_limit=1000, num_processes=3
+        )
+        # shares of the rate limit are whole requests per minute
+        assert api._shard_config()["rate_limit"] == 333
+        posts = api.search_submissions(
+            since=server.since, until=server.until, cache_dir=tmp_path
+        )
+        assert len(posts) == 1000
+
+
+def test_sharded_invalid(tmp_path):
+    api = PushshiftAPI(num_processes=2, rate_limiter=RateLimit())
+    with pytest.raises(ValueError):
+        api.search_submissions(since=0, until=100)
+    with pytest.raises(ValueError):
+        PushshiftAPI(num_processes=2).search_comments(since=0, until=100, stream=True)
+    with pytest.raises(ValueError, match="top level"):
+        PushshiftAPI(num_processes=2).search_comments(
+            since=0, until=100, filter_fn=lambda item: True
+        )
+    with pytest.raises(ValueError):
+        PushshiftAPI(num_processes=2).sync("submission", tmp_path)
+
+
+def test_truncate(tmp_path):
+    cache = Cache({"q": 1}, False, cache_dir=tmp_path)
+    cache.cache_responses([{"id": i} for i in range(10)])
+    cache.cache_responses([{"id": i} for i in range(10, 20)])
+    cache.truncate(15)
+    assert cache.size == 15
+    assert [r["id"] for r in cache.load_resp(1)] == list(range(10, 15))
+
+
+def test_sharded_limit_filtered(tmp_path):
+    with StubServer(num_items=5000) as server:
+        kwargs = dict(since=server.since, until=server.until, limit=300)
+        api = server.api(PushshiftAPI, limit_type=None)
+        filtered = api.search_submissions(filter_fn=popular, **kwargs)
+        assert 0 < len(filtered) < 300
+        posts = api.search_submissions(**kwargs)
+        single = server.num_requests
+
+        api = server.api(PushshiftAPI, limit_type=None, num_processes=3)
+        # which results count towards the limit before filtering depends on how the window is sliced
+        with pytest.raises(ValueError):
+            api.search_submissions(cache_dir=tmp_path, filter_fn=popular, **kwargs)
+
+        start = server.num_requests
+        sharded = api.search_submissions(cache_dir=tmp_path, **kwargs)
+        assert len(sharded) == len(posts) == 300
+        # only the shards holding the newest results are searched, after a count of each shard
+        assert server.num_requests - start <= single / 2 + 3
@@ -0,0 +1,116 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+from pmaw import CSVSink, NDJSONSink, ParquetSink, PushshiftAPI, Sink, SQLiteSink
+from pmaw.bench import StubServer
+
+
+def read_ndjson(path):
+    with open(path) as handle:
+        return [json.loads(line) for line in handle]
+
+
+def read_csv(path):
+    with open(path, newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+def read_parquet(path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    return parquet.read_table(path).to_pylist()
+
+
+def read_sqlite(path):
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    rows = [dict(row) for row in conn.execute("SELECT * FROM results")]
+    conn.close()
+    return rows
+
+
+@pytest.mark.parametrize(
+    "sink_class,filename,read",
+    [
+        (NDJSONSink, "posts.ndjson", read_ndjson),
+        (CSVSink, "posts.csv", read_csv),
+        (ParquetSink, "posts.parquet", read_parquet),
+        (SQLiteSink, "posts.sqlite", read_sqlite),
+    ],
+)
+def test_search_to_sink(tmp_path, sink_class, filename, read):
+    if sink_class is ParquetSink:
+        pytest.importorskip("pyarrow")
+    path = tmp_path / filename
+    with StubServer(num_items=1000) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        sink = api.search_submissions(
+            since=server.since,
+            until=server.until,
+            sink=sink_class(path, batch_size=300),
+        )
+    assert sink.closed
+    assert sink.num_written == len(sink) == 1000
+
+    rows = read(path)
+    assert len(rows) == 1000
+    assert len({row["id"] for row in rows}) == 1000
+
+
+def test_bounded_buffer(tmp_path):
+    sink = NDJSONSink(tmp_path / "out.ndjson", batch_size=10)
+    for i in range(5):
+        sink.write([{"id": str(i * 7 + j)} for j in range(7)])
+        assert len(sink._buffer) < 10
+    sink.close()
+    assert len(read_ndjson(tmp_path / "out.ndjson")) == 35
+    with pytest.raises(ValueError):
+        sink.write([{"id": "a"}])
+
+
+def test_nested_and_new_fields(tmp_path):
+    rows = [
+        {"id": "a", "edited": False, "gildings": {"gid_1": 1}},
+        {"id": "b", "edited": 1629990795.0, "awards": [1, 2]},
+    ]
+    with SQLiteSink(tmp_path / "out.sqlite", batch_size=1) as sink:
+        sink.write(rows)
+    saved = read_sqlite(tmp_path / "out.sqlite")
+    assert json.loads(saved[0]["gildings"]) == {"gid_1": 1}
+    assert saved[1]["awards"] == "[1,2]"
+    assert saved[0]["awards"] is None
+
+    with CSVSink(tmp_path / "out.csv", fields=["id", "gildings"]) as sink:
+        sink.write(rows)
+    assert read_csv(tmp_path / "out.csv")[1] == {"id": "b", "gildings": ""}
+
+
+def test_parquet_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    rows = [
+        {"id": "a", "score": 1, "edited": False, "gildings": {"gid_1": 1}},
+        {"id": "b", "score": 2, "edited": 1629990795.0, "gildings": {}},
+    ]
+    with ParquetSink(tmp_path / "out.parquet", batch_size=1) as sink:
+        sink.write(rows)
+    saved = read_parquet(tmp_path / "out.parquet")
+    assert [row["score"] for row in saved] == [1, 2]
+    assert saved[0]["gildings"] == '{"gid_1":1}'
+    # the schema was inferred from the first batch, where edited was a bool
+    assert [row["edited"] for row in saved] == [False, None]
+
+
+def test_sink_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        PushshiftAPI().search_submissions(
+            since=0, until=100, mem_safe=True, sink=NDJSONSink(tmp_path / "out.ndjson")
+        )
+
+
+def test_incomplete_sink(tmp_path):
+    class Incomplete(Sink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path / "out")
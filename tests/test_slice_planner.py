@@ -0,0 +1,43 @@
+import pytest
+from pmaw import PushshiftAPI
+from pmaw.bench import StubServer
+from pmaw.utils.slices import plan_slices
+
+
+def test_equal_counts():
+    ranges = [(0, 100, 50), (100, 200, 50), (200, 300, 50), (300, 400, 50)]
+    assert plan_slices(ranges, 2) == [(0, 200), (200, 400)]
+
+
+def test_dense_range_split():
+    ranges = [(0, 100, 0), (100, 200, 900), (200, 300, 0), (300, 400, 100)]
+    # empty ranges join the slices next to them, the dense range is cut
+    assert plan_slices(ranges, 2) == [(0, 155), (155, 400)]
+
+
+def test_uncounted_range():
+    ranges = [(0, 100, 100), (100, 200, None), (200, 300, 100)]
+    assert plan_slices(ranges, 2) == [(0, 100), (100, 200), (200, 300)]
+
+
+def test_no_results():
+    # the window is still requested, in case results were added since it was counted
+    assert plan_slices([(0, 100, 0)], 4) == [(0, 100)]
+
+
+def test_invalid_planner():
+    with pytest.raises(ValueError):
+        PushshiftAPI(slice_planner="random")
+
+
+def test_density_search():
+    requests = {}
+    for planner in ("uniform", "density"):
+        with StubServer(num_items=5000) as server:
+            api = server.api(PushshiftAPI, limit_type=None, slice_planner=planner)
+            posts = api.search_submissions(since=server.since, until=server.until)
+            assert len(posts) == 5000
+            requests[planner] = server.num_requests - api.num_probes
+
+    assert api.num_probes > 0
+    assert requests["density"] <= requests["uniform"]
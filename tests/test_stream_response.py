@@ -0,0 +1,54 @@
+import pytest
+from pmaw import PushshiftAPI
+from pmaw.bench import StubServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubServer(num_items=2000) as server:
+        yield server
+
+
+def test_stream_all_results(server):
+    api = server.api(PushshiftAPI, limit_type=None)
+    posts = api.search_submissions(
+        since=server.since, until=server.until, stream=True
+    )
+    ids = [post["id"] for post in posts]
+    assert len(ids) == 2000 and len(set(ids)) == 2000
+
+
+def test_stream_limit(server):
+    api = server.api(PushshiftAPI, limit_type=None)
+    posts = api.search_submissions(
+        since=server.since, until=server.until, limit=150, stream=True
+    )
+    assert len(list(posts)) == 150
+
+
+def test_stream_back_pressure():
+    with StubServer(num_items=5000) as server:
+        api = server.api(PushshiftAPI, limit_type=None, num_workers=2)
+        posts = api.search_submissions(
+            since=server.since, until=server.until, stream=True, stream_buffer=1
+        )
+        first = next(posts)
+        assert first["id"]
+        # the search stops once the consumer stops iterating
+        posts.close()
+        assert api.req.exit.is_set()
+        assert server.num_requests < 20
+
+
+def test_stream_error():
+    api = PushshiftAPI(limit_type=None)
+    api._base_url = "http://127.0.0.1:1/{{endpoint}}"
+    posts = api.search_submissions(since=1, until=2, stream=True)
+    with pytest.raises(Exception):
+        list(posts)
+
+
+def test_stream_mem_safe():
+    with pytest.raises(ValueError):
+        api = PushshiftAPI()
+        api.search_submissions(since=1, until=2, stream=True, mem_safe=True)
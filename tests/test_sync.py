@@ -0,0 +1,81 @@
+import time
+
+import pytest
+from pmaw import PushshiftAPI, Response
+from pmaw.bench import StubServer
+from pmaw.utils.keys import query_key, sync_key
+
+
+def test_sync(tmp_path):
+    now = int(time.time())
+    with StubServer(num_items=1000, since=now - 86400, until=now) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        first = api.sync("submission", tmp_path, since=server.since, subreddit="aww")
+        num_aww = sum(item["subreddit"] == "aww" for item in server.items)
+        assert len(first) == num_aww
+
+        # nothing new, items from the overlap window are dropped
+        start = server.num_requests
+        second = api.sync("submission", tmp_path, subreddit="aww")
+        assert len(second) == 0
+        # a single request covers the overlap
+        assert server.num_requests - start == 1
+
+        # a new item arrives, newer than every other item
+        server.items.append(dict(server.items[-1], id="new", created_utc=now - 1, subreddit="aww"))
+        server.timestamps.append(now - 1)
+        third = api.sync("submission", tmp_path, subreddit="aww")
+        assert [item["id"] for item in third] == ["new"]
+
+    key = query_key({"subreddit": "aww"}, "submission")
+    cached = Response.load_cache(key, cache_dir=tmp_path)
+    assert len(cached) == num_aww + 1
+
+
+def test_sync_filter(tmp_path):
+    now = int(time.time())
+    with StubServer(num_items=300, since=now - 86400, until=now) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        first = api.sync("submission", tmp_path, since=server.since, filter=["title"])
+        assert len(first) == 300
+        # the fields needed to track synced items are added to the filter
+        assert all(set(item) == {"id", "created_utc"} for item in first)
+
+        second = api.sync("submission", tmp_path, filter=["title"])
+        assert len(second) == 0
+
+    key = sync_key({"filter": ["title"]}, "submission")
+    assert len(Response.load_cache(key, cache_dir=tmp_path)) == 300
+
+
+def test_sync_keys(tmp_path):
+    now = int(time.time())
+    with StubServer(num_items=300, since=now - 86400, until=now) as server:
+        api = server.api(PushshiftAPI, limit_type=None)
+        assert len(api.sync("submission", tmp_path, since=server.since)) == 300
+        # syncs with other fields or filters have their own state
+        projected = api.sync("submission", tmp_path, since=server.since, filter=["score"])
+        assert len(projected) == 300
+        assert all("subreddit" not in item for item in projected)
+        filtered = api.sync(
+            "submission", tmp_path, since=server.since, filters={"subreddit": "aww"}
+        )
+        num_aww = sum(item["subreddit"] == "aww" for item in server.items)
+        assert len(filtered) == num_aww
+
+    assert sync_key({"filter": "id,score"}, "comment") == sync_key(
+        {"filter": ["score", "id"]}, "comment"
+    )
+    assert sync_key({}, "comment", {"subreddit": ("in", {"a", "b", "c"})}) == sync_key(
+        {}, "comment", {"subreddit": ("in", {"c", "b", "a"})}
+    )
+
+
+def test_sync_invalid(tmp_path):
+    api = PushshiftAPI()
+    with pytest.raises(ValueError):
+        api.sync("submission", tmp_path, until=1)
+    with pytest.raises(ValueError):
+        api.sync("submission_comment_ids", tmp_path)
+    with pytest.raises(ValueError):
+        api.sync("submission", tmp_path, filter_fn=len)
@@ -0,0 +1,108 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pmaw import PushshiftAPI, SharedRateLimit, WorkQueue
+from pmaw.bench import StubServer
+from pmaw.types.exceptions import HTTPServerError
+
+
+def url_pay(i):
+    return ("url", {"since": i, "until": i + 1})
+
+
+def test_lease_complete_requeue(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", node="a")
+    other = WorkQueue(tmp_path / "queue.sqlite", node="b")
+    assert queue.seed([url_pay(i) for i in range(3)])
+    assert not other.seed([url_pay(9)])
+    # requests added again arent queued twice
+    other.put([url_pay(2), url_pay(3)])
+
+    leased = queue.lease(2)
+    assert leased == [url_pay(0), url_pay(1)]
+    assert other.lease(5) == [url_pay(2), url_pay(3)]
+
+    # failures are retried before any other request, like appendleft
+    queue.complete(url_pay(0), 100)
+    queue.requeue([url_pay(1)])
+    other.put([url_pay(4)])
+    assert other.lease(2) == [url_pay(1), url_pay(4)]
+    assert queue.stats == {"pending": 0, "leased": 4, "done": 1, "results": 100}
+    assert not queue.finished
+
+
+def test_lease_expires(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", lease_timeout=0.1, node="a")
+    other = WorkQueue(tmp_path / "queue.sqlite", node="b")
+    queue.seed([url_pay(0)])
+    assert queue.lease(1) == [url_pay(0)]
+    assert other.lease(1) == []
+    time.sleep(0.2)
+    # the node holding the lease is presumed dead
+    assert other.lease(1) == [url_pay(0)]
+    other.complete(url_pay(0), 0)
+    assert queue.finished
+
+
+def test_shared_rate_limit(tmp_path):
+    limiters = [
+        SharedRateLimit(tmp_path / "queue.sqlite", rate_limit=600, burst=1)
+        for _ in range(2)
+    ]
+    delays = sorted(limiters[i % 2].delay() for i in range(4))
+    # both nodes take tokens from the same bucket
+    assert delays[0] == 0
+    for i in range(1, 4):
+        assert delays[i] - delays[i - 1] == pytest.approx(0.1, abs=0.05)
+
+    limiters[0]._req_fail(retry_after=5)
+    assert limiters[1].delay() > 4
+
+
+def test_distributed_search(tmp_path):
+    path = tmp_path / "queue.sqlite"
+    with StubServer(num_items=3000) as server:
+        kwargs = dict(since=server.since, until=server.until)
+        api = server.api(PushshiftAPI, limit_type=None, num_workers=5)
+        api.search_submissions(**kwargs)
+        # the single node search also makes a count request
+        expected = server.num_requests - 1
+        server.num_requests = 0
+
+        def node(i):
+            api = server.api(
+                PushshiftAPI,
+                num_workers=5,
+                rate_limiter=SharedRateLimit(path, rate_limit=60000),
+            )
+            queue = WorkQueue(path, poll_interval=0.05, node=f"node-{i}")
+            get = api._get
+
+            def fail_first(url, payload={}):
+                if not hasattr(fail_first, "failed"):
+                    fail_first.failed = True
+                    raise HTTPServerError("HTTP 503 - Service Unavailable")
+                return get(url, payload)
+
+            api._get = fail_first
+            return [post["id"] for post in api.search_submissions(work_queue=queue, **kwargs)]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(node, range(3)))
+
+        ids = [post_id for posts in results for post_id in posts]
+        assert len(ids) == len(set(ids)) == 3000
+        # each failure is retried once, by any node
+        assert server.num_requests == expected
+        assert WorkQueue(path).finished
+
+
+def test_distributed_invalid(tmp_path):
+    api = PushshiftAPI()
+    with pytest.raises(ValueError):
+        api.search_submissions(until=100, work_queue=tmp_path / "queue.sqlite")
+    with pytest.raises(ValueError):
+        api.search_submissions(
+            since=0, until=100, limit=10, work_queue=tmp_path / "queue.sqlite"
+        )